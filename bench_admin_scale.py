@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Admin endpoint scale benchmark for Moodscape
+Registers users in steps (1k, 10k, 100k by default) and measures
+/api/admin/stats and /api/admin/users (first page, a page from the middle of
+the list, sorted by email and filtered by email domain) at every step. Checks
+that p50 latency stays roughly flat as signups pile up, and that walking the
+keyset pages returns every user exactly once.
+
+Usage:
+    python3 bench_admin_scale.py --stub
+    python3 bench_admin_scale.py --steps 1000,10000 --repeats 100
+"""
+
+import argparse
+import time
+
+from harness import Benchmark, summarize_latencies
+from mood_history import BulkSeeder
+
+USERS_PATH = "/api/admin/users"
+# Seeded emails spread over DOMAINS domains, so one domain matches 1/DOMAINS of them
+DOMAINS = 10
+
+def parse_steps(text):
+    return sorted(int(step) for step in text.split(','))
+
+class AdminScaleBenchmark(Benchmark):
+    report_title = "ADMIN SCALE BENCHMARK"
+    report_prefix = "admin_scale_report"
+
+    def __init__(self, args):
+        if args.stub and '--password-iterations' not in args.stub_args:
+            args.stub_args = f"--password-iterations {args.stub_password_iterations} {args.stub_args}"
+        super().__init__(args)
+        self.seeder = BulkSeeder(self.client, workers=args.workers)
+        self.run_id = int(time.time())
+        self.registered = 0
+        self.headers = {}
+        self.steps = []
+
+    def register(self, index):
+        response = self.client.post("/api/auth/register", data={
+            'email': f"scale{self.run_id}-{index}@group{index % DOMAINS}.test",
+            'password': 'scalepass123',
+            'name': f"Scale User {index}"
+        })
+        return response.status_code == 200
+
+    def login_admin(self):
+        response = self.client.post("/api/auth/login",
+                                    data={'email': self.args.admin_email, 'password': self.args.admin_password})
+        if response.status_code != 200:
+            self.log_result("Admin Scale: Admin Login", False, f"Status code: {response.status_code}",
+                            response=response)
+            return False
+        self.headers = {'Authorization': f"Bearer {response.json()['access_token']}"}
+        return True
+
+    def middle_cursor(self, users):
+        """Cursor about halfway down the default (signup order) listing"""
+        cursor = None
+        for _ in range(users // 2 // 1000):
+            params = {'page_size': 1000}
+            if cursor:
+                params['cursor'] = cursor
+            cursor = self.client.get(USERS_PATH, params=params, headers=self.headers).json()['next_cursor']
+        return cursor
+
+    def queries(self, users):
+        """(name, path, params) measured at every step"""
+        middle = self.middle_cursor(users)
+        return [
+            ("stats", "/api/admin/stats", {}),
+            ("users_first_page", USERS_PATH, {}),
+            ("users_middle_page", USERS_PATH, {'cursor': middle} if middle else {}),
+            ("users_by_email", USERS_PATH, {'sort': 'email', 'order': 'desc'}),
+            ("users_filtered", USERS_PATH, {'q': '@group3.test', 'sort': 'name'}),
+        ]
+
+    def measure(self, users):
+        step = {'users': users}
+        for name, path, params in self.queries(users):
+            # One unmeasured request so the first query does not absorb the end of the signup burst
+            self.client.get(path, params=params, headers=self.headers)
+            results = [self.client.get(path, params=params, headers=self.headers)
+                       for _ in range(self.args.repeats)]
+            failures = sum(1 for response in results if response.status_code != 200)
+            latency = summarize_latencies([response.duration_ms for response in results])
+            step[name] = latency
+            self.log_result(f"Admin Scale: {name} @ {users}", failures == 0,
+                            f"p50 {latency['p50_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms, {failures} failed")
+        return step
+
+    def check_walk(self):
+        """Page through every user once and compare with the reported total"""
+        seen, cursor, total = set(), None, None
+        pages = 0
+        while True:
+            params = {'page_size': 1000}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(USERS_PATH, params=params, headers=self.headers)
+            if response.status_code != 200:
+                self.log_result("Admin Scale: Page walk", False, f"Status code: {response.status_code}",
+                                response=response)
+                return
+            page = response.json()
+            pages += 1
+            total = page['total']
+            seen.update(user['id'] for user in page['users'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.log_result("Admin Scale: Page walk", len(seen) == total,
+                        f"{len(seen)} distinct users in {pages} pages, total {total}")
+
+    def run(self):
+        self.print_header("ADMIN ENDPOINT SCALE BENCHMARK")
+        if not self.setup_backend():
+            return False
+        try:
+            if not self.login_admin():
+                return False
+            for target in self.args.steps:
+                count = target - self.registered
+                if count <= 0:
+                    continue
+                self.print_info(f"Registering {count} users ({self.registered} → {target})...")
+                created = self.seeder.bounded_count(self.register, range(self.registered, target))
+                self.log_result(f"Admin Scale: Register {target}", created == count,
+                                f"{created} users registered, {count - created} failed")
+                self.registered = target
+                self.steps.append(self.measure(target))
+            self.check_walk()
+            if len(self.steps) > 1:
+                first, last = self.steps[0], self.steps[-1]
+                self.check_growth("Admin Scale", first, last, [key for key in first if key != 'users'],
+                                  'users', "users")
+        finally:
+            self.teardown()
+        self.report_extras['steps'] = self.steps
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure admin endpoint latency against the number of users")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--steps", type=parse_steps, default=[1000, 10000, 100000],
+                        help="comma-separated registered user counts to measure at")
+    parser.add_argument("--repeats", type=int, default=50, help="measured requests per query and step")
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="allowed p50 growth from the smallest to the largest step")
+    parser.add_argument("--admin-email", default="makopolo@moodscape.dev")
+    parser.add_argument("--admin-password", default="123456")
+    parser.add_argument("--stub-password-iterations", type=int, default=1000,
+                        help="password hash cost of the --stub backend, so 100k signups take minutes not hours")
+    args = parser.parse_args()
+
+    AdminScaleBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
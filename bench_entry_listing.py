@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Entry-listing benchmark for GET /api/mood-entries
+Seeds one user with a growing synthetic history (1k to 100k entries by
+default) and reads it back three ways: as the legacy single JSON array, page by
+page with keyset cursors, and as an NDJSON stream. Reports time-to-first-entry,
+total read time, client peak memory (tracemalloc) and backend peak RSS growth
+per mode and size, and checks that the paginated and streamed reads keep
+memory flat as the history grows.
+
+Usage:
+    python3 bench_entry_listing.py --stub
+    python3 bench_entry_listing.py --sizes 1000,10000 --runs 5 --page-size 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from harness import Benchmark, Colors, ProcessSampler
+from mood_history import BulkSeeder, generate_histories, iter_entries
+
+ENTRIES_PATH = "/api/mood-entries"
+# Streaming modes first: the backend rarely returns memory to the OS, so the
+# array read would raise the RSS baseline of every mode measured after it
+MODES = ['keyset', 'ndjson', 'array']
+STREAMING_MODES = ('keyset', 'ndjson')
+
+def parse_sizes(text):
+    return sorted(int(size) for size in text.split(','))
+
+class EntryListingBenchmark(Benchmark):
+    report_title = "ENTRY LISTING BENCHMARK"
+    report_prefix = "entry_listing_report"
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.seeder = BulkSeeder(self.client, workers=args.workers)
+        self.headers = {}
+        self.results = []
+
+    def read_array(self, start):
+        """The whole history as one JSON array; the first entry is usable once it is all parsed"""
+        response = self.client.get(ENTRIES_PATH, headers=self.headers)
+        entries = response.json() if response.status_code == 200 else []
+        return len(entries), (time.perf_counter() - start) * 1000
+
+    def read_keyset(self, start):
+        count, first_ms, cursor = 0, None, None
+        while True:
+            params = {'page_size': self.args.page_size}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(ENTRIES_PATH, params=params, headers=self.headers)
+            if response.status_code != 200:
+                return count, first_ms
+            page = response.json()
+            if page['entries'] and first_ms is None:
+                first_ms = (time.perf_counter() - start) * 1000
+            count += len(page['entries'])
+            cursor = page['next_cursor']
+            if not cursor:
+                return count, first_ms
+
+    def read_ndjson(self, start):
+        count, first_ms = 0, None
+        response = self.client.get(ENTRIES_PATH, params={'format': 'ndjson'}, headers=self.headers, stream=True)
+        try:
+            if response.status_code != 200:
+                return count, first_ms
+            for line in response.iter_lines(chunk_size=64 * 1024):
+                if not line:
+                    continue
+                json.loads(line)
+                if first_ms is None:
+                    first_ms = (time.perf_counter() - start) * 1000
+                count += 1
+        finally:
+            response.close()
+        return count, first_ms
+
+    def read(self, mode):
+        start = time.perf_counter()
+        count, first_ms = getattr(self, f"read_{mode}")(start)
+        return count, first_ms, (time.perf_counter() - start) * 1000
+
+    def measure(self, size, mode):
+        """args.runs timed reads, then one read under tracemalloc for the client peak"""
+        sampler = None
+        baseline_mb = self.backend_rss_mb()
+        if baseline_mb is not None:
+            sampler = ProcessSampler(self.backend_pid, interval=0.02)
+            sampler.start()
+        runs = [self.read(mode) for _ in range(self.args.runs)]
+        tracemalloc.start()
+        runs.append(self.read(mode))
+        client_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if sampler:
+            sampler.stop()
+
+        counts = [count for count, _, _ in runs]
+        result = {
+            'entries': size,
+            'mode': mode,
+            'first_entry_ms': round(statistics.median(ms or 0.0 for _, ms, _ in runs[:-1]), 2),
+            'total_ms': round(statistics.median(ms for _, _, ms in runs[:-1]), 2),
+            'client_peak_kb': round(client_peak / 1024, 1),
+            'backend_rss_growth_mb': None
+        }
+        if sampler and sampler.samples:
+            result['backend_rss_growth_mb'] = round(
+                max(sample['rss_mb'] for sample in sampler.samples) - baseline_mb, 1)
+        self.results.append(result)
+        rss = (f", backend RSS {result['backend_rss_growth_mb']:+.1f}MB"
+               if result['backend_rss_growth_mb'] is not None else "")
+        self.log_result(
+            f"Entry Listing: {mode} @ {size}",
+            all(count == size for count in counts),
+            f"first entry {result['first_entry_ms']:.1f}ms, total {result['total_ms']:.1f}ms, "
+            f"client peak {result['client_peak_kb']:.0f}KB{rss}, read {min(counts)}-{max(counts)} entries"
+        )
+
+    def check_memory(self):
+        """Streaming reads should use about as much memory at the largest size as at the smallest"""
+        for mode in STREAMING_MODES:
+            points = [result for result in self.results if result['mode'] == mode]
+            if len(points) < 2:
+                continue
+            first, last = points[0], points[-1]
+            ratio = last['client_peak_kb'] / first['client_peak_kb'] if first['client_peak_kb'] else 1.0
+            self.log_result(
+                f"Entry Listing: {mode} client memory",
+                ratio <= self.args.max_ratio,
+                f"peak {first['client_peak_kb']:.0f}KB @ {first['entries']} → {last['client_peak_kb']:.0f}KB "
+                f"@ {last['entries']} (x{ratio:.2f}, limit x{self.args.max_ratio})"
+            )
+            growth = last['backend_rss_growth_mb']
+            if growth is not None:
+                self.log_result(
+                    f"Entry Listing: {mode} backend memory",
+                    growth <= self.args.max_rss_growth,
+                    f"RSS {growth:+.1f}MB while reading {last['entries']} entries "
+                    f"(limit {self.args.max_rss_growth}MB)"
+                )
+
+    def print_comparison(self):
+        print(f"\n{Colors.BOLD}{'entries':>8} {'mode':<8}{'first entry':>13}{'total':>11}"
+              f"{'client peak':>13}{'backend RSS':>13}{Colors.END}")
+        for result in self.results:
+            rss = result['backend_rss_growth_mb']
+            print(f"{result['entries']:>8} {result['mode']:<8}{result['first_entry_ms']:>11.1f}ms"
+                  f"{result['total_ms']:>9.1f}ms{result['client_peak_kb']:>11.0f}KB"
+                  f"{(f'{rss:+.1f}MB' if rss is not None else '-'):>13}")
+
+    def run(self):
+        self.print_header("MOOD ENTRY LISTING BENCHMARK")
+        if not self.setup_backend():
+            return False
+        try:
+            token = self.seeder.create_user(0, prefix='listing')
+            if not token:
+                self.log_result("Entry Listing: Create User", False, "Could not register the benchmark user")
+                return False
+            self.headers = {'Authorization': f'Bearer {token}'}
+            largest = self.args.sizes[-1]
+            history = generate_histories(1, int(self.args.years * 365), entries_per_user=largest,
+                                         seed=self.args.seed)
+            # Seed in random order so pages interleave old and new inserts
+            order = np.random.default_rng(self.args.seed).permutation(largest)
+            entries = list(iter_entries(history))
+            entries = [entries[index] for index in order]
+
+            seeded = 0
+            for size in self.args.sizes:
+                self.print_info(f"Seeding {size - seeded} entries ({seeded} → {size})...")
+                jobs = ((token, entry) for entry in entries[seeded:size])
+                failed = size - seeded - self.seeder.bounded_count(self.seeder.post_entry, jobs)
+                self.log_result(f"Entry Listing: Seed {size}", failed == 0,
+                                f"{size - seeded} entries posted, {failed} failed")
+                seeded = size
+                for mode in MODES:
+                    self.measure(size, mode)
+            self.check_memory()
+        finally:
+            self.teardown()
+        self.print_comparison()
+        self.report_extras['entry_listing'] = self.results
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare array, keyset-paginated and NDJSON entry listing")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--sizes", type=parse_sizes, default=[1000, 10000, 100000],
+                        help="comma-separated history sizes to measure at")
+    parser.add_argument("--runs", type=int, default=3, help="timed reads per mode and size")
+    parser.add_argument("--page-size", type=int, default=500, help="entries per keyset page")
+    parser.add_argument("--years", type=float, default=3.0, help="time span the history covers")
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="allowed client peak memory growth from the smallest to the largest size")
+    parser.add_argument("--max-rss-growth", type=float, default=16.0,
+                        help="allowed backend RSS growth in MB during a streaming read at the largest size")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    EntryListingBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Bulk data export benchmark for GET /api/export
+Seeds one user with a synthetic history (100k entries by default) and
+downloads every export dataset (entries, activities, insights) as CSV, Parquet
+and Arrow, reporting time to first byte, throughput and backend peak RSS
+growth. Fails if a download is missing rows, if the backend grows by more than
+--max-rss-growth while streaming, or if entry-backed exports run slower than
+--min-rows-per-second. Columnar formats count as skipped when the backend
+answers 501 (no pyarrow on the server).
+
+Usage:
+    python3 bench_export.py --stub
+    python3 bench_export.py --entries 20000 --formats csv --max-rss-growth 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from harness import Benchmark, Colors, ProcessSampler
+from mood_history import BulkSeeder, generate_histories
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # columnar downloads are then checked for size only
+    pa = pq = None
+
+EXPORT_PATH = "/api/export"
+DATASETS = ['entries', 'activities', 'insights']
+# Datasets read through the backend's entry cursor; insights come from daily rollups
+CURSOR_DATASETS = ('entries', 'activities')
+
+def parse_list(text):
+    return [item.strip() for item in text.split(',') if item.strip()]
+
+def count_rows(path, fmt):
+    """Rows in a downloaded export, or None when they cannot be counted here"""
+    if fmt == 'csv':
+        with open(path, 'rb') as f:
+            return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b'')) - 1
+    if pa is None:
+        return None
+    if fmt == 'parquet':
+        return pq.ParquetFile(path).metadata.num_rows
+    with pa.OSFile(path) as f:
+        return sum(batch.num_rows for batch in pa.ipc.open_stream(f))
+
+class ExportBenchmark(Benchmark):
+    report_title = "DATA EXPORT BENCHMARK"
+    report_prefix = "export_report"
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.seeder = BulkSeeder(self.client, workers=args.workers)
+        self.headers = {}
+        self.expected = {}
+        self.results = []
+
+    def seed(self):
+        token = self.seeder.create_user(0, prefix='export')
+        if not token:
+            self.log_result("Export: Create User", False, "Could not register the benchmark user")
+            return False
+        self.headers = {'Authorization': f'Bearer {token}'}
+        history = generate_histories(1, int(self.args.years * 365), entries_per_user=self.args.entries,
+                                     seed=self.args.seed)
+        self.expected = {
+            'entries': len(history['user']),
+            'activities': int(history['activities'].sum()),
+            'insights': len(np.unique(history['created_at'].astype('datetime64[D]')))
+        }
+        self.print_info(f"Seeding {self.args.entries} entries...")
+        result = self.seeder.seed(history, [token])
+        self.log_result("Export: Seed", result['failures'] == 0,
+                        f"{result['entries']} entries posted at {result['entries_per_second']}/s, "
+                        f"{result['failures']} failed")
+        return result['failures'] == 0
+
+    def download(self, dataset, fmt, path):
+        """Stream one export to path; returns (status, bytes, first byte ms, seconds)"""
+        start = time.perf_counter()
+        response = self.client.get(EXPORT_PATH, params={'dataset': dataset, 'format': fmt},
+                                   headers=self.headers, stream=True)
+        first_byte_ms = None
+        size = 0
+        try:
+            if response.status_code == 200:
+                with open(path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        if first_byte_ms is None:
+                            first_byte_ms = (time.perf_counter() - start) * 1000
+                        f.write(chunk)
+                        size += len(chunk)
+        finally:
+            response.close()
+        return response.status_code, size, first_byte_ms, time.perf_counter() - start
+
+    def measure(self, dataset, fmt, directory):
+        name = f"Export: {dataset} {fmt}"
+        path = os.path.join(directory, f"{dataset}.{fmt}")
+        baseline_mb = self.backend_rss_mb()
+        sampler = None
+        if baseline_mb is not None:
+            sampler = ProcessSampler(self.backend_pid, interval=0.02)
+            sampler.start()
+        status, size, first_byte_ms, seconds = self.download(dataset, fmt, path)
+        if sampler:
+            sampler.stop()
+        if status == 501:
+            self.log_result(name, True, "skipped: the backend has no columnar export support (501)")
+            return
+        if status != 200:
+            self.log_result(name, False, f"Status code: {status}")
+            return
+
+        rows = count_rows(path, fmt)
+        os.remove(path)
+        result = {
+            'dataset': dataset,
+            'format': fmt,
+            'rows': rows,
+            'bytes': size,
+            'first_byte_ms': round(first_byte_ms or 0.0, 2),
+            'seconds': round(seconds, 3),
+            'mb_per_second': round(size / 1e6 / seconds, 2) if seconds else 0.0,
+            'rows_per_second': round(rows / seconds, 1) if rows is not None and seconds else None,
+            'backend_rss_growth_mb': None
+        }
+        if sampler and sampler.samples:
+            result['backend_rss_growth_mb'] = round(
+                max(sample['rss_mb'] for sample in sampler.samples) - baseline_mb, 1)
+        self.results.append(result)
+
+        expected = self.expected[dataset]
+        self.log_result(
+            name,
+            rows is None or rows == expected,
+            f"{rows if rows is not None else '?'}/{expected} rows, {size / 1e6:.1f}MB in {seconds:.2f}s "
+            f"({result['mb_per_second']}MB/s), first byte {result['first_byte_ms']:.1f}ms"
+        )
+        growth = result['backend_rss_growth_mb']
+        if growth is not None:
+            self.log_result(f"{name} memory", growth <= self.args.max_rss_growth,
+                            f"backend RSS {growth:+.1f}MB (limit {self.args.max_rss_growth}MB)")
+        if dataset in CURSOR_DATASETS and result['rows_per_second'] is not None:
+            self.log_result(f"{name} throughput", result['rows_per_second'] >= self.args.min_rows_per_second,
+                            f"{result['rows_per_second']:.0f} rows/s "
+                            f"(minimum {self.args.min_rows_per_second:.0f})")
+
+    def print_comparison(self):
+        print(f"\n{Colors.BOLD}{'dataset':<12}{'format':<9}{'rows':>9}{'MB':>8}{'first byte':>12}"
+              f"{'rows/s':>11}{'backend RSS':>13}{Colors.END}")
+        for result in self.results:
+            rss = result['backend_rss_growth_mb']
+            rate = result['rows_per_second']
+            print(f"{result['dataset']:<12}{result['format']:<9}{result['rows'] or '?':>9}"
+                  f"{result['bytes'] / 1e6:>8.1f}{result['first_byte_ms']:>10.1f}ms"
+                  f"{(f'{rate:.0f}' if rate is not None else '?'):>11}"
+                  f"{(f'{rss:+.1f}MB' if rss is not None else '-'):>13}")
+
+    def run(self):
+        self.print_header("BULK DATA EXPORT BENCHMARK")
+        if pa is None:
+            self.print_warning("pyarrow is not installed here: columnar exports are checked for size only")
+        if not self.setup_backend():
+            return False
+        try:
+            if not self.seed():
+                return False
+            with tempfile.TemporaryDirectory() as directory:
+                for fmt in self.args.formats:
+                    # One unmeasured small export so the writer library's one-time
+                    # setup is not billed to the first measured download
+                    self.download('insights', fmt, os.path.join(directory, 'warm-up'))
+                    for dataset in DATASETS:
+                        self.measure(dataset, fmt, directory)
+        finally:
+            self.teardown()
+        self.print_comparison()
+        self.report_extras['export'] = {'expected_rows': self.expected, 'downloads': self.results}
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure streaming data export throughput and memory")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--entries", type=int, default=100000, help="entries seeded for the export user")
+    parser.add_argument("--years", type=float, default=3.0, help="time span the history covers")
+    parser.add_argument("--formats", type=parse_list, default=['csv', 'parquet', 'arrow'],
+                        help="comma-separated export formats to download")
+    parser.add_argument("--max-rss-growth", type=float, default=64.0,
+                        help="allowed backend RSS growth in MB while one export streams; it should "
+                             "not depend on --entries (Parquet buffers one row group)")
+    parser.add_argument("--min-rows-per-second", type=float, default=20000,
+                        help="slowest acceptable entries/activities export rate")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ExportBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+History-size benchmark for the Moodscape analytics endpoints
+Seeds one user with a growing synthetic history (10 to 100k entries by
+default) and measures the latency and response size of /api/insights,
+/api/stats, /api/trends and /api/ai/pattern-analysis at every size, then fits
+a power law to the larger sizes and flags endpoints that grow faster than
+linearly with the history.
+
+Usage:
+    python3 bench_history_scale.py --stub
+    python3 bench_history_scale.py --sizes 100,1000,10000 --repeats 50
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from harness import Benchmark, linear_slope, summarize_latencies
+from mood_history import BulkSeeder, generate_histories, iter_entries
+
+# (name, path, query parameters)
+ENDPOINTS = [
+    ("insights", "/api/insights", {}),
+    ("stats", "/api/stats", {}),
+    ("trends_7d", "/api/trends", {'days': 7}),
+    ("trends_90d", "/api/trends", {'days': 90}),
+    ("pattern_analysis", "/api/ai/pattern-analysis", {}),
+]
+
+def parse_sizes(text):
+    return sorted(int(size) for size in text.split(','))
+
+def growth_exponent(points):
+    """Power-law exponent k of latency ~ size**k, fitted in log-log space"""
+    return linear_slope([(math.log(size), math.log(max(value, 0.001))) for size, value in points])
+
+class HistoryScaleBenchmark(Benchmark):
+    report_title = "HISTORY SCALE BENCHMARK"
+    report_prefix = "history_scale_report"
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.seeder = BulkSeeder(self.client, workers=args.workers)
+        self.token = None
+        self.results = {name: [] for name, _, _ in ENDPOINTS}
+
+    def seed_history(self, entries, start, stop):
+        jobs = ((self.token, entry) for entry in entries[start:stop])
+        failed = stop - start - self.seeder.bounded_count(self.seeder.post_entry, jobs)
+        self.log_result(f"History Scale: Seed {stop}", failed == 0,
+                        f"{stop - start} entries posted, {failed} failed")
+
+    def measure(self, size):
+        headers = {'Authorization': f'Bearer {self.token}'}
+        for name, path, params in ENDPOINTS:
+            latencies = []
+            sizes = []
+            failures = 0
+            # One unmeasured request so lazily built state is not billed to the first sample
+            self.client.get(path, params=params, headers=headers)
+            for _ in range(self.args.repeats):
+                response = self.client.get(path, params=params, headers=headers)
+                latencies.append(response.duration_ms)
+                sizes.append(len(response.content))
+                failures += response.status_code != 200
+            latency = summarize_latencies(latencies)
+            self.results[name].append({
+                'entries': size,
+                'latency': latency,
+                'response_bytes': max(sizes)
+            })
+            self.log_result(f"History Scale: {name} @ {size}", failures == 0,
+                            f"p50 {latency['p50_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms, "
+                            f"{max(sizes)} bytes, {failures} failed")
+
+    def check_growth(self):
+        """Fit latency ~ entries**k on the sizes large enough to dominate fixed overhead"""
+        growth = {}
+        for name, points in self.results.items():
+            fitted = [(point['entries'], point['latency']['p50_ms'])
+                      for point in points if point['entries'] >= self.args.fit_from]
+            if len(fitted) < 2:
+                continue
+            exponent = growth_exponent(fitted)
+            size_exponent = growth_exponent([(point['entries'], point['response_bytes'])
+                                             for point in points if point['entries'] >= self.args.fit_from])
+            growth[name] = {'latency_exponent': round(exponent, 3), 'response_exponent': round(size_exponent, 3)}
+            shape = ("super-linear" if exponent > self.args.max_exponent
+                     else "linear" if exponent > 0.8 else "sub-linear")
+            self.log_result(
+                f"History Scale: {name} growth",
+                exponent <= self.args.max_exponent,
+                f"latency ~ n^{exponent:.2f} ({shape}), response size ~ n^{size_exponent:.2f} "
+                f"over {fitted[0][0]}-{fitted[-1][0]} entries"
+            )
+        self.report_extras['growth'] = growth
+
+    def run(self):
+        self.print_header("HISTORY SIZE SCALING BENCHMARK")
+        if not self.setup_backend():
+            return False
+        try:
+            self.token = self.seeder.create_user(0, prefix='history')
+            if not self.token:
+                self.log_result("History Scale: Create User", False, "Could not register the benchmark user")
+                return False
+            largest = self.args.sizes[-1]
+            history = generate_histories(1, int(self.args.years * 365), entries_per_user=largest,
+                                         seed=self.args.seed)
+            # Seed in random order so every prefix spans the whole date range
+            order = np.random.default_rng(self.args.seed).permutation(largest)
+            entries = list(iter_entries(history))
+            entries = [entries[index] for index in order]
+
+            seeded = 0
+            for size in self.args.sizes:
+                self.print_info(f"Seeding {size - seeded} entries ({seeded} → {size})...")
+                self.seed_history(entries, seeded, size)
+                seeded = size
+                self.measure(size)
+            self.check_growth()
+        finally:
+            self.teardown()
+        self.report_extras['endpoints'] = self.results
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure analytics endpoint latency against history size")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--sizes", type=parse_sizes, default=[10, 100, 1000, 10000, 100000],
+                        help="comma-separated history sizes to measure at")
+    parser.add_argument("--repeats", type=int, default=20, help="measured requests per endpoint and size")
+    parser.add_argument("--years", type=float, default=3.0, help="time span the history covers")
+    parser.add_argument("--fit-from", type=int, default=1000,
+                        help="smallest history size used for the growth fit")
+    parser.add_argument("--max-exponent", type=float, default=1.2,
+                        help="largest acceptable growth exponent (1.0 is linear)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    HistoryScaleBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
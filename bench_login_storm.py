@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Login-storm benchmark for Moodscape
+Measures how a burst of concurrent logins affects everything else: probes
+GET /health and an authenticated GET /api/stats at a steady rate, first on
+their own and then while --login-concurrency clients log in back to back,
+and compares probe p50/p99 between the two phases. Also reports login
+throughput, how many logins the backend turned away with 503, and the
+password hasher and token cache counters from /health.
+
+Usage:
+    python3 bench_login_storm.py --stub
+    python3 bench_login_storm.py --login-concurrency 64 --duration 20
+    python3 bench_login_storm.py --stub --stub-args "--hash-workers 64"  # unbounded, for comparison
+"""
+
+import argparse
+import threading
+import time
+
+from harness import Benchmark, summarize_latencies
+from mood_history import BulkSeeder
+
+PROBES = [
+    ("health", "/health", False),
+    ("stats", "/api/stats", True),
+]
+PASSWORD = 'stormpass123'
+
+class LoginStormBenchmark(Benchmark):
+    report_title = "LOGIN STORM BENCHMARK"
+    report_prefix = "login_storm_report"
+
+    def __init__(self, args):
+        args.workers = max(args.workers, args.login_concurrency + 1)
+        super().__init__(args)
+        self.seeder = BulkSeeder(self.client, workers=min(args.workers, 8))
+        self.emails = []
+        self.headers = {}
+        self.phases = {}
+
+    def register(self, index):
+        email = f"storm_{index}_{int(time.time())}@example.com"
+        response = self.client.post("/api/auth/register",
+                                    data={'email': email, 'password': PASSWORD, 'name': f"Storm User {index}"})
+        return email if response.status_code == 200 else None
+
+    def login(self, email):
+        return self.client.post("/api/auth/login", data={'email': email, 'password': PASSWORD})
+
+    def storm(self, stop, index, outcomes):
+        """One client logging in back to back until stop is set"""
+        while not stop.is_set():
+            email = self.emails[index % len(self.emails)]
+            index += self.args.login_concurrency
+            response = self.login(email)
+            outcomes.append((response.status_code, response.duration_ms))
+
+    def run_phase(self, name, logins):
+        stop = threading.Event()
+        outcomes = []
+        storm_threads = [threading.Thread(target=self.storm, args=(stop, index, outcomes), daemon=True)
+                         for index in range(self.args.login_concurrency if logins else 0)]
+        for thread in storm_threads:
+            thread.start()
+        timer = threading.Timer(self.args.duration, stop.set)
+        timer.start()
+        latencies, failures = self.probe(PROBES, self.args.probe_rate, stop, self.headers)
+        for thread in storm_threads:
+            thread.join()
+
+        phase = {'probes': {probe: summarize_latencies(values) for probe, values in latencies.items()},
+                 'probe_failures': failures}
+        summary = ", ".join(f"{probe} p50 {stats['p50_ms']:.1f}ms p99 {stats['p99_ms']:.1f}ms"
+                            for probe, stats in phase['probes'].items())
+        self.log_result(f"Login Storm: {name} probes", failures == 0, f"{summary}, {failures} failed")
+        if logins:
+            ok = [ms for status, ms in outcomes if status == 200]
+            phase['logins'] = {
+                'completed': len(ok),
+                'rejected': sum(1 for status, _ in outcomes if status == 503),
+                'failed': sum(1 for status, _ in outcomes if status not in (200, 503)),
+                'per_second': round(len(ok) / self.args.duration, 1),
+                'latency': summarize_latencies(ok)
+            }
+            logins_info = phase['logins']
+            self.log_result(
+                "Login Storm: logins",
+                logins_info['failed'] == 0 and logins_info['completed'] > 0,
+                f"{logins_info['completed']} logins ({logins_info['per_second']}/s) at x{self.args.login_concurrency}, "
+                f"p50 {logins_info['latency']['p50_ms']:.0f}ms, {logins_info['rejected']} turned away with 503, "
+                f"{logins_info['failed']} failed"
+            )
+        self.phases[name] = phase
+
+    def report_backend(self):
+        response = self.client.get("/health")
+        health = response.json() if response.status_code == 200 else {}
+        hasher, tokens = health.get('password_hasher'), health.get('token_cache')
+        if hasher:
+            self.print_info(f"Password hasher: {hasher['workers']} workers, {hasher['completed']} hashes, "
+                            f"{hasher['rejected']} rejected")
+        if tokens:
+            self.print_info(f"Token cache: {tokens['hit_rate'] * 100:.1f}% hits ({tokens['hits']} hits, "
+                            f"{tokens['misses']} misses, {tokens['entries']} cached)")
+        self.report_extras['backend'] = {'password_hasher': hasher, 'token_cache': tokens}
+
+    def run(self):
+        self.print_header("LOGIN STORM BENCHMARK")
+        if not self.setup_backend():
+            return False
+        try:
+            self.print_info(f"Registering {self.args.users} users...")
+            self.emails = [email for email in self.seeder.bounded_map(self.register, range(self.args.users)) if email]
+            if not self.emails:
+                self.log_result("Login Storm: Register", False, "Could not register any storm users")
+                return False
+            response = self.login(self.emails[0])
+            self.headers = {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+            self.print_info(f"Probing alone for {self.args.duration:.0f}s...")
+            self.run_phase('baseline', logins=False)
+            self.print_info(f"Probing during {self.args.login_concurrency} concurrent logins "
+                            f"for {self.args.duration:.0f}s...")
+            self.run_phase('storm', logins=True)
+            self.check_interference("Login Storm", PROBES, self.phases['baseline'], self.phases['storm'],
+                                    "during logins")
+            self.report_backend()
+        finally:
+            self.teardown()
+        self.report_extras['phases'] = self.phases
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure request latency while logins are in flight")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--users", type=int, default=50, help="users registered to log in as")
+    parser.add_argument("--login-concurrency", type=int, default=32, help="clients logging in at once")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--probe-rate", type=float, default=20.0, help="probe rounds per second")
+    Benchmark.add_interference_arguments(parser)
+    args = parser.parse_args()
+
+    LoginStormBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Preview-mode scale benchmark for Moodscape
+Creates anonymous preview sessions in steps (1k, 10k, 100k live sessions by
+default), gives each a few mood entries and measures how session creation,
+entry creation and insight latency change as sessions pile up, together with
+the backend's RSS at every step.
+
+Usage:
+    python3 bench_preview_scale.py --stub
+    python3 bench_preview_scale.py --steps 1000,10000 --entries 3 --backend-pid 12345
+"""
+
+import argparse
+import random
+
+from harness import Benchmark, summarize_latencies
+
+def parse_steps(text):
+    return sorted(int(step) for step in text.split(','))
+
+class PreviewScaleBenchmark(Benchmark):
+    report_title = "PREVIEW SCALE BENCHMARK"
+    report_prefix = "preview_scale_report"
+
+    def __init__(self, args):
+        super().__init__(args)
+        self.sessions = []
+        self.rng = random.Random(args.seed)
+
+    def create_session(self, _):
+        response = self.client.post("/api/preview/session")
+        if response.status_code != 200:
+            return None, response.duration_ms
+        return response.json()['session_id'], response.duration_ms
+
+    def create_entry(self, session_id):
+        response = self.client.post("/api/preview/mood-entries", data={
+            'session_id': session_id,
+            'mood': self.rng.randint(1, 10),
+            'energy': self.rng.randint(1, 10),
+            'stress': self.rng.randint(1, 10),
+            'sleep_hours': round(self.rng.uniform(4, 10), 1),
+            'notes': 'Preview scale entry',
+            'activities': '["exercise", "socializing"]'
+        })
+        return response.status_code == 200, response.duration_ms
+
+    def read_insights(self, session_id):
+        response = self.client.get("/api/preview/insights", params={'session_id': session_id})
+        return response.status_code == 200, response.duration_ms
+
+    def check_phase(self, name, live, results):
+        """Log one result per phase and step instead of one per request"""
+        failures = sum(1 for ok, _ in results if not ok)
+        latency = summarize_latencies([ms for _, ms in results])
+        self.log_result(
+            f"Preview Scale: {name} @ {live}",
+            failures == 0,
+            f"{len(results)} requests, {failures} failed, p50 {latency['p50_ms']:.1f}ms, p99 {latency['p99_ms']:.1f}ms"
+        )
+        return latency
+
+    def run_step(self, target):
+        """Grow the live session count to target and measure every phase"""
+        new_count = target - len(self.sessions)
+        self.print_info(f"Creating {new_count} sessions ({len(self.sessions)} → {target})...")
+        created = self.map(self.create_session, range(new_count))
+        new_sessions = [session_id for session_id, _ in created if session_id]
+        self.sessions.extend(new_sessions)
+        session_latency = self.check_phase("Session Create", target,
+                                           [(session_id is not None, ms) for session_id, ms in created])
+
+        entry_latency = self.check_phase("Entry Create", target,
+                                         self.map(self.create_entry, new_sessions * self.args.entries))
+
+        sample = self.rng.sample(self.sessions, min(self.args.insight_samples, len(self.sessions)))
+        insight_latency = self.check_phase("Insights", target, self.map(self.read_insights, sample))
+
+        step = {
+            'live_sessions': len(self.sessions),
+            'session_create': session_latency,
+            'entry_create': entry_latency,
+            'insights': insight_latency,
+            'rss_mb': self.backend_rss_mb()
+        }
+        rss = f", backend RSS {step['rss_mb']}MB" if step['rss_mb'] is not None else ""
+        self.print_info(
+            f"{step['live_sessions']} sessions: create p50 {session_latency['p50_ms']:.1f}ms, "
+            f"entry p50 {entry_latency['p50_ms']:.1f}ms, insights p50 {insight_latency['p50_ms']:.1f}ms{rss}"
+        )
+        return step
+
+    def check_scaling(self, steps):
+        """Compare the largest step against the smallest one
+
+        O(1) per-session work keeps p50 latency roughly flat however many
+        sessions are live; a ratio above max_ratio means something scans
+        or rehashes in proportion to the session count.
+        """
+        first, last = steps[0], steps[-1]
+        self.check_growth("Preview Scale", first, last, ('session_create', 'entry_create', 'insights'),
+                          'live_sessions', "sessions")
+        if first['rss_mb'] is not None and last['rss_mb'] is not None:
+            added = last['live_sessions'] - first['live_sessions']
+            per_session = (last['rss_mb'] - first['rss_mb']) * 1024 / added if added else 0.0
+            self.report_extras['rss_kb_per_session'] = round(per_session, 2)
+            self.print_info(f"Backend memory: {per_session:.2f}KB per live session")
+
+    def run(self):
+        self.print_header("PREVIEW SESSION SCALE BENCHMARK")
+        if not self.setup_backend():
+            return False
+        steps = []
+        try:
+            for target in self.args.steps:
+                if target <= len(self.sessions):
+                    continue
+                steps.append(self.run_step(target))
+            if len(steps) > 1:
+                self.check_scaling(steps)
+        finally:
+            self.teardown()
+        self.report_extras['steps'] = steps
+        self.report_extras['entries_per_session'] = self.args.entries
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure preview-mode latency against live session count")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--steps", type=parse_steps, default=[1000, 10000, 100000],
+                        help="comma-separated live session counts to measure at")
+    parser.add_argument("--entries", type=int, default=2, help="mood entries posted to each new session")
+    parser.add_argument("--insight-samples", type=int, default=500,
+                        help="random live sessions whose insights are read at each step")
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="allowed p50 growth from the smallest to the largest step")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    PreviewScaleBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
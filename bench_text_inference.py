@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Text-inference throughput benchmark for Moodscape
+Sends texts from short check-in notes to multi-paragraph journal entries to
+/api/ai/predict-mood, /api/ai/sentiment-analysis and
+/api/therapy/analyze-emotion at several concurrency levels, and reports
+requests/sec and latency per endpoint, length bucket and concurrency side by
+side. --repeated replays the corpus to check the hit rate and latency drop of
+the backend's analysis cache.
+
+Usage:
+    python3 bench_text_inference.py --stub
+    python3 bench_text_inference.py --concurrency 1,8,32 --requests 500
+    python3 bench_text_inference.py --corpus journal_samples.json
+    python3 bench_text_inference.py --repeated --repeat-passes 9
+"""
+
+import argparse
+import json
+import random
+import time
+
+from harness import Benchmark, Colors, summarize_latencies
+
+TEXT_ENDPOINTS = [
+    ("predict-mood", "/api/ai/predict-mood"),
+    ("sentiment-analysis", "/api/ai/sentiment-analysis"),
+    ("analyze-emotion", "/api/therapy/analyze-emotion"),
+]
+
+# (bucket, min words, max words)
+LENGTH_BUCKETS = [
+    ("short", 1, 20),
+    ("medium", 21, 80),
+    ("long", 81, 300),
+    ("journal", 301, 5000),
+]
+# Words per generated text in each bucket
+BUCKET_TARGETS = {"short": (5, 15), "medium": (30, 70), "long": (120, 260), "journal": (400, 900)}
+
+OPENINGS = ["Today I felt", "This morning I was", "Honestly I am", "Lately I have been",
+            "After work I felt", "Tonight I feel", "All week I have been"]
+FEELINGS = ["happy", "calm", "tired", "anxious", "grateful", "stressed", "hopeful", "lonely",
+            "excited", "overwhelmed", "content", "frustrated", "relaxed", "sad", "proud", "worried"]
+REASONS = ["because the meeting ran late", "after a long walk in the park", "since I slept badly",
+           "when my friend called", "because the deadline keeps moving", "after cooking dinner with family",
+           "while the rain kept going", "because I finally finished the project",
+           "after skipping the gym again", "when I thought about next week"]
+FOLLOW_UPS = ["I want to remember this.", "Not sure what to do about it.", "Tomorrow should be better.",
+              "I need more sleep.", "It felt good to write it down.", "I keep thinking about it."]
+
+def synthetic_text(rng, words):
+    """A journal-like text of roughly words words; long texts are split into paragraphs"""
+    sentences = []
+    count = 0
+    while count < words:
+        sentence = (f"{rng.choice(OPENINGS)} {rng.choice(FEELINGS)} and {rng.choice(FEELINGS)} "
+                    f"{rng.choice(REASONS)}. {rng.choice(FOLLOW_UPS)}")
+        sentences.append(sentence)
+        count += len(sentence.split())
+    paragraphs = [" ".join(sentences[index:index + 5]) for index in range(0, len(sentences), 5)]
+    return "\n\n".join(paragraphs)
+
+def build_corpus(per_bucket=50, seed=42):
+    rng = random.Random(seed)
+    return [synthetic_text(rng, rng.randint(*BUCKET_TARGETS[bucket]))
+            for bucket, _, _ in LENGTH_BUCKETS for _ in range(per_bucket)]
+
+def bucket_corpus(texts):
+    """Group texts by word-count bucket"""
+    buckets = {bucket: [] for bucket, _, _ in LENGTH_BUCKETS}
+    for text in texts:
+        words = len(text.split())
+        for bucket, low, high in LENGTH_BUCKETS:
+            if low <= words <= high:
+                buckets[bucket].append(text)
+                break
+    return {bucket: texts for bucket, texts in buckets.items() if texts}
+
+def parse_levels(text):
+    return sorted(int(level) for level in text.split(','))
+
+class TextInferenceBenchmark(Benchmark):
+    report_title = "TEXT INFERENCE BENCHMARK"
+    report_prefix = "text_inference_report"
+
+    def __init__(self, args):
+        args.workers = max(args.workers, max(args.concurrency))
+        super().__init__(args)
+        self.headers = {'Authorization': f'Bearer {args.token}'}
+        self.cells = []
+
+    def measure(self, name, path, bucket, texts, concurrency):
+        """Send args.requests texts from one bucket to one endpoint at a fixed concurrency"""
+        payloads = [texts[index % len(texts)] for index in range(self.args.requests)]
+
+        def send(text):
+            response = self.client.post(path, json={'text': text}, headers=self.headers)
+            return response.status_code == 200, response.duration_ms
+
+        start = time.perf_counter()
+        outcomes = self.map(send, payloads, workers=concurrency)
+        elapsed = time.perf_counter() - start
+        failures = sum(1 for ok, _ in outcomes if not ok)
+        cell = {
+            'endpoint': name,
+            'bucket': bucket,
+            'concurrency': concurrency,
+            'mean_words': round(sum(len(text.split()) for text in payloads) / len(payloads), 1),
+            'requests': len(payloads),
+            'failures': failures,
+            'requests_per_second': round(len(payloads) / elapsed, 1),
+            'latency': summarize_latencies([ms for _, ms in outcomes])
+        }
+        self.cells.append(cell)
+        self.log_result(
+            f"Text Inference: {name} {bucket} x{concurrency}",
+            failures == 0,
+            f"{cell['requests_per_second']} req/s, p50 {cell['latency']['p50_ms']:.1f}ms, "
+            f"p99 {cell['latency']['p99_ms']:.1f}ms, {failures} failed"
+        )
+
+    def print_comparison(self):
+        """One table per bucket: endpoints as rows, req/s and p50 per concurrency level"""
+        header = "".join(f"{f'x{level} req/s | p50':>23}" for level in self.args.concurrency)
+        for bucket in dict.fromkeys(cell['bucket'] for cell in self.cells):
+            print(f"\n{Colors.BOLD}{bucket.upper()} TEXTS{Colors.END}")
+            print(f"{'endpoint':<20}{header}")
+            for name, _ in TEXT_ENDPOINTS:
+                row = ""
+                for level in self.args.concurrency:
+                    cell = next((cell for cell in self.cells if cell['endpoint'] == name and
+                                 cell['bucket'] == bucket and cell['concurrency'] == level), None)
+                    if cell:
+                        row += f"{cell['requests_per_second']:>13.1f} | {cell['latency']['p50_ms']:>5.1f}ms"
+                print(f"{name:<20}{row}")
+
+    def cache_stats(self):
+        response = self.client.get("/health")
+        return response.json().get('analysis_cache') if response.status_code == 200 else None
+
+    def run_repeated(self, texts):
+        """Send the same texts args.repeat_passes more times and check the analysis cache
+
+        The first pass over a text is a miss; every later pass should be a
+        hit, so the hit rate over the workload approaches
+        repeat_passes / (repeat_passes + 1) and the repeated passes should
+        be no slower than the first.
+        """
+        before = self.cache_stats()
+        if before is None:
+            self.log_result("Text Cache: Statistics", False, "/health reports no analysis_cache counters")
+            return
+        concurrency = self.args.concurrency[0]
+        cache_results = {}
+        for name, path in TEXT_ENDPOINTS:
+            # Tag texts per endpoint: the endpoints share one analysis cache
+            tagged = [f"{text} [{name}]" for text in texts]
+
+            def send(text):
+                response = self.client.post(path, json={'text': text}, headers=self.headers)
+                return response.duration_ms
+
+            first = self.map(send, tagged, workers=concurrency)
+            repeated = self.map(send, tagged * self.args.repeat_passes, workers=concurrency)
+            first_stats, repeated_stats = summarize_latencies(first), summarize_latencies(repeated)
+            cache_results[name] = {'first_pass': first_stats, 'repeated': repeated_stats}
+            drop = 1 - repeated_stats['p50_ms'] / first_stats['p50_ms'] if first_stats['p50_ms'] else 0.0
+            self.log_result(
+                f"Text Cache: {name} latency",
+                repeated_stats['p50_ms'] <= first_stats['p50_ms'] * 1.05,
+                f"first pass p50 {first_stats['p50_ms']:.2f}ms, repeated p50 {repeated_stats['p50_ms']:.2f}ms "
+                f"({drop * 100:.0f}% lower)"
+            )
+
+        after = self.cache_stats()
+        hits, misses = after['hits'] - before['hits'], after['misses'] - before['misses']
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        expected = self.args.repeat_passes / (self.args.repeat_passes + 1)
+        self.log_result(
+            "Text Cache: Hit rate",
+            hit_rate >= expected - 0.05,
+            f"{hit_rate * 100:.1f}% ({hits} hits, {misses} misses, "
+            f"{after['evictions'] - before['evictions']} evictions), expected ~{expected * 100:.0f}%"
+        )
+        self.report_extras['analysis_cache'] = {'endpoints': cache_results, 'hit_rate': round(hit_rate, 4),
+                                                'health': after}
+
+    def run(self):
+        self.print_header("TEXT INFERENCE THROUGHPUT BENCHMARK")
+        if self.args.corpus:
+            with open(self.args.corpus) as f:
+                texts = json.load(f)
+        else:
+            texts = build_corpus(self.args.per_bucket, self.args.seed)
+        buckets = bucket_corpus(texts)
+        self.print_info("Corpus: " + ", ".join(f"{bucket} {len(items)}" for bucket, items in buckets.items()))
+        if not self.setup_backend():
+            return False
+        try:
+            if self.args.repeated:
+                self.run_repeated([text for bucket_texts in buckets.values() for text in bucket_texts])
+                return True
+            for bucket, bucket_texts in buckets.items():
+                for concurrency in self.args.concurrency:
+                    for name, path in TEXT_ENDPOINTS:
+                        self.measure(name, path, bucket, bucket_texts, concurrency)
+        finally:
+            self.teardown()
+        self.print_comparison()
+        self.report_extras['text_inference'] = self.cells
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure text-inference throughput per endpoint and text length")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--concurrency", type=parse_levels, default=[1, 4, 16],
+                        help="comma-separated numbers of concurrent requests")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="requests per endpoint, length bucket and concurrency level")
+    parser.add_argument("--corpus", help="JSON list of texts to use instead of the generated corpus")
+    parser.add_argument("--per-bucket", type=int, default=50, help="generated texts per length bucket")
+    parser.add_argument("--repeated", action="store_true",
+                        help="send every corpus text repeatedly and check the analysis cache instead")
+    parser.add_argument("--repeat-passes", type=int, default=4, help="repeats of each text in --repeated mode")
+    parser.add_argument("--token", default="demo_token", help="bearer token for the AI endpoints")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    TextInferenceBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Background training benchmark for POST /api/ai/train-models
+Seeds --users users with synthetic histories, probes GET /health and a few
+authenticated reads at a steady rate on their own, then again while every
+user keeps submitting training jobs and polling them to completion. Compares
+probe p50/p99 between the two phases, checks that submitting answers 202
+straight away, that each job's progress only moves forward and ends at 1.0,
+and that /api/ai/models serves the finished job's models right after it
+succeeds.
+
+Usage:
+    python3 bench_training.py --stub
+    python3 bench_training.py --users 8 --entries 2000 --duration 30
+    python3 bench_training.py --stub --stub-args "--training-workers 2 --training-rounds 100"
+"""
+
+import argparse
+import threading
+import time
+
+from harness import Benchmark, summarize_latencies
+from mood_history import BulkSeeder, generate_histories
+
+TRAIN_PATH = "/api/ai/train-models"
+PROBES = [
+    ("health", "/health", False),
+    ("stats", "/api/stats", True),
+    ("entries_page", "/api/mood-entries?page_size=20", True),
+    ("models", "/api/ai/models", True),
+]
+
+class TrainingBenchmark(Benchmark):
+    report_title = "BACKGROUND TRAINING BENCHMARK"
+    report_prefix = "training_report"
+
+    def __init__(self, args):
+        args.workers = max(args.workers, args.users + 1)
+        super().__init__(args)
+        self.seeder = BulkSeeder(self.client, workers=min(args.workers, 8))
+        self.tokens = []
+        self.phases = {}
+
+    def seed(self):
+        self.tokens = [token for token in self.seeder.create_users(self.args.users, prefix='training') if token]
+        if len(self.tokens) != self.args.users:
+            self.log_result("Training: Create Users", False,
+                            f"{len(self.tokens)}/{self.args.users} benchmark users registered")
+            return False
+        history = generate_histories(len(self.tokens), int(self.args.years * 365),
+                                     entries_per_user=self.args.entries, seed=self.args.seed)
+        self.print_info(f"Seeding {self.args.entries} entries for each of {len(self.tokens)} users...")
+        result = self.seeder.seed(history, self.tokens)
+        self.log_result("Training: Seed", result['failures'] == 0,
+                        f"{result['entries']} entries posted at {result['entries_per_second']}/s, "
+                        f"{result['failures']} failed")
+        return result['failures'] == 0
+
+    def train(self, stop, token, outcomes):
+        """Submit a job for one user, poll it to the end and check the served models; repeat until stop"""
+        headers = {'Authorization': f'Bearer {token}'}
+        while not stop.is_set():
+            response = self.client.post(TRAIN_PATH, headers=headers)
+            outcome = {'status': response.status_code, 'submit_ms': response.duration_ms, 'state': None,
+                       'progress': [], 'swapped': False}
+            outcomes.append(outcome)
+            if response.status_code != 202:
+                stop.wait(self.args.poll_interval)
+                continue
+            job_id = response.json()['job_id']
+            submitted = time.perf_counter()
+            while True:
+                status = self.client.get(f"{TRAIN_PATH}/{job_id}", headers=headers)
+                if status.status_code != 200:
+                    outcome['state'] = f"status {status.status_code}"
+                    break
+                job = status.json()
+                outcome['progress'].append(job['progress'])
+                if job['state'] in ('succeeded', 'failed'):
+                    outcome['state'] = job['state']
+                    outcome['seconds'] = time.perf_counter() - submitted
+                    break
+                time.sleep(self.args.poll_interval)
+            if outcome['state'] == 'succeeded':
+                served = self.client.get("/api/ai/models", headers=headers).json().get('models') or {}
+                outcome['swapped'] = served.get('version') == job_id
+
+    def run_phase(self, name, training):
+        stop = threading.Event()
+        outcomes = []
+        trainers = [threading.Thread(target=self.train, args=(stop, token, outcomes), daemon=True)
+                    for token in (self.tokens if training else [])]
+        for thread in trainers:
+            thread.start()
+        timer = threading.Timer(self.args.duration, stop.set)
+        timer.start()
+        latencies, failures = self.probe(PROBES, self.args.probe_rate, stop,
+                                         {'Authorization': f'Bearer {self.tokens[0]}'})
+        for thread in trainers:
+            thread.join()
+
+        phase = {'probes': {probe: summarize_latencies(values) for probe, values in latencies.items()},
+                 'probe_failures': failures}
+        summary = ", ".join(f"{probe} p99 {stats['p99_ms']:.1f}ms" for probe, stats in phase['probes'].items())
+        self.log_result(f"Training: {name} probes", failures == 0, f"{summary}, {failures} failed")
+        if training:
+            self.check_jobs(phase, outcomes)
+        self.phases[name] = phase
+
+    def check_jobs(self, phase, outcomes):
+        submitted = [outcome for outcome in outcomes if outcome['status'] == 202]
+        finished = [outcome for outcome in submitted if outcome['state'] is not None]
+        succeeded = [outcome for outcome in finished if outcome['state'] == 'succeeded']
+        submit = summarize_latencies([outcome['submit_ms'] for outcome in outcomes])
+        phase['jobs'] = {
+            'submitted': len(submitted),
+            'rejected': sum(1 for outcome in outcomes if outcome['status'] == 503),
+            'succeeded': len(succeeded),
+            'failed': len(finished) - len(succeeded),
+            'submit_latency': submit,
+            'seconds': summarize_latencies([outcome['seconds'] * 1000 for outcome in succeeded])
+        }
+        jobs = phase['jobs']
+        self.log_result(
+            "Training: submit latency",
+            submit['p99_ms'] <= self.args.max_submit_ms,
+            f"{len(outcomes)} submissions, p50 {submit['p50_ms']:.1f}ms p99 {submit['p99_ms']:.1f}ms "
+            f"(limit {self.args.max_submit_ms:.0f}ms), {jobs['rejected']} turned away with 503"
+        )
+        self.log_result(
+            "Training: jobs",
+            jobs['succeeded'] > 0 and jobs['failed'] == 0,
+            f"{jobs['succeeded']} succeeded in p50 {jobs['seconds']['p50_ms'] / 1000:.1f}s, {jobs['failed']} failed, "
+            f"{len(submitted) - len(finished)} unfinished at the end of the phase"
+        )
+        # Polls may skip stages, but progress must never go backwards and must end complete
+        regressed = sum(1 for outcome in finished
+                        if any(later < earlier for earlier, later in zip(outcome['progress'], outcome['progress'][1:])))
+        incomplete = sum(1 for outcome in succeeded if outcome['progress'][-1] != 1.0)
+        self.log_result("Training: progress", regressed == 0 and incomplete == 0,
+                        f"{regressed} jobs went backwards, {incomplete} succeeded below 1.0")
+        stale = sum(1 for outcome in succeeded if not outcome['swapped'])
+        self.log_result("Training: model swap", stale == 0,
+                        f"{len(succeeded) - stale}/{len(succeeded)} finished jobs served right after completion")
+
+    def report_backend(self):
+        response = self.client.get("/health")
+        training = (response.json() if response.status_code == 200 else {}).get('training')
+        if training:
+            self.print_info(f"Training queue: {training['workers']} worker processes, {training['completed']} "
+                            f"completed, {training['failed']} failed, {training['queued']} still queued")
+        self.report_extras['backend'] = {'training': training}
+
+    def run(self):
+        self.print_header("BACKGROUND TRAINING BENCHMARK")
+        if not self.setup_backend():
+            return False
+        try:
+            if not self.seed():
+                return False
+            self.print_info(f"Probing alone for {self.args.duration:.0f}s...")
+            self.run_phase('baseline', training=False)
+            self.print_info(f"Probing while {len(self.tokens)} users train models "
+                            f"for {self.args.duration:.0f}s...")
+            self.run_phase('training', training=True)
+            self.check_interference("Training", PROBES, self.phases['baseline'], self.phases['training'],
+                                    "during training")
+            self.report_backend()
+        finally:
+            self.teardown()
+        self.report_extras['phases'] = self.phases
+        return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API latency while models train in the background")
+    Benchmark.add_arguments(parser)
+    parser.add_argument("--users", type=int, default=4, help="users submitting training jobs")
+    parser.add_argument("--entries", type=int, default=1000, help="entries seeded per user")
+    parser.add_argument("--years", type=float, default=2.0, help="time span each history covers")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per phase")
+    parser.add_argument("--probe-rate", type=float, default=20.0, help="probe rounds per second")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="seconds between job status polls")
+    parser.add_argument("--max-submit-ms", type=float, default=100.0,
+                        help="slowest acceptable train-models p99; the request only queues the job")
+    Benchmark.add_interference_arguments(parser)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    TrainingBenchmark.run_main(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Performance regression detector for Moodscape test reports
+Compares the newest final_test_report_*.json against a rolling baseline of the
+reports before it and exits non-zero when a route got significantly slower or
+a test started failing. Latency is compared per route on the p50/p95 each
+report records over many requests, never on single requests.
+
+Usage:
+    python3 compare_reports.py
+    python3 compare_reports.py --pattern "final_test_report_*.json" --window 10
+    python3 compare_reports.py --current final_test_report_20251007_231143.json
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import statistics
+import sys
+
+from harness import Colors, iter_results_file
+
+DEFAULT_PATTERN = "final_test_report_*.json"
+
+def load_report(path):
+    """Load a report; list-style reports and JSONL result streams are wrapped
+    into the dict format, and streamed reports pull in their results file"""
+    if path.endswith('.jsonl'):
+        report = {'results': list(iter_results_file(path))}
+    else:
+        with open(path) as f:
+            report = json.load(f)
+        if isinstance(report, list):
+            report = {'results': report}
+        if 'results' not in report and os.path.exists(report.get('results_file', '')):
+            report['results'] = list(iter_results_file(report['results_file']))
+    report['file'] = path
+    return report
+
+def category_of(test_name):
+    return test_name.split(':')[0] if ':' in test_name else 'General'
+
+def index_results(report):
+    """Map (category, test) to its result; repeated names get an occurrence suffix"""
+    indexed = {}
+    for result in report.get('results', []):
+        name = result['test']
+        key = (category_of(name), name)
+        occurrence = 2
+        while key in indexed:
+            key = (category_of(name), f"{name} #{occurrence}")
+            occurrence += 1
+        indexed[key] = result
+    return indexed
+
+def robust_sigma(values):
+    """Scaled median absolute deviation, a spread estimate that ignores outlier runs"""
+    median = statistics.median(values)
+    return 1.4826 * statistics.median(abs(value - median) for value in values)
+
+def success_rate_z(baseline_passed, baseline_total, current_passed, current_total):
+    """One-sided two-proportion z statistic for a drop in success rate"""
+    if not baseline_total or not current_total:
+        return 0.0
+    pooled = (baseline_passed + current_passed) / (baseline_total + current_total)
+    variance = pooled * (1 - pooled) * (1 / baseline_total + 1 / current_total)
+    if variance == 0:
+        return 0.0
+    return (baseline_passed / baseline_total - current_passed / current_total) / math.sqrt(variance)
+
+# Compared statistic and the multiple of min_samples it needs: a p95 over
+# few requests is decided by one or two slow ones
+LATENCY_STATS = (('p50_ms', 1), ('p95_ms', 5))
+
+def route_timings(report, min_samples):
+    """{route: request timing summary} for routes with at least min_samples requests"""
+    return {route: stats for route, stats in report.get('request_timings', {}).items()
+            if stats.get('count', 0) >= min_samples}
+
+def is_slower(value, reference, z_threshold, min_ratio, min_ms):
+    """(slower, median, z) of value against a list of reference values"""
+    median = statistics.median(reference)
+    # Floor the spread so a perfectly steady baseline does not flag 1ms of jitter
+    sigma = max(robust_sigma(reference), 0.05 * median, 0.5)
+    z = (value - median) / sigma
+    return z > z_threshold and value > median * (1 + min_ratio) and value - median > min_ms, median, z
+
+def latency_regressions(current, baseline, z_threshold, min_ratio, min_ms, min_runs, min_samples, confirm_runs):
+    """Routes whose p50 or p95 is slower in the current report and in the confirm_runs - 1 reports before it
+
+    Each of those runs is compared against the baseline runs older than all
+    of them, so one slow run (a noisy neighbour, a GC pause) never fails the
+    check on its own.
+    """
+    regressions = []
+    history = [route_timings(report, min_samples) for report in baseline]
+    split = max(0, len(history) - (confirm_runs - 1))
+    recent, reference_runs = history[split:], history[:split]
+    for route, stats in route_timings(current, min_samples).items():
+        runs = [timings[route] for timings in recent if route in timings] + [stats]
+        if len(runs) < confirm_runs:
+            continue
+        for stat, sample_factor in LATENCY_STATS:
+            needed = min_samples * sample_factor
+            if any(run['count'] < needed for run in runs):
+                continue
+            reference = [timings[route][stat] for timings in reference_runs
+                         if route in timings and timings[route]['count'] >= needed]
+            if len(reference) < min_runs:
+                continue
+            checks = [is_slower(run[stat], reference, z_threshold, min_ratio, min_ms) for run in runs]
+            if all(slower for slower, _, _ in checks):
+                _, median, z = checks[-1]
+                value = stats[stat]
+                regressions.append({
+                    'kind': 'latency',
+                    'category': 'Route',
+                    'test': route,
+                    'detail': f"{stat[:3]} {value:.1f}ms over {stats['count']} requests vs baseline median "
+                              f"{median:.1f}ms (+{(value / median - 1) * 100:.0f}%, z={z:.1f}, "
+                              f"slow in the last {len(runs)} runs, {len(reference)} baseline runs)"
+                })
+                break
+    return regressions
+
+def detect_regressions(current, baseline, z_threshold=3.0, min_ratio=0.2, min_ms=5.0,
+                       min_runs=3, flaky_pass_rate=0.8, rate_z=1.645, min_samples=20, confirm_runs=2):
+    """Compare one report against a list of baseline reports (oldest first)
+
+    A latency regression is a route whose p50 (over at least min_samples
+    requests) or p95 (over five times as many) sits more than z_threshold robust standard
+    deviations above the baseline median and exceeds it by at least
+    min_ratio and min_ms, in the current report and in each of the
+    confirm_runs - 1 reports before it. A success regression is a test
+    that passed in at least flaky_pass_rate of the baseline runs and fails
+    now, or an overall success-rate drop with a one-sided z statistic above
+    rate_z. Returns a list of regression dicts.
+    """
+    regressions = latency_regressions(current, baseline, z_threshold, min_ratio, min_ms, min_runs,
+                                      min_samples, confirm_runs)
+    current_results = index_results(current)
+    baseline_results = [index_results(report) for report in baseline]
+
+    for key, result in current_results.items():
+        category, test = key
+        history = [results[key] for results in baseline_results if key in results]
+        if not history:
+            continue
+
+        passes = sum(1 for past in history if past['success'])
+        if not result['success'] and passes / len(history) >= flaky_pass_rate:
+            regressions.append({
+                'kind': 'success',
+                'category': category,
+                'test': test,
+                'detail': f"now failing ({result['message']}); passed {passes}/{len(history)} baseline runs"
+            })
+
+    baseline_passed = sum(1 for results in baseline_results for result in results.values() if result['success'])
+    baseline_total = sum(len(results) for results in baseline_results)
+    current_passed = sum(1 for result in current_results.values() if result['success'])
+    current_total = len(current_results)
+    z = success_rate_z(baseline_passed, baseline_total, current_passed, current_total)
+    if z > rate_z:
+        regressions.append({
+            'kind': 'success-rate',
+            'category': 'Overall',
+            'test': 'Success Rate',
+            'detail': f"{current_passed / current_total * 100:.1f}% vs baseline "
+                      f"{baseline_passed / baseline_total * 100:.1f}% (z={z:.2f})"
+        })
+
+    return regressions
+
+def report_history(pattern=DEFAULT_PATTERN, current=None, window=5):
+    """Return (current report, baseline reports) from the files matching pattern
+
+    Report names embed a sortable timestamp, so the newest report is the
+    last one in name order; the baseline is the window reports before it.
+    """
+    paths = sorted(glob.glob(pattern))
+    if current is None:
+        if not paths:
+            return None, []
+        current = paths[-1]
+    older = [path for path in paths if os.path.basename(path) < os.path.basename(current)]
+    return load_report(current), [load_report(path) for path in older[-window:]]
+
+def print_regressions(current, baseline, regressions):
+    print(f"{Colors.BOLD}Comparing {current['file']} against {len(baseline)} baseline report(s){Colors.END}")
+    if not regressions:
+        print(f"{Colors.GREEN}✅ No regressions detected{Colors.END}")
+        return
+    print(f"{Colors.RED}{Colors.BOLD}REGRESSIONS:{Colors.END}")
+    for regression in regressions:
+        print(f"{Colors.RED}  • [{regression['kind']}] {regression['category']} / "
+              f"{regression['test']}: {regression['detail']}{Colors.END}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect regressions across Moodscape test reports")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN, help="glob matching the report history")
+    parser.add_argument("--current", help="report to check (default: newest matching report)")
+    parser.add_argument("--window", type=int, default=5, help="number of earlier reports in the baseline")
+    parser.add_argument("--min-runs", type=int, default=3,
+                        help="baseline runs with timings needed before latency is compared")
+    parser.add_argument("--min-samples", type=int, default=20,
+                        help="requests a route needs in a report before its p50/p95 are compared")
+    parser.add_argument("--confirm-runs", type=int, default=2,
+                        help="consecutive runs, including this one, a route must be slow in to count")
+    parser.add_argument("--z", type=float, default=3.0, help="robust z-score that counts as significant")
+    parser.add_argument("--min-ratio", type=float, default=0.2, help="minimum relative slowdown to report")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="minimum absolute slowdown (ms) to report")
+    args = parser.parse_args()
+
+    current, baseline = report_history(args.pattern, args.current, args.window)
+    if current is None:
+        print(f"{Colors.RED}❌ No reports match {args.pattern}{Colors.END}")
+        sys.exit(2)
+    if not baseline:
+        print(f"{Colors.YELLOW}⚠️  No earlier reports to compare {current['file']} against{Colors.END}")
+        sys.exit(0)
+
+    regressions = detect_regressions(current, baseline, z_threshold=args.z, min_ratio=args.min_ratio,
+                                     min_ms=args.min_ms, min_runs=args.min_runs, min_samples=args.min_samples,
+                                     confirm_runs=args.confirm_runs)
+    print_regressions(current, baseline, regressions)
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
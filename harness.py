@@ -0,0 +1,896 @@
+"""
+Shared harness for the Moodscape test scripts
+Provides the pooled HTTP client, colored output and result reporting used by
+TestRunner, FinalTester and CrossPlatformTester
+"""
+
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE_URL = "http://localhost:8000"
+
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    PURPLE = '\033[95m'
+    CYAN = '\033[96m'
+    WHITE = '\033[97m'
+    BOLD = '\033[1m'
+    END = '\033[0m'
+
+def percentile(samples, pct):
+    """Return the nearest-rank percentile of an already sorted list"""
+    if not samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+def summarize_latencies(latencies):
+    """Summarize a list of latencies (ms) as count, mean and p50/p95/p99/max"""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'count': len(latencies),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3)
+    }
+
+class LatencyHistogram:
+    """Constant-memory latency summary over log-spaced buckets
+
+    Bucket bounds grow by 1% so percentiles are within ~1% of the exact
+    value; count, mean and max are exact.
+    """
+
+    GROWTH = 1.01
+    LOG_GROWTH = math.log(GROWTH)
+    MIN_MS = 0.001
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency_ms):
+        index = math.ceil(math.log(max(latency_ms, self.MIN_MS)) / self.LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += latency_ms
+        self.max = max(self.max, latency_ms)
+
+    def percentile(self, pct):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.GROWTH ** index, self.max)
+        return self.max
+
+    def summary(self):
+        """Same fields as summarize_latencies"""
+        if not self.count:
+            return summarize_latencies([])
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3),
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'p99_ms': round(self.percentile(99), 3),
+            'max_ms': round(self.max, 3)
+        }
+
+def _body_size(body):
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    return None
+
+# Request timing fields copied into a logged result when a response is passed
+RESULT_TIMING_FIELDS = ('status', 'duration_ms', 'ttfb_ms', 'request_bytes', 'response_bytes')
+# Entry ids and job ids in paths, so per-route timings group /api/ai/train-models/<id> together
+ID_SEGMENT = re.compile(r'/(?:\d+|[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12})(?=/|$)')
+
+class HarnessClient:
+    """Keep-alive, connection-pooled HTTP client that times every request
+
+    Each thread gets its own requests.Session so the client can be shared by
+    concurrent workers; connections are reused across calls instead of being
+    opened per request like the module-level requests.get/post helpers do.
+    """
+
+    def __init__(self, base_url=API_BASE_URL, pool_size=10, timeout=30, record_timings=True):
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.record_timings = record_timings
+        # Per 'METHOD /path' histograms keep memory flat however long a run lasts
+        self.route_latency = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def url(self, path):
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}{path}"
+
+    def request(self, method, path, **kwargs):
+        """Send a request and attach its timing, sizes and status as response.timing
+
+        The body is read eagerly (unless stream=True) so duration_ms covers the
+        full transfer while ttfb_ms stops once the response headers arrive.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        stream = kwargs.pop('stream', False)
+        start = time.perf_counter()
+        response = None
+        ttfb_ms = None
+        try:
+            response = self._session().request(method, self.url(path), stream=True, **kwargs)
+            ttfb_ms = (time.perf_counter() - start) * 1000
+            if not stream:
+                response.content  # read the body now so duration_ms covers the transfer
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            timing = {
+                'method': method,
+                'path': urlsplit(path).path,
+                'status': response.status_code if response is not None else None,
+                'duration_ms': round(duration_ms, 3),
+                'ttfb_ms': round(ttfb_ms, 3) if ttfb_ms is not None else None,
+                'request_bytes': _body_size(response.request.body) if response is not None else None,
+                'response_bytes': len(response.content) if response is not None and not stream else None,
+                'timestamp': datetime.now().isoformat()
+            }
+            if self.record_timings:
+                route = f"{method} {ID_SEGMENT.sub('/{id}', timing['path'])}"
+                with self._lock:
+                    self.route_latency.setdefault(route, LatencyHistogram()).add(duration_ms)
+        response.duration_ms = duration_ms
+        response.timing = timing
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def timing_summary(self):
+        """Latency summary per 'METHOD /path' over every recorded request"""
+        with self._lock:
+            return {route: histogram.summary() for route, histogram in sorted(self.route_latency.items())}
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+def wait_for_healthy(base_url=API_BASE_URL, timeout=60, process=None,
+                     initial_delay=0.05, max_delay=1.0):
+    """Poll /health with exponential backoff until it answers 200
+
+    Returns the seconds waited, or None if the timeout expires or the given
+    process exits first.
+    """
+    client = HarnessClient(base_url, pool_size=1, timeout=min(5, timeout), record_timings=False)
+    start = time.perf_counter()
+    delay = initial_delay
+    try:
+        while True:
+            if process is not None and process.poll() is not None:
+                return None
+            try:
+                if client.get('/health').status_code == 200:
+                    return time.perf_counter() - start
+            except requests.exceptions.RequestException:
+                pass
+            remaining = timeout - (time.perf_counter() - start)
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+    finally:
+        client.close()
+
+def linear_slope(points):
+    """Least-squares slope of a list of (x, y) points"""
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+class ProcessSampler:
+    """Periodically samples a process's RSS, CPU time, threads and open fds from /proc"""
+
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+    def __init__(self, pid, interval=5.0, on_sample=None):
+        self.pid = pid
+        self.interval = interval
+        self.on_sample = on_sample
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._start = None
+
+    def available(self):
+        return os.path.exists(f"/proc/{self.pid}/status")
+
+    def sample(self):
+        """Return one sample dict, or None once the process is gone"""
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                status = dict(line.split(':', 1) for line in f if ':' in line)
+            with open(f"/proc/{self.pid}/stat") as f:
+                # Fields after the ')' that closes the command name; utime and
+                # stime are fields 14 and 15 of the full line
+                fields = f.read().rsplit(')', 1)[1].split()
+            open_fds = len(os.listdir(f"/proc/{self.pid}/fd"))
+        except (FileNotFoundError, ProcessLookupError):
+            return None
+        if self._start is None:
+            self._start = time.monotonic()
+        return {
+            'elapsed_s': round(time.monotonic() - self._start, 3),
+            'rss_mb': int(status['VmRSS'].split()[0]) / 1024,
+            'cpu_s': (int(fields[11]) + int(fields[12])) / self.CLOCK_TICKS,
+            'threads': int(status['Threads']),
+            'open_fds': open_fds
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            sample = self.sample()
+            if sample is None:
+                break
+            self.samples.append(sample)
+            if self.on_sample:
+                self.on_sample(sample)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def leak_slopes(self, warmup=0.1):
+        """Per-hour growth of each metric, ignoring the first warmup fraction of samples"""
+        samples = self.samples[int(len(self.samples) * warmup):]
+        slopes = {}
+        for metric in ('rss_mb', 'threads', 'open_fds'):
+            points = [(sample['elapsed_s'] / 3600, sample[metric]) for sample in samples]
+            slopes[f"{metric}_per_hour"] = round(linear_slope(points), 3)
+        if len(samples) >= 2:
+            wall = samples[-1]['elapsed_s'] - samples[0]['elapsed_s']
+            cpu = samples[-1]['cpu_s'] - samples[0]['cpu_s']
+            slopes['cpu_percent'] = round(100 * cpu / wall, 1) if wall else 0.0
+        return slopes
+
+class BackendLogReader:
+    """Drains a backend's stdout/stderr into a log file and parses its access log
+
+    A child started with stdout/stderr=PIPE blocks on logging once the pipe
+    buffer fills, so both streams are read continuously on daemon threads.
+    Access-log lines ("GET /path HTTP/1.1" 200 ...) are counted per route,
+    and a trailing duration such as 12.3ms or 0.012s is collected into a
+    per-route server-side latency histogram. The stub backend logs one;
+    uvicorn's access log does not, so against app/main.py only counts are
+    collected unless a timing middleware appends the duration to each line.
+    """
+
+    ACCESS_LINE = re.compile(
+        r'"(?P<method>[A-Z]+) (?P<path>[^ ?"]+)\S* HTTP/[\d.]+" (?P<status>\d{3})'
+        r'(?:.*?(?P<duration>\d+(?:\.\d+)?) ?(?P<unit>ms|s)\b)?'
+    )
+
+    # python -X importtime lines: self and cumulative microseconds, then the
+    # module indented two spaces per nesting level
+    IMPORT_LINE = re.compile(r'import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<indent> *)(?P<module>\S+)')
+
+    def __init__(self, process, log_path):
+        self.log_path = log_path
+        self.imports = []
+        self.route_counts = {}
+        self.route_latency = {}
+        self._lock = threading.Lock()
+        self._log = open(log_path, 'a')
+        self._closing = False
+        self._threads = [
+            threading.Thread(target=self._drain, args=(stream, name), daemon=True)
+            for stream, name in ((process.stdout, 'stdout'), (process.stderr, 'stderr'))
+            if stream is not None
+        ]
+        self._running = len(self._threads)
+        for thread in self._threads:
+            thread.start()
+
+    def _drain(self, stream, name):
+        for line in iter(stream.readline, ''):
+            match = self.ACCESS_LINE.search(line)
+            imported = self.IMPORT_LINE.match(line)
+            with self._lock:
+                self._log.write(f"[{name}] {line}")
+                if match:
+                    self._record(match)
+                elif imported:
+                    self.imports.append((imported.group('module'), int(imported.group('self')),
+                                         int(imported.group('cumulative')), len(imported.group('indent')) // 2))
+        with self._lock:
+            self._running -= 1
+            self._log.flush()
+            if self._closing and not self._running:
+                self._log.close()
+
+    def _record(self, match):
+        route = f"{match.group('method')} {ID_SEGMENT.sub('/{id}', match.group('path'))}"
+        self.route_counts[route] = self.route_counts.get(route, 0) + 1
+        if match.group('duration'):
+            duration_ms = float(match.group('duration'))
+            if match.group('unit') == 's':
+                duration_ms *= 1000
+            self.route_latency.setdefault(route, LatencyHistogram()).add(duration_ms)
+
+    def join(self, timeout=5):
+        """Wait for both streams to hit EOF (the process has exited) and close the log
+
+        A stream still open after timeout (a grandchild holding the pipe) keeps
+        its drain thread writing, so the last thread to finish closes the log.
+        """
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._lock:
+            self._closing = True
+            if not self._running and not self._log.closed:
+                self._log.close()
+
+    def timing_summary(self):
+        """Server-side request count and latency per 'METHOD /path'"""
+        with self._lock:
+            summary = {}
+            for route, count in sorted(self.route_counts.items()):
+                summary[route] = {'count': count}
+                if route in self.route_latency:
+                    summary[route].update(self.route_latency[route].summary())
+                    summary[route]['count'] = count
+            return summary
+
+def import_profile(imports, top=15):
+    """Cumulative import time (ms) per top-level package from -X importtime records
+
+    Only modules imported directly by the program (nesting depth 0) are
+    counted, so a package's figure includes everything it pulled in.
+    """
+    packages = {}
+    for module, _, cumulative_us, depth in imports:
+        if depth == 0:
+            package = module.split('.')[0]
+            packages[package] = packages.get(package, 0) + cumulative_us / 1000
+    ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    return {
+        'total_ms': round(sum(packages.values()), 1),
+        'packages': {package: round(ms, 1) for package, ms in ranked[:top]}
+    }
+
+def correlate_timings(client_timings, server_timings):
+    """Pair client and server p50 per route; the difference is network and client overhead"""
+    correlated = {}
+    for route, client in client_timings.items():
+        server = server_timings.get(route)
+        if not server or 'p50_ms' not in server:
+            continue
+        correlated[route] = {
+            'client_p50_ms': client['p50_ms'],
+            'server_p50_ms': server['p50_ms'],
+            'overhead_p50_ms': round(client['p50_ms'] - server['p50_ms'], 3),
+            'client_count': client['count'],
+            'server_count': server['count']
+        }
+    return correlated
+
+class JsonlResultSink:
+    """Append-only JSON Lines file of results
+
+    Records are flushed to the OS every flush_every records, and a
+    background timer flushes anything still pending every flush_interval
+    seconds, so a stalled or interrupted run loses at most the last second
+    of results.
+    """
+
+    def __init__(self, path, flush_every=50, flush_interval=1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = threading.Event()
+        threading.Thread(target=self._flush_periodically, daemon=True).start()
+
+    def write(self, record):
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._flush()
+
+    def _flush(self):
+        self._file.flush()
+        self._pending = 0
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._file is not None and self._pending:
+                    self._flush()
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def iter_results_file(path):
+    """Yield the results stored in a JSONL sink, skipping a truncated last line"""
+    with open(path) as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+class StreamingAggregator:
+    """Running totals, per-category counts and latency for a stream of results"""
+
+    def __init__(self, max_failures=100):
+        self.total = 0
+        self.passed = 0
+        self.categories = {}
+        self.latency = {}
+        # Only the most recent failures are kept for the console summary
+        self.failures = deque(maxlen=max_failures)
+
+    def add(self, result):
+        category = result['test'].split(':')[0] if ':' in result['test'] else 'General'
+        stats = self.categories.setdefault(category, {'passed': 0, 'failed': 0, 'total': 0})
+        stats['total'] += 1
+        self.total += 1
+        if result['success']:
+            stats['passed'] += 1
+            self.passed += 1
+        else:
+            stats['failed'] += 1
+            self.failures.append((result['test'], result['message']))
+        if result.get('duration_ms') is not None:
+            self.latency.setdefault(category, LatencyHistogram()).add(result['duration_ms'])
+
+    def category_summary(self):
+        categories = {}
+        for category, stats in self.categories.items():
+            categories[category] = dict(stats)
+            if category in self.latency:
+                categories[category]['latency'] = self.latency[category].summary()
+        return categories
+
+class BaseTester:
+    """Console output, result logging and JSON reporting shared by all testers"""
+
+    report_title = "TEST REPORT"
+    report_prefix = "test_report"
+
+    def __init__(self, api_base_url=API_BASE_URL, results_file=None, keep_results=True, pool_size=10):
+        """results_file streams every result to a JSONL sink as it is logged;
+        keep_results=False then stops holding results in memory, which long
+        soak and load runs need to stay at constant memory. pool_size is the
+        client's keep-alive connection pool per host"""
+        self.api_base_url = api_base_url
+        self.client = HarnessClient(api_base_url, pool_size=pool_size)
+        self.test_results = []
+        self.keep_results = keep_results or results_file is None
+        self.results_sink = JsonlResultSink(results_file) if results_file else None
+        self.aggregator = StreamingAggregator()
+        self._results_lock = threading.Lock()
+        # Extra top-level sections (benchmark data) written into the JSON report
+        self.report_extras = {}
+        # Set by long-running modes to print only failed results
+        self.quiet = False
+        self.report_path = None
+        # Per-thread output/result buffers used while run_scheduled runs a group
+        self._capture = threading.local()
+
+    def emit(self, text):
+        """Print a line, or buffer it when called from a scheduled group"""
+        output = getattr(self._capture, 'output', None)
+        if output is None:
+            print(text)
+        else:
+            output.append(text)
+
+    def print_header(self, text):
+        self.emit(f"\n{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}")
+        self.emit(f"{Colors.BLUE}{Colors.BOLD}{text.center(60)}{Colors.END}")
+        self.emit(f"{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}\n")
+
+    def print_success(self, text):
+        self.emit(f"{Colors.GREEN}✅ {text}{Colors.END}")
+
+    def print_error(self, text):
+        self.emit(f"{Colors.RED}❌ {text}{Colors.END}")
+
+    def print_warning(self, text):
+        self.emit(f"{Colors.YELLOW}⚠️  {text}{Colors.END}")
+
+    def print_info(self, text):
+        self.emit(f"{Colors.CYAN}ℹ️  {text}{Colors.END}")
+
+    def result_context(self):
+        """Extra fields stored with every logged result"""
+        return {}
+
+    def log_result(self, test_name, success, message, response=None):
+        """Record a result; pass the HarnessClient response it was judged on to
+        store its status, duration, time-to-first-byte and payload sizes"""
+        result = {
+            'test': test_name,
+            'success': success,
+            'message': message
+        }
+        timing = getattr(response, 'timing', None)
+        if timing:
+            for field in RESULT_TIMING_FIELDS:
+                result[field] = timing[field]
+        result.update(self.result_context())
+        result['timestamp'] = datetime.now().isoformat()
+        results = getattr(self._capture, 'results', None)
+        if results is None:
+            self._commit_result(result)
+        else:
+            results.append(result)
+
+        if not success:
+            self.print_error(f"{test_name}: {message}")
+        elif not self.quiet:
+            self.print_success(f"{test_name}: {message}")
+
+    def _commit_result(self, result):
+        with self._results_lock:
+            self.aggregator.add(result)
+            if self.keep_results:
+                self.test_results.append(result)
+        if self.results_sink:
+            self.results_sink.write(result)
+
+    def close_results(self):
+        """Flush and close the JSONL sink, if any"""
+        if self.results_sink:
+            self.results_sink.close()
+
+    def _run_captured(self, func):
+        self._capture.output = []
+        self._capture.results = []
+        try:
+            try:
+                value = func()
+            except Exception as e:
+                self.log_result(func.__name__, False, f"Error: {e}")
+                value = False
+            return value, self._capture.output, self._capture.results
+        finally:
+            self._capture.output = None
+            self._capture.results = None
+
+    def run_scheduled(self, groups, max_workers=4):
+        """Run test groups concurrently while respecting their dependencies
+
+        groups is a list of (name, func, depends_on) tuples; a group starts once
+        every group named in depends_on has finished. Each group's console
+        output and results are buffered and flushed in declaration order, so
+        test_results and the report match a sequential run. Returns a dict of
+        each group's return value.
+        """
+        names = [name for name, _, _ in groups]
+        for name, _, depends_on in groups:
+            unknown = [dep for dep in depends_on if dep not in names]
+            if unknown:
+                raise ValueError(f"Test group {name} depends on unknown groups: {unknown}")
+
+        futures = {}
+        finished = set()
+        outcomes = {}
+        flushed = 0
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while flushed < len(groups):
+                for name, func, depends_on in groups:
+                    if name not in futures and all(dep in finished for dep in depends_on):
+                        futures[name] = pool.submit(self._run_captured, func)
+
+                running = [future for name, future in futures.items() if name not in finished]
+                if not running:
+                    raise ValueError("Test group dependencies contain a cycle")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for name, future in futures.items():
+                    if future in done:
+                        finished.add(name)
+
+                # Flush completed groups in declaration order
+                while flushed < len(groups) and names[flushed] in finished:
+                    name = names[flushed]
+                    value, output, results = futures[name].result()
+                    for line in output:
+                        print(line)
+                    for result in results:
+                        self._commit_result(result)
+                    outcomes[name] = value
+                    flushed += 1
+
+        return outcomes
+
+    def summary_label(self):
+        return "SUMMARY"
+
+    def report_file(self):
+        return f"{self.report_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    def generate_report(self):
+        """Print the summary and save the detailed JSON report"""
+        self.print_header(self.report_title)
+
+        total_tests = self.aggregator.total
+        passed_tests = self.aggregator.passed
+        failed_tests = total_tests - passed_tests
+        success_rate = (passed_tests / total_tests) * 100 if total_tests else 0.0
+
+        print(f"\n{Colors.BOLD}{self.summary_label()}:{Colors.END}")
+        print(f"Total Tests: {total_tests}")
+        print(f"{Colors.GREEN}Passed: {passed_tests}{Colors.END}")
+        print(f"{Colors.RED}Failed: {failed_tests}{Colors.END}")
+        print(f"Success Rate: {success_rate:.1f}%")
+
+        categories = self.aggregator.category_summary()
+
+        print(f"\n{Colors.BOLD}RESULTS BY CATEGORY:{Colors.END}")
+        for category, stats in categories.items():
+            category_rate = (stats['passed'] / stats['total']) * 100
+            color = Colors.GREEN if category_rate >= 80 else Colors.YELLOW if category_rate >= 60 else Colors.RED
+            latency = ""
+            if 'latency' in stats:
+                latency = (f" - {stats['latency']['count']} requests, p50 {stats['latency']['p50_ms']:.1f}ms, "
+                           f"p95 {stats['latency']['p95_ms']:.1f}ms")
+            print(f"{color}{category}: {stats['passed']}/{stats['total']} ({category_rate:.1f}%){latency}{Colors.END}")
+
+        request_timings = self.client.timing_summary()
+        if request_timings:
+            print(f"\n{Colors.BOLD}REQUEST TIMINGS:{Colors.END}")
+            for route, stats in request_timings.items():
+                print(f"{route}: {stats['count']} requests, "
+                      f"p50 {stats['p50_ms']:.1f}ms, p95 {stats['p95_ms']:.1f}ms, max {stats['max_ms']:.1f}ms")
+
+        if failed_tests > 0:
+            print(f"\n{Colors.RED}{Colors.BOLD}FAILED TESTS:{Colors.END}")
+            omitted = failed_tests - len(self.aggregator.failures)
+            if omitted:
+                where = f" (see {self.results_sink.path})" if self.results_sink else ""
+                print(f"  ... {omitted} earlier failures not shown{where}")
+            for test, message in self.aggregator.failures:
+                print(f"  • {test}: {message}")
+
+        # Save detailed report
+        report = {
+            'summary': {
+                'total_tests': total_tests,
+                'passed_tests': passed_tests,
+                'failed_tests': failed_tests,
+                'success_rate': success_rate
+            },
+            'categories': categories,
+            'request_timings': request_timings
+        }
+        if self.keep_results:
+            report['results'] = self.test_results
+        if self.results_sink:
+            self.results_sink.flush()
+            report['results_file'] = self.results_sink.path
+        report.update(self.report_extras)
+        report['timestamp'] = datetime.now().isoformat()
+
+        report_file = self.report_file()
+        self.report_path = report_file
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n{Colors.CYAN}Detailed report saved to: {report_file}{Colors.END}")
+
+        return failed_tests == 0
+
+class Benchmark(BaseTester):
+    """BaseTester plus the backend options shared by the bench_*.py scripts
+
+    --stub runs the benchmark against a stub_backend.py child process, whose
+    pid is then sampled for memory; --backend-pid samples an existing server.
+    """
+
+    report_title = "BENCHMARK REPORT"
+    report_prefix = "benchmark_report"
+
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--base-url", default=API_BASE_URL, help="backend to benchmark")
+        parser.add_argument("--stub", action="store_true",
+                            help="start stub_backend.py on the --base-url port and benchmark it")
+        parser.add_argument("--stub-args", default="",
+                            help="extra stub_backend.py arguments, e.g. \"--latency /api/ai=50\"")
+        parser.add_argument("--backend-pid", type=int, help="backend process to sample for memory")
+        parser.add_argument("--workers", type=int, default=16, help="concurrent client threads")
+
+    def __init__(self, args):
+        super().__init__(args.base_url, pool_size=args.workers)
+        self.args = args
+        self.workers = args.workers
+        self.backend_pid = args.backend_pid
+        self.stub_process = None
+
+    def setup_backend(self):
+        """Start the stub if requested and check the backend is healthy"""
+        if self.args.stub:
+            from stub_backend import start_stub_process
+
+            port = urlsplit(self.api_base_url).port or 80
+            try:
+                self.stub_process = start_stub_process(port, self.args.stub_args.split())
+            except RuntimeError as e:
+                self.log_result("Backend Health", False, str(e))
+                return False
+            self.backend_pid = self.stub_process.pid
+        if wait_for_healthy(self.api_base_url, timeout=10) is None:
+            self.log_result("Backend Health", False, f"No backend answering on {self.api_base_url}")
+            return False
+        return True
+
+    def backend_rss_mb(self):
+        """Current backend RSS in MB, or None when no pid is known"""
+        if self.backend_pid is None:
+            return None
+        sample = ProcessSampler(self.backend_pid).sample()
+        return round(sample['rss_mb'], 1) if sample else None
+
+    def map(self, func, items, workers=None):
+        """Call func(item) for every item on the worker pool; results keep item order"""
+        with ThreadPoolExecutor(max_workers=workers or self.workers) as pool:
+            return list(pool.map(func, items))
+
+    def probe(self, probes, rate, stop, headers=None):
+        """Send the (name, path, authenticated) probes in turn, rate rounds per second, until stop is set
+
+        Returns ({name: [latency ms]}, failures); authenticated probes carry headers.
+        """
+        latencies = {name: [] for name, _, _ in probes}
+        failures = 0
+        interval = 1 / rate
+        next_at = time.perf_counter()
+        while not stop.is_set():
+            for name, path, authenticated in probes:
+                response = self.client.get(path, headers=headers if authenticated else None)
+                latencies[name].append(response.duration_ms)
+                failures += response.status_code != 200
+            next_at += interval
+            stop.wait(max(0.0, next_at - time.perf_counter()))
+        return latencies, failures
+
+    @staticmethod
+    def add_interference_arguments(parser):
+        """--max-slowdown and --min-limit-ms, read by check_interference"""
+        parser.add_argument("--max-slowdown", type=float, default=5.0, help="allowed probe p99 growth under load")
+        parser.add_argument("--min-limit-ms", type=float, default=50.0,
+                            help="probe p99 always allowed under load, whatever the baseline")
+
+    def check_interference(self, label, probes, quiet, busy, during):
+        """Log each probe's p99 in the busy phase against the quiet one
+
+        quiet and busy are phases holding {'probes': {name: latency summary}};
+        during names the load in messages, e.g. "during logins".
+        """
+        for probe, _, _ in probes:
+            before = quiet['probes'][probe]['p99_ms']
+            after = busy['probes'][probe]['p99_ms']
+            # Sub-millisecond baselines would make any ratio meaningless
+            limit = max(before * self.args.max_slowdown, self.args.min_limit_ms)
+            self.log_result(
+                f"{label}: {probe} p99 under load",
+                after <= limit,
+                f"p99 {before:.1f}ms quiet → {after:.1f}ms {during} (x{after / before if before else 0:.1f}, "
+                f"limit {limit:.0f}ms)"
+            )
+
+    def check_growth(self, label, first, last, names, size_key, unit):
+        """Log each name's p50 at the last step against the first; above --max-ratio fails"""
+        for name in names:
+            before, after = first[name]['p50_ms'], last[name]['p50_ms']
+            ratio = after / before if before else 1.0
+            self.log_result(
+                f"{label}: {name} growth",
+                ratio <= self.args.max_ratio,
+                f"p50 {before:.1f}ms @ {first[size_key]} → {after:.1f}ms @ {last[size_key]} {unit} "
+                f"(x{ratio:.2f}, limit x{self.args.max_ratio})"
+            )
+
+    def teardown(self):
+        self.client.close()
+        if self.stub_process:
+            self.stub_process.terminate()
+            self.stub_process.wait()
+            self.stub_process = None
+
+    @classmethod
+    def run_main(cls, args):
+        """Run the benchmark for parsed args, report, and exit non-zero if any check failed"""
+        benchmark = cls(args)
+        try:
+            benchmark.run()
+        except KeyboardInterrupt:
+            print(f"\n{Colors.YELLOW}⚠️  Benchmark interrupted{Colors.END}")
+            benchmark.teardown()
+        passed = benchmark.generate_report()
+        sys.exit(0 if passed else 1)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Synthetic mood histories for Moodscape scaling tests
+Generates multi-year mood, energy, stress, sleep, activity and weather series
+for many users at once with NumPy, and seeds them into a backend through
+/api/mood-entries with a bounded number of requests in flight.
+
+Usage:
+    python3 mood_history.py --users 5 --years 2 --dry-run
+    python3 mood_history.py --users 200 --years 3 --workers 16
+"""
+
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from harness import API_BASE_URL, Colors, HarnessClient, LatencyHistogram
+
+ACTIVITIES = ['exercise', 'socializing', 'work', 'reading', 'meditation',
+              'outdoors', 'family', 'gaming', 'cooking', 'travel']
+WEATHER = ['sunny', 'cloudy', 'rainy', 'snowy', 'windy']
+
+# Mood offset by weekday, Monday first
+WEEKDAY_MOOD = np.array([-0.45, -0.25, -0.1, 0.0, 0.3, 0.6, 0.4])
+# Weather probabilities in deep winter and high summer; days in between blend the two
+WINTER_WEATHER = np.array([0.2, 0.35, 0.2, 0.15, 0.1])
+SUMMER_WEATHER = np.array([0.5, 0.25, 0.15, 0.0, 0.1])
+WEATHER_MOOD = np.array([0.35, -0.05, -0.3, -0.1, -0.1])
+# Logit of doing each activity on a weekday, the change at weekends, and how
+# strongly good mood and sunshine raise the odds
+ACTIVITY_BASE = np.array([-0.9, -1.0, 1.8, -0.6, -1.6, -1.2, -0.8, -1.0, -0.5, -3.5])
+ACTIVITY_WEEKEND = np.array([0.4, 1.0, -3.5, 0.3, 0.3, 1.0, 1.2, 0.6, 0.6, 1.0])
+ACTIVITY_MOOD = np.array([0.25, 0.3, 0.0, 0.05, -0.1, 0.2, 0.1, -0.05, 0.1, 0.1])
+ACTIVITY_SUN = np.array([0.5, 0.2, 0.0, -0.3, 0.0, 1.2, 0.0, -0.4, 0.0, 0.2])
+# Mood change on a day the activity is done
+ACTIVITY_EFFECT = np.array([0.5, 0.4, -0.3, 0.15, 0.3, 0.35, 0.2, 0.0, 0.1, 0.4])
+
+def generate_histories(users=1, days=365, entries_per_day=1.0, entries_per_user=None,
+                       end=None, seed=None):
+    """Generate mood histories for users over the days before end
+
+    Each user gets a baseline mood, sleep need and stress level; daily
+    values add weekly and yearly seasonality, a slowly drifting AR(1) mood
+    component and the effect of sleep, weather and activities, which are
+    themselves drawn with odds that depend on weekday, season and mood.
+    Entries are spread over the days as a Poisson process with
+    entries_per_day, or exactly entries_per_user per user when given.
+    Returns a dict of equal-length column arrays sorted by user and time.
+    """
+    rng = np.random.default_rng(seed)
+    end = end or datetime.now()
+    start = end - timedelta(days=days)
+
+    # Per-user traits
+    mood_base = np.clip(rng.normal(6.2, 1.1, users), 3, 9)
+    sleep_need = np.clip(rng.normal(7.3, 0.7, users), 5.5, 9)
+    stress_base = np.clip(rng.normal(4.5, 1.3, users), 1.5, 8)
+    weekly_amplitude = rng.uniform(0.3, 1.0, users)
+    seasonal_amplitude = rng.uniform(0.0, 0.8, users)
+
+    # Day-level series, shape (users, days)
+    day_index = np.arange(days)
+    start_weekday = start.weekday()
+    weekday = (start_weekday + day_index) % 7
+    weekend = weekday >= 5
+    day_of_year = (start.timetuple().tm_yday + day_index) % 365
+    # 1.0 at midsummer, -1.0 at midwinter
+    season = np.cos(2 * np.pi * (day_of_year - 182) / 365)
+
+    drift = np.empty((users, days))
+    drift[:, 0] = rng.normal(0, 0.6, users)
+    shocks = rng.normal(0, 0.35, (users, days))
+    for day in range(1, days):
+        drift[:, day] = 0.85 * drift[:, day - 1] + shocks[:, day]
+
+    summer_share = (season + 1) / 2
+    weather_probs = np.outer(1 - summer_share, WINTER_WEATHER) + np.outer(summer_share, SUMMER_WEATHER)
+    weather_cdf = np.cumsum(weather_probs, axis=1)
+    # Everyone shares one local weather series
+    weather = (rng.random(days)[:, None] > weather_cdf).sum(axis=1).clip(0, len(WEATHER) - 1)
+    sunny = weather == 0
+
+    sleep = (sleep_need[:, None] + 0.6 * weekend - 0.3 * drift.clip(max=0)
+             + rng.normal(0, 0.8, (users, days)))
+    sleep = np.clip(sleep, 3, 12)
+
+    logits = (ACTIVITY_BASE + np.outer(weekend, ACTIVITY_WEEKEND)[None]
+              + drift[..., None] * ACTIVITY_MOOD + np.outer(sunny, ACTIVITY_SUN)[None])
+    activities = rng.random((users, days, len(ACTIVITIES))) < 1 / (1 + np.exp(-logits))
+
+    day_mood = (mood_base[:, None]
+                + weekly_amplitude[:, None] * WEEKDAY_MOOD[weekday]
+                + seasonal_amplitude[:, None] * season
+                + drift
+                + 0.35 * (sleep - sleep_need[:, None])
+                + WEATHER_MOOD[weather]
+                + activities @ ACTIVITY_EFFECT)
+
+    # Entries: which user and day each one belongs to
+    if entries_per_user is not None:
+        counts = np.full(users, entries_per_user)
+        entry_user = np.repeat(np.arange(users), counts)
+        entry_day = np.sort(rng.integers(0, days, (users, entries_per_user)), axis=1).ravel()
+    else:
+        per_day = rng.poisson(entries_per_day, (users, days))
+        entry_user = np.repeat(np.arange(users), per_day.sum(axis=1))
+        entry_day = np.repeat(np.tile(day_index, users), per_day.ravel())
+    count = len(entry_user)
+    # Check-ins land between 7am and 11pm, in order within each day
+    seconds = rng.uniform(7 * 3600, 23 * 3600, count)
+    order = np.lexsort((seconds, entry_day, entry_user))
+    entry_user, entry_day, seconds = entry_user[order], entry_day[order], seconds[order]
+
+    mood_value = day_mood[entry_user, entry_day] + rng.normal(0, 0.6, count)
+    mood = np.clip(np.rint(mood_value), 1, 10).astype(int)
+    energy = np.clip(np.rint(0.55 * mood_value + 0.5 * (sleep[entry_user, entry_day] - 7)
+                             + 2.3 + rng.normal(0, 0.9, count)), 1, 10).astype(int)
+    stress = np.clip(np.rint(stress_base[entry_user] - 0.45 * (mood_value - mood_base[entry_user])
+                             + 1.2 * activities[entry_user, entry_day, ACTIVITIES.index('work')]
+                             + rng.normal(0, 0.9, count)), 1, 10).astype(int)
+
+    timestamps = (np.datetime64(start.replace(hour=0, minute=0, second=0, microsecond=0), 's')
+                  + entry_day.astype('timedelta64[D]') + seconds.astype('timedelta64[s]'))
+    return {
+        'user': entry_user,
+        'created_at': timestamps,
+        'mood': mood,
+        'energy': energy,
+        'stress': stress,
+        'sleep_hours': np.round(sleep[entry_user, entry_day], 1),
+        'weather': weather[entry_day],
+        'activities': activities[entry_user, entry_day]
+    }
+
+def iter_entries(history, user=None):
+    """Yield the history as /api/mood-entries request bodies, optionally for one user"""
+    start, stop = 0, len(history['user'])
+    if user is not None:
+        # Rows are sorted by user, so one user's entries are a contiguous slice
+        start, stop = np.searchsorted(history['user'], [user, user + 1])
+    names = np.array(ACTIVITIES)
+    for row in range(start, stop):
+        yield {
+            'mood': int(history['mood'][row]),
+            'energy': int(history['energy'][row]),
+            'stress': int(history['stress'][row]),
+            'sleep_hours': float(history['sleep_hours'][row]),
+            'activities': names[history['activities'][row]].tolist(),
+            'weather': WEATHER[history['weather'][row]],
+            'notes': '',
+            'created_at': str(history['created_at'][row])
+        }
+
+def describe(history):
+    """Headline statistics used to sanity-check generated data"""
+    mood = history['mood'].astype(float)
+    weekday = history['created_at'].astype('datetime64[D]').astype(int)
+    weekend = (weekday + 3) % 7 >= 5  # 1970-01-01 was a Thursday
+    return {
+        'entries': len(mood),
+        'users': int(len(np.unique(history['user']))),
+        'mood_mean': round(float(mood.mean()), 2),
+        'weekend_mood_lift': round(float(mood[weekend].mean() - mood[~weekend].mean()), 2),
+        'mood_energy_corr': round(float(np.corrcoef(mood, history['energy'])[0, 1]), 2),
+        'mood_stress_corr': round(float(np.corrcoef(mood, history['stress'])[0, 1]), 2),
+        'mood_sleep_corr': round(float(np.corrcoef(mood, history['sleep_hours'])[0, 1]), 2),
+        'activity_rates': {
+            name: round(float(rate), 3)
+            for name, rate in zip(ACTIVITIES, history['activities'].mean(axis=0))
+        }
+    }
+
+class BulkSeeder:
+    """Registers users and posts their entries with at most max_in_flight requests outstanding"""
+
+    def __init__(self, client, workers=8, max_in_flight=None):
+        self.client = client
+        self.workers = workers
+        self.max_in_flight = max_in_flight or workers * 4
+        self.latency = LatencyHistogram()
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def _run_bounded(self, func, items, record):
+        """Call record(index, func(item)) for every item on the worker pool
+
+        At most max_in_flight items are queued or running at once, and no
+        future is kept once submitted, so memory does not grow with the
+        number of items. The first exception raised by func is re-raised
+        after every item has run.
+        """
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        errors = []
+
+        def run(index, item):
+            try:
+                record(index, func(item))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for index, item in enumerate(items):
+                slots.acquire()
+                pool.submit(run, index, item)
+        if errors:
+            raise errors[0]
+
+    def bounded_map(self, func, items):
+        """Run func over items on the worker pool; results keep item order"""
+        results = {}
+        self._run_bounded(func, items, results.__setitem__)
+        return [results[index] for index in range(len(results))]
+
+    def bounded_count(self, func, items):
+        """Run func over items on the worker pool; returns how many results were truthy"""
+        count = [0]
+
+        def record(_, result):
+            if result:
+                with self._lock:
+                    count[0] += 1
+
+        self._run_bounded(func, items, record)
+        return count[0]
+
+    def create_user(self, index, prefix='seed', password='seedpass123'):
+        """Register and log in one user; returns its bearer token or None"""
+        email = f"{prefix}_{index}_{int(time.time())}@example.com"
+        response = self.client.post("/api/auth/register",
+                                    data={'email': email, 'password': password, 'name': f"Seed User {index}"})
+        if response.status_code != 200:
+            return None
+        response = self.client.post("/api/auth/login", data={'email': email, 'password': password})
+        if response.status_code != 200:
+            return None
+        return response.json()['access_token']
+
+    def create_users(self, count, prefix='seed'):
+        return self.bounded_map(lambda index: self.create_user(index, prefix), range(count))
+
+    def post_entry(self, job):
+        token, entry = job
+        response = self.client.post("/api/mood-entries", json=entry,
+                                    headers={'Authorization': f'Bearer {token}'})
+        with self._lock:
+            self.latency.add(response.duration_ms)
+            if response.status_code != 200:
+                self.failures += 1
+        return response.status_code == 200
+
+    def seed(self, history, tokens):
+        """Post every entry of history; entry user i is seeded as tokens[i]"""
+        start = time.perf_counter()
+        jobs = ((tokens[user], entry)
+                for user in range(len(tokens)) if tokens[user]
+                for entry in iter_entries(history, user))
+        created = self.bounded_count(self.post_entry, jobs)
+        elapsed = time.perf_counter() - start
+        return {
+            'entries': created,
+            'failures': self.failures,
+            'seconds': round(elapsed, 2),
+            'entries_per_second': round(created / elapsed, 1) if elapsed else 0.0,
+            'latency': self.latency.summary()
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and seed synthetic Moodscape mood histories")
+    parser.add_argument("--base-url", default=API_BASE_URL)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--years", type=float, default=2.0, help="length of each history")
+    parser.add_argument("--entries-per-day", type=float, default=1.0, help="mean check-ins per user per day")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent seeding requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dry-run", action="store_true", help="only generate and describe the data")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    history = generate_histories(args.users, int(args.years * 365), args.entries_per_day, seed=args.seed)
+    print(f"{Colors.CYAN}Generated {len(history['user'])} entries for {args.users} users "
+          f"in {time.perf_counter() - start:.2f}s{Colors.END}")
+    for key, value in describe(history).items():
+        print(f"  {key}: {value}")
+    if args.dry_run:
+        return
+
+    client = HarnessClient(args.base_url, pool_size=args.workers)
+    seeder = BulkSeeder(client, workers=args.workers)
+    tokens = seeder.create_users(args.users)
+    if not any(tokens):
+        print(f"{Colors.RED}❌ Could not register any users on {args.base_url}{Colors.END}")
+        sys.exit(1)
+    stats = seeder.seed(history, tokens)
+    client.close()
+    color = Colors.GREEN if not stats['failures'] else Colors.YELLOW
+    print(f"{color}Seeded {stats['entries']} entries in {stats['seconds']}s "
+          f"({stats['entries_per_second']}/s, {stats['failures']} failed, "
+          f"p50 {stats['latency']['p50_ms']:.1f}ms){Colors.END}")
+    sys.exit(1 if stats['failures'] else 0)
+
+if __name__ == "__main__":
+    main()
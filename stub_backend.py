@@ -0,0 +1,2016 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Moodscape backend
+Implements the routes exercised by the test scripts using only the Python
+standard library, with injectable per-route latency and error profiles, so the
+harness and its load generators can run and be benchmarked without the real
+FastAPI server.
+
+Usage:
+    python3 stub_backend.py --port 8000
+    python3 stub_backend.py --latency /api/ai=120:30 --errors /api/ai/predict-mood=0.05:503
+    python3 stub_backend.py --self-check
+"""
+
+import argparse
+import base64
+import csv
+import hashlib
+import hmac
+import io
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import secrets
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+VERSION = "1.0.0"
+JWT_SECRET = b"moodscape-stub-secret"
+TOKEN_LIFETIME = 3600
+PASSWORD_ITERATIONS = 100000
+
+ADMIN_EMAIL = "makopolo@moodscape.dev"
+ADMIN_PASSWORD = "123456"
+DEMO_TOKEN = "demo_token"
+MAX_BATCH_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+EXPORT_ROW_GROUP_SIZE = 10000
+# Part of every analysis cache key, so a model upgrade never serves stale results
+ANALYSIS_MODEL_VERSION = "lexicon-1"
+
+POSITIVE_WORDS = {
+    'happy', 'great', 'good', 'energetic', 'calm', 'relaxed', 'excited', 'grateful',
+    'love', 'joy', 'wonderful', 'amazing', 'peaceful', 'content', 'proud', 'hopeful'
+}
+NEGATIVE_WORDS = {
+    'sad', 'stressed', 'overwhelmed', 'lonely', 'tired', 'angry', 'anxious', 'worried',
+    'bad', 'terrible', 'depressed', 'upset', 'frustrated', 'exhausted', 'afraid', 'hopeless'
+}
+EMOTION_WORDS = {
+    'joy': {'happy', 'joy', 'excited', 'great', 'wonderful', 'amazing', 'love'},
+    'sadness': {'sad', 'lonely', 'depressed', 'hopeless', 'upset'},
+    'anger': {'angry', 'frustrated', 'mad', 'annoyed'},
+    'fear': {'anxious', 'worried', 'afraid', 'scared', 'nervous'},
+    'stress': {'stressed', 'overwhelmed', 'exhausted', 'tired', 'pressure'},
+    'calm': {'calm', 'relaxed', 'peaceful', 'content'}
+}
+
+class StubError(Exception):
+    """Raised by route handlers to answer with a FastAPI-style error body"""
+
+    def __init__(self, status, detail):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+def parse_latency(spec):
+    """Parse 'PREFIX=MS[:JITTER_MS]' into (prefix, (mean_ms, jitter_ms))"""
+    prefix, _, value = spec.partition('=')
+    mean, _, jitter = value.partition(':')
+    return prefix, (float(mean), float(jitter or 0))
+
+def parse_error(spec):
+    """Parse 'PREFIX=RATE[:STATUS]' into (prefix, (rate, status))"""
+    prefix, _, value = spec.partition('=')
+    rate, _, status = value.partition(':')
+    return prefix, (float(rate), int(status or 500))
+
+class FaultProfile:
+    """Injected latency and error rates per route, matched by longest path prefix"""
+
+    def __init__(self, latency=None, errors=None, seed=None):
+        self.latency = dict(latency or {})
+        self.errors = dict(errors or {})
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _match(self, table, path):
+        best = None
+        for prefix in table:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return table[best] if best is not None else None
+
+    def delay_for(self, path):
+        """Seconds to sleep before answering a request for path"""
+        rule = self._match(self.latency, path)
+        if rule is None:
+            return 0.0
+        mean_ms, jitter_ms = rule
+        with self._lock:
+            offset = self._random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0
+        return max(0.0, mean_ms + offset) / 1000
+
+    def error_for(self, path):
+        """Status code to fail the request with, or None"""
+        rule = self._match(self.errors, path)
+        if rule is None:
+            return None
+        rate, status = rule
+        with self._lock:
+            return status if self._random.random() < rate else None
+
+def hash_password(password, salt=None, iterations=PASSWORD_ITERATIONS):
+    salt = salt or secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, iterations)
+    return salt, digest
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def create_token(user_id, lifetime=TOKEN_LIFETIME):
+    """Issue an HS256 JWT for user_id"""
+    header = _b64(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode())
+    payload = _b64(json.dumps({'sub': user_id, 'exp': int(time.time()) + lifetime}).encode())
+    signature = hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+class PasswordHasher:
+    """Bounded worker pool for password hashing
+
+    Hashing is deliberately CPU-heavy (PBKDF2 here, bcrypt in the real
+    backend). Running it on at most workers threads keeps a burst of logins
+    and signups from taking every core away from other requests, and hashes
+    beyond max_pending waiting or running are refused with 503.
+    """
+
+    def __init__(self, workers=2, iterations=PASSWORD_ITERATIONS, max_pending=256):
+        self.workers = workers
+        self.iterations = iterations
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def hash(self, password, salt=None, iterations=None):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise StubError(503, "Too many password checks in progress, retry shortly")
+            self.pending += 1
+        try:
+            return self._pool.submit(hash_password, password, salt, iterations or self.iterations).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    def verify(self, password, user):
+        digest = self.hash(password, user['salt'], user['iterations'])[1]
+        return hmac.compare_digest(digest, user['password_hash'])
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'iterations': self.iterations,
+                'pending': self.pending,
+                'max_pending': self.max_pending,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
+
+def verify_token(token):
+    """Return the claims of a valid, unexpired token or None"""
+    try:
+        header, payload, signature = token.split('.')
+        expected = hmac.new(JWT_SECRET, f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _unb64(signature)):
+            return None
+        claims = json.loads(_unb64(payload))
+    except (ValueError, json.JSONDecodeError):
+        return None
+    if claims.get('exp', 0) < time.time():
+        return None
+    return claims
+
+class TokenCache:
+    """Bounded LRU cache of verified token claims
+
+    Keys are the SHA-256 of the token, so raw tokens are not kept, and a
+    cached entry is only served until the token's own exp. Tokens that fail
+    verification are never cached. Counters are reported on /health.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def verify(self, token):
+        """Claims of a valid, unexpired token or None, as verify_token"""
+        key = hashlib.sha256(token.encode()).hexdigest()
+        with self._lock:
+            claims = self._items.get(key)
+            if claims is not None:
+                if claims.get('exp', 0) >= time.time():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._items[key]
+                self.expirations += 1
+                return None
+            self.misses += 1
+        claims = verify_token(token)
+        if claims is not None:
+            with self._lock:
+                self._items[key] = claims
+                while len(self._items) > self.max_entries:
+                    self._items.popitem(last=False)
+                    self.evictions += 1
+        return claims
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+def analyze_words(words):
+    """Lexicon-based stand-in for the VADER/TextBlob sentiment models"""
+    positive = sum(1 for word in words if word in POSITIVE_WORDS)
+    negative = sum(1 for word in words if word in NEGATIVE_WORDS)
+    hits = positive + negative
+    polarity = (positive - negative) / hits if hits else 0.0
+    if polarity > 0.05:
+        label = 'positive'
+    elif polarity < -0.05:
+        label = 'negative'
+    else:
+        label = 'neutral'
+    emotions = {
+        emotion: sum(1 for word in words if word in vocabulary)
+        for emotion, vocabulary in EMOTION_WORDS.items()
+    }
+    total = sum(emotions.values())
+    emotions = {emotion: round(count / total, 3) if total else 0.0 for emotion, count in emotions.items()}
+    return {
+        'sentiment': label,
+        'polarity': round(polarity, 3),
+        'compound': round(polarity, 3),
+        'confidence': round(min(1.0, 0.5 + hits / max(len(words), 1)), 3),
+        'emotions': emotions
+    }
+
+def _rss_mb():
+    """Resident set size of this process in MB, or None off Linux"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+class LazyModel:
+    """One AI model that is loaded on first use or by warm-up
+
+    The stand-in models have nothing heavy to load, so load_delay
+    simulates the load time of the real model it stands in for.
+    """
+
+    def __init__(self, name, load_delay=0.0):
+        self.name = name
+        self.load_delay = load_delay
+        self.state = 'cold'
+        self.load_seconds = None
+        self.memory_mb = None
+        self.loaded_at = None
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self):
+        if self.state == 'warm':
+            return
+        with self._lock:
+            if self.state == 'warm':
+                return
+            self.state = 'loading'
+            rss_before = _rss_mb()
+            start = time.perf_counter()
+            time.sleep(self.load_delay)
+            self.load_seconds = round(time.perf_counter() - start, 3)
+            rss_after = _rss_mb()
+            if rss_before is not None and rss_after is not None:
+                self.memory_mb = round(max(0.0, rss_after - rss_before), 1)
+            self.loaded_at = datetime.now().isoformat()
+            self.state = 'warm'
+
+    def status(self):
+        return {
+            'state': self.state,
+            'load_seconds': self.load_seconds,
+            'memory_mb': self.memory_mb,
+            'loaded_at': self.loaded_at
+        }
+
+class ModelRegistry:
+    """The AI models behind the analysis routes, loaded lazily or all at once by warm_up"""
+
+    NAMES = ('sentiment', 'emotion', 'mood_predictor', 'pattern_clusterer')
+
+    def __init__(self, load_delay=0.0):
+        self.models = {name: LazyModel(name, load_delay) for name in self.NAMES}
+
+    def require(self, *names):
+        for name in names:
+            self.models[name].ensure_loaded()
+
+    def warm_up(self):
+        """Load every model; returns the seconds taken"""
+        start = time.perf_counter()
+        self.require(*self.NAMES)
+        return time.perf_counter() - start
+
+    def warm_up_in_background(self):
+        """Load every model on a daemon thread so the server can answer meanwhile"""
+        thread = threading.Thread(target=self.warm_up, name='model-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def ready(self):
+        return all(model.state == 'warm' for model in self.models.values())
+
+    def status(self):
+        return {name: model.status() for name, model in self.models.items()}
+
+class AnalysisCache:
+    """Bounded LRU cache of text analyses with a time-to-live
+
+    Keys hash the normalized text (case and whitespace folded) together
+    with the model version. Counters are reported on /health.
+    """
+
+    def __init__(self, max_entries=10000, ttl=3600, model_version=ANALYSIS_MODEL_VERSION):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.model_version = model_version
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def key(self, text):
+        normalized = ' '.join(text.lower().split())
+        return hashlib.sha256(f"{self.model_version}\0{normalized}".encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                value, expires = item
+                if expires > time.monotonic():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._items[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'model_version': self.model_version,
+                'entries': len(self._items),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+def analyze_texts(texts, cache=None):
+    """Analyze a batch of texts in one pass, keeping their order; cached analyses are reused"""
+    results = []
+    for text in texts:
+        key = cache.key(text) if cache else None
+        analysis = cache.get(key) if cache else None
+        if analysis is None:
+            analysis = analyze_words(re.findall(r"[a-z']+", text.lower()))
+            if cache:
+                cache.put(key, analysis)
+        results.append(analysis)
+    return results
+
+def analyze_text(text, cache=None):
+    return analyze_texts([text], cache)[0]
+
+def predict_mood(analysis):
+    """Mood prediction built from a text analysis"""
+    return {
+        'predicted_mood': round(5.5 + 4.5 * analysis['polarity'], 1),
+        'confidence': analysis['confidence'],
+        'sentiment': analysis['sentiment'],
+        'emotions': analysis['emotions']
+    }
+
+def top_activities(counts, limit=5):
+    """Most frequent activities, ties broken by name"""
+    return sorted(counts, key=lambda activity: (-counts[activity], activity))[:limit]
+
+def summarize_entries(entries):
+    """Averages and activity counts over a list of mood entries"""
+    if not entries:
+        return {'total_entries': 0, 'average_mood': None, 'average_energy': None,
+                'average_stress': None, 'average_sleep': None, 'top_activities': []}
+    activities = {}
+    for entry in entries:
+        for activity in entry.get('activities') or []:
+            activities[activity] = activities.get(activity, 0) + 1
+
+    def average(field):
+        values = [entry[field] for entry in entries if entry.get(field) is not None]
+        return round(sum(values) / len(values), 2) if values else None
+
+    return {
+        'total_entries': len(entries),
+        'average_mood': average('mood'),
+        'average_energy': average('energy'),
+        'average_stress': average('stress'),
+        'average_sleep': average('sleep_hours'),
+        'top_activities': top_activities(activities)
+    }
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+def mood_patterns(entries):
+    """Average mood by weekday and the mood lift of each activity"""
+    by_weekday = {}
+    by_activity = {}
+    total = 0
+    for entry in entries:
+        total += entry['mood']
+        weekday = WEEKDAYS[datetime.fromisoformat(entry['created_at']).weekday()]
+        by_weekday.setdefault(weekday, []).append(entry['mood'])
+        for activity in entry.get('activities') or []:
+            by_activity.setdefault(activity, []).append(entry['mood'])
+    overall = total / len(entries) if entries else 0.0
+    return {
+        'weekday_mood': {day: round(sum(moods) / len(moods), 2)
+                         for day, moods in sorted(by_weekday.items(), key=lambda item: WEEKDAYS.index(item[0]))},
+        'activity_impact': {activity: round(sum(moods) / len(moods) - overall, 2)
+                            for activity, moods in by_activity.items()}
+    }
+
+STAT_FIELDS = ('mood', 'energy', 'stress', 'sleep_hours')
+
+class FieldAggregate:
+    """Running count, sum, sum of squares, min and max of one numeric field
+
+    Values are counted as well so min and max survive deletions; only
+    removing the last copy of the current extreme rescans the distinct
+    values, of which there are at most a few hundred per field.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.squares = 0.0
+        self.min = None
+        self.max = None
+        self.values = {}
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.squares += value * value
+        self.values[value] = self.values.get(value, 0) + 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def remove(self, value):
+        self.count -= 1
+        self.total -= value
+        self.squares -= value * value
+        self.values[value] -= 1
+        if not self.values[value]:
+            del self.values[value]
+            if value == self.min:
+                self.min = min(self.values, default=None)
+            if value == self.max:
+                self.max = max(self.values, default=None)
+
+    def mean(self):
+        return round(self.total / self.count, 2) if self.count else None
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0, 'mean': None, 'std': None, 'min': None, 'max': None}
+        mean = self.total / self.count
+        return {
+            'count': self.count,
+            'mean': round(mean, 2),
+            'std': round(math.sqrt(max(0.0, self.squares / self.count - mean * mean)), 2),
+            'min': self.min,
+            'max': self.max
+        }
+
+TREND_FIELDS = ('mood', 'energy', 'stress')
+
+class MoodAggregates:
+    """Per-user statistics kept up to date on every entry write
+
+    /api/stats is answered from the running totals in O(1), and /api/trends
+    from the daily rollups in O(window days), however long the history.
+    """
+
+    def __init__(self, entries=()):
+        self.count = 0
+        self.fields = {field: FieldAggregate() for field in STAT_FIELDS}
+        self.activities = {}
+        # Day ('YYYY-MM-DD') -> entry count and per-field sums and counts
+        self.daily = {}
+        for entry in entries:
+            self.add(entry)
+
+    def _roll_up(self, entry, sign):
+        day = entry['created_at'][:10]
+        rollup = self.daily.get(day)
+        if rollup is None:
+            rollup = self.daily[day] = dict.fromkeys(
+                ['entries'] + [f"{field}_{part}" for field in TREND_FIELDS for part in ('sum', 'count')], 0)
+        rollup['entries'] += sign
+        for field in TREND_FIELDS:
+            if entry.get(field) is not None:
+                rollup[f"{field}_sum"] += sign * entry[field]
+                rollup[f"{field}_count"] += sign
+        if not rollup['entries']:
+            del self.daily[day]
+
+    def add(self, entry):
+        self.count += 1
+        for field, aggregate in self.fields.items():
+            if entry.get(field) is not None:
+                aggregate.add(entry[field])
+        for activity in entry.get('activities') or []:
+            self.activities[activity] = self.activities.get(activity, 0) + 1
+        self._roll_up(entry, 1)
+
+    def remove(self, entry):
+        self.count -= 1
+        for field, aggregate in self.fields.items():
+            if entry.get(field) is not None:
+                aggregate.remove(entry[field])
+        for activity in entry.get('activities') or []:
+            self.activities[activity] -= 1
+            if not self.activities[activity]:
+                del self.activities[activity]
+        self._roll_up(entry, -1)
+
+    def stats(self, today=None):
+        """Summary, per-field statistics, mood distribution and logging streak"""
+        today = today or datetime.now().date()
+        streak = 0
+        day = today
+        while day.isoformat() in self.daily:
+            streak += 1
+            day -= timedelta(days=1)
+        moods = self.fields['mood'].values
+        return {
+            'total_entries': self.count,
+            'average_mood': self.fields['mood'].mean(),
+            'average_energy': self.fields['energy'].mean(),
+            'average_stress': self.fields['stress'].mean(),
+            'average_sleep': self.fields['sleep_hours'].mean(),
+            'top_activities': top_activities(self.activities),
+            'fields': {field: aggregate.summary() for field, aggregate in self.fields.items()},
+            'activity_counts': dict(sorted(self.activities.items())),
+            'mood_distribution': {str(mood): moods.get(mood, 0) for mood in range(1, 11)},
+            'days_logged': len(self.daily),
+            'current_streak': streak
+        }
+
+    def day_summary(self, day):
+        """Entry count and averages of one day ('YYYY-MM-DD'), or None if nothing was logged"""
+        rollup = self.daily.get(day)
+        if rollup is None:
+            return None
+        point = {'date': day, 'entries': rollup['entries']}
+        for field in TREND_FIELDS:
+            count = rollup[f"{field}_count"]
+            point[f"average_{field}"] = round(rollup[f"{field}_sum"] / count, 2) if count else None
+        return point
+
+    def trends(self, days, today=None):
+        """Per-day entry count and averages for the last days days, from the rollups"""
+        today = today or datetime.now().date()
+        trends = []
+        for offset in range(days - 1, -1, -1):
+            point = self.day_summary((today - timedelta(days=offset)).isoformat())
+            if point is not None:
+                trends.append(point)
+        return trends
+
+class EntryIndex:
+    """One user's entries ordered by (created_at, id), for keyset pagination
+
+    A page starts just after the cursor key, found by bisection, so reading
+    any page costs O(log n + page size) however deep into the history it is.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.by_id = {}
+
+    @staticmethod
+    def key(entry):
+        return entry['created_at'], entry['id']
+
+    def add(self, entry):
+        insort(self.keys, self.key(entry))
+        self.by_id[entry['id']] = entry
+
+    def remove(self, entry):
+        del self.keys[bisect_left(self.keys, self.key(entry))]
+        del self.by_id[entry['id']]
+
+    def page(self, after=None, limit=100, descending=True):
+        """Copies of up to limit entries following the after key in the given order"""
+        if descending:
+            end = bisect_left(self.keys, after) if after else len(self.keys)
+            keys = self.keys[max(end - limit, 0):end][::-1]
+        else:
+            start = bisect_right(self.keys, after) if after else 0
+            keys = self.keys[start:start + limit]
+        return [dict(self.by_id[entry_id]) for _, entry_id in keys]
+
+def encode_cursor(key):
+    """Opaque page token for a (sort value, id) keyset key"""
+    return _b64(json.dumps(key).encode())
+
+def decode_cursor(cursor, value_type=str):
+    try:
+        value, row_id = json.loads(_unb64(cursor))
+        return value_type(value), int(row_id)
+    except (ValueError, TypeError):
+        raise StubError(422, "Invalid cursor")
+
+USER_SORT_FIELDS = {'id': int, 'created_at': str, 'email': str, 'name': str}
+
+class UserIndex:
+    """Users ordered by each of USER_SORT_FIELDS (ties broken by id), for keyset pagination"""
+
+    def __init__(self):
+        self.keys = {field: [] for field in USER_SORT_FIELDS}
+
+    def add(self, user):
+        for field, keys in self.keys.items():
+            insort(keys, (user[field], user['id']))
+
+    def page(self, users, field, after=None, limit=50, descending=False, match=None):
+        """Up to limit users following the after key in field order that pass match
+
+        Without a filter a page costs O(log n + limit); a filter scans from the
+        cursor until the page is full, so selective filters read further.
+        """
+        keys = self.keys[field]
+        if descending:
+            end = bisect_left(keys, after) if after else len(keys)
+            positions = range(end - 1, -1, -1)
+        else:
+            start = bisect_right(keys, after) if after else 0
+            positions = range(start, len(keys))
+        page = []
+        for position in positions:
+            user = users[keys[position][1]]
+            if match is None or match(user):
+                page.append(user)
+                if len(page) == limit:
+                    break
+        return page
+
+class AdminCounters:
+    """Store-wide totals behind /api/admin/stats, kept up to date on every write"""
+
+    def __init__(self, users=(), entries=()):
+        self.admin_users = 0
+        self.entries = 0
+        # Day ('YYYY-MM-DD') -> entries created that day
+        self.entries_by_day = {}
+        for user in users:
+            self.add_user(user)
+        for entry in entries:
+            self.add(entry)
+
+    def add_user(self, user):
+        self.admin_users += bool(user['is_admin'])
+
+    def add(self, entry):
+        day = entry['created_at'][:10]
+        self.entries += 1
+        self.entries_by_day[day] = self.entries_by_day.get(day, 0) + 1
+
+    def remove(self, entry):
+        day = entry['created_at'][:10]
+        self.entries -= 1
+        self.entries_by_day[day] -= 1
+        if not self.entries_by_day[day]:
+            del self.entries_by_day[day]
+
+EXPORT_COLUMNS = {
+    'entries': ['id', 'created_at', 'mood', 'energy', 'stress', 'sleep_hours', 'weather', 'location',
+                'notes', 'activities'],
+    'activities': ['entry_id', 'created_at', 'activity'],
+    'insights': ['date', 'entries', 'average_mood', 'average_energy', 'average_stress'],
+}
+# (content type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+@lru_cache(maxsize=None)
+def load_pyarrow():
+    """(pyarrow, pyarrow.parquet), or None when pyarrow is not installed
+
+    Imported on the first columnar export rather than at startup, so cold
+    starts do not pay for pyarrow when nobody exports; columnar export
+    answers 501 without it.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
+
+def export_schema(dataset):
+    """Arrow schema of one export dataset (needs pyarrow)"""
+    pa, _ = load_pyarrow()
+    text, number, count = pa.string(), pa.float64(), pa.int64()
+    return pa.schema({
+        'entries': [('id', count), ('created_at', pa.timestamp('us')), ('mood', count), ('energy', count),
+                    ('stress', count), ('sleep_hours', number), ('weather', text), ('location', text),
+                    ('notes', text), ('activities', pa.list_(text))],
+        'activities': [('entry_id', count), ('created_at', pa.timestamp('us')), ('activity', text)],
+        'insights': [('date', pa.date32()), ('entries', count), ('average_mood', number),
+                     ('average_energy', number), ('average_stress', number)],
+    }[dataset])
+
+def export_batches(store, user_id, dataset, batch_size):
+    """One export dataset as dicts of column lists, read batch_size source rows at a time
+
+    Entries and activities come from the keyset cursor over the user's
+    entries, insights from the per-day rollups, so no batch holds more than
+    batch_size entries or days whatever the history length.
+    """
+    if dataset == 'insights':
+        aggregates = store.aggregates[user_id]
+        with store.lock:
+            days = sorted(aggregates.daily)
+        for start in range(0, len(days), batch_size):
+            with store.lock:
+                points = [aggregates.day_summary(day) for day in days[start:start + batch_size]]
+            points = [point for point in points if point is not None]
+            yield {name: [point[name] for point in points] for name in EXPORT_COLUMNS['insights']}
+        return
+    for entries in store.iter_entry_batches(user_id, batch_size=batch_size):
+        if dataset == 'entries':
+            yield {name: [entry[name] for entry in entries] for name in EXPORT_COLUMNS['entries']}
+        else:
+            # One row per (entry, activity) pair
+            yield {
+                'entry_id': [entry['id'] for entry in entries for _ in entry['activities']],
+                'created_at': [entry['created_at'] for entry in entries for _ in entry['activities']],
+                'activity': [activity for entry in entries for activity in entry['activities']],
+            }
+
+def csv_chunks(dataset, batches):
+    """CSV bytes, one chunk per batch; list cells are joined with ';'"""
+    columns = EXPORT_COLUMNS[dataset]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([';'.join(value) if isinstance(value, list) else value for value in row]
+                         for row in zip(*(batch[name] for name in columns)))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+class ChunkSink:
+    """Write-only file object that hands what pyarrow wrote back as response chunks"""
+
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+def columnar_chunks(dataset, batches, fmt):
+    """Parquet (one row group per batch) or Arrow IPC stream bytes, one chunk per batch"""
+    pa, pq = load_pyarrow()
+    schema = export_schema(dataset)
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if fmt == 'parquet' else pa.ipc.new_stream(sink, schema)
+    for batch in batches:
+        arrays = []
+        for field in schema:
+            values = batch[field.name]
+            if pa.types.is_timestamp(field.type) or pa.types.is_date(field.type):
+                arrays.append(pa.array(values, pa.string()).cast(field.type))
+            else:
+                arrays.append(pa.array(values, field.type))
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+def generate_insights(entries):
+    """Plain-language insights derived from the summary and mood patterns"""
+    summary = summarize_entries(entries)
+    if not entries:
+        return summary, ["Log a few moods to start seeing insights"]
+    patterns = mood_patterns(entries)
+    insights = [f"Your average mood is {summary['average_mood']} over {summary['total_entries']} entries"]
+    if patterns['weekday_mood']:
+        best = max(patterns['weekday_mood'], key=patterns['weekday_mood'].get)
+        insights.append(f"{best}s tend to be your best days")
+    if patterns['activity_impact']:
+        activity = max(patterns['activity_impact'], key=patterns['activity_impact'].get)
+        if patterns['activity_impact'][activity] > 0:
+            insights.append(f"Your mood is {patterns['activity_impact'][activity]} points higher on days with {activity}")
+    return summary, insights
+
+TRAINING_STAGES = ('linear_regression', 'gradient_boosting', 'random_forest', 'kmeans')
+TRAINING_FEATURES = ('energy', 'stress', 'sleep_hours')
+
+def training_rows(entries):
+    """(mood, energy, stress, sleep_hours) of every entry that has all four"""
+    fields = ('mood',) + TRAINING_FEATURES
+    return [tuple(entry[field] for field in fields) for entry in entries
+            if all(entry.get(field) is not None for field in fields)]
+
+def _solve(matrix, vector):
+    """Solve matrix @ x = vector by Gaussian elimination with partial pivoting"""
+    size = len(vector)
+    rows = [list(row) + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(column + 1, size):
+            factor = rows[row][column] / rows[column][column]
+            for index in range(column, size + 1):
+                rows[row][index] -= factor * rows[column][index]
+    solution = [0.0] * size
+    for row in range(size - 1, -1, -1):
+        solution[row] = (rows[row][size] - sum(rows[row][index] * solution[index]
+                                               for index in range(row + 1, size))) / rows[row][row]
+    return solution
+
+def _fit_stump(rows, targets, thresholds):
+    """Best single split (feature, threshold, left value, right value) for targets"""
+    best = None
+    for feature in range(len(TRAINING_FEATURES)):
+        for threshold in thresholds[feature]:
+            left = [target for row, target in zip(rows, targets) if row[feature + 1] <= threshold]
+            right = [target for row, target in zip(rows, targets) if row[feature + 1] > threshold]
+            if not left or not right:
+                continue
+            left_mean, right_mean = sum(left) / len(left), sum(right) / len(right)
+            error = (sum((value - left_mean) ** 2 for value in left) +
+                     sum((value - right_mean) ** 2 for value in right))
+            if best is None or error < best[0]:
+                best = (error, feature, threshold, left_mean, right_mean)
+    return best[1:] if best else None
+
+def _stump_predict(stump, row):
+    feature, threshold, left, right = stump
+    return left if row[feature + 1] <= threshold else right
+
+def train_stage(stage, rows, rounds, seed=0):
+    """Fit one of the TRAINING_STAGES stand-in models; runs in a training worker process
+
+    Pure-Python fits of the same shape as the real backend's scikit-learn
+    models, so training costs real CPU time and grows with rows and rounds.
+    """
+    rng = random.Random(seed)
+    moods = [row[0] for row in rows]
+    mean = sum(moods) / len(moods)
+    # Up to 16 split candidates per feature, spread over its distinct values
+    thresholds = []
+    for feature in range(len(TRAINING_FEATURES)):
+        values = sorted({row[feature + 1] for row in rows})
+        thresholds.append(values[::max(1, len(values) // 16)])
+
+    if stage == 'linear_regression':
+        design = [(1.0,) + row[1:] for row in rows]
+        normal = [[sum(x[i] * x[j] for x in design) + (1e-6 if i == j else 0.0) for j in range(4)]
+                  for i in range(4)]
+        weights = _solve(normal, [sum(x[i] * mood for x, mood in zip(design, moods)) for i in range(4)])
+        predictions = [sum(w * value for w, value in zip(weights, x)) for x in design]
+        model = {'intercept': round(weights[0], 4),
+                 'coefficients': {name: round(weight, 4) for name, weight in zip(TRAINING_FEATURES, weights[1:])}}
+    elif stage == 'gradient_boosting':
+        predictions = [mean] * len(rows)
+        stumps = []
+        for _ in range(rounds):
+            stump = _fit_stump(rows, [mood - prediction for mood, prediction in zip(moods, predictions)], thresholds)
+            if stump is None:
+                break
+            stump = stump[:2] + (stump[2] * 0.1, stump[3] * 0.1)
+            stumps.append(stump)
+            predictions = [prediction + _stump_predict(stump, row) for prediction, row in zip(predictions, rows)]
+        model = {'base': round(mean, 4), 'stumps': len(stumps)}
+    elif stage == 'random_forest':
+        stumps = []
+        for _ in range(rounds):
+            sample = [rows[rng.randrange(len(rows))] for _ in rows]
+            stump = _fit_stump(sample, [row[0] for row in sample], thresholds)
+            if stump is not None:
+                stumps.append(stump)
+        predictions = [sum(_stump_predict(stump, row) for stump in stumps) / len(stumps) if stumps else mean
+                       for row in rows]
+        model = {'trees': len(stumps),
+                 'feature_importance': {name: round(sum(1 for stump in stumps if stump[0] == index) / len(stumps), 3)
+                                        if stumps else 0.0 for index, name in enumerate(TRAINING_FEATURES)}}
+    elif stage == 'kmeans':
+        points = [row[:3] for row in rows]
+        centroids = rng.sample(points, min(4, len(points)))
+        for _ in range(rounds):
+            clusters = [[] for _ in centroids]
+            for point in points:
+                nearest = min(range(len(centroids)),
+                              key=lambda index: sum((a - b) ** 2 for a, b in zip(point, centroids[index])))
+                clusters[nearest].append(point)
+            moved = [tuple(sum(values) / len(cluster) for values in zip(*cluster)) if cluster else centroid
+                     for cluster, centroid in zip(clusters, centroids)]
+            if moved == centroids:
+                break
+            centroids = moved
+        predictions = None
+        model = {'centroids': [{'mood': round(c[0], 2), 'energy': round(c[1], 2), 'stress': round(c[2], 2)}
+                               for c in centroids]}
+    else:
+        raise ValueError(f"Unknown training stage: {stage}")
+
+    if predictions is not None:
+        model['rmse'] = round(math.sqrt(sum((mood - prediction) ** 2
+                                            for mood, prediction in zip(moods, predictions)) / len(rows)), 4)
+    return model
+
+def _exit_with_parent(parent_pid):
+    """Training worker initializer: exit once the server process is gone
+
+    Workers hold their own end of the task queue, so they would otherwise
+    outlive a server that was killed rather than shut down.
+    """
+    def watch():
+        while os.getppid() == parent_pid:
+            time.sleep(1)
+        os._exit(1)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+class TrainingQueue:
+    """Background model training: one job per user at a time, run in worker processes
+
+    Each job trains the TRAINING_STAGES one after another in a process pool,
+    so training CPU never competes with request threads for the GIL, and
+    reports its progress per finished stage. A job's models are swapped in
+    with a single assignment once every stage has succeeded, so readers see
+    either the previous set or the new one; a failed job leaves the previous
+    set in place.
+    """
+
+    MAX_FINISHED_JOBS = 1000
+
+    def __init__(self, workers=1, rounds=50, max_queued=64):
+        self.workers = workers
+        self.rounds = rounds
+        self.max_queued = max_queued
+        # Spawned workers start from a clean interpreter instead of forking a threaded server
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_exit_with_parent, initargs=(os.getpid(),))
+        self._runner = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='training-job')
+        self._lock = threading.Lock()
+        self.jobs = OrderedDict()
+        self.active = {}
+        # user id -> currently served models
+        self.models = {}
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, user_id, rows):
+        """Queue a training job for user_id, or return the one already queued or running"""
+        with self._lock:
+            if user_id in self.active:
+                return dict(self.jobs[self.active[user_id]]), False
+            if sum(1 for job in self.jobs.values() if job['state'] == 'queued') >= self.max_queued:
+                raise StubError(503, "Training queue is full, retry later")
+            job = {
+                'job_id': str(uuid.uuid4()),
+                'state': 'queued',
+                'progress': 0.0,
+                'stage': None,
+                'training_samples': len(rows),
+                'submitted_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'error': None
+            }
+            self.jobs[job['job_id']] = dict(job, user_id=user_id)
+            self.active[user_id] = job['job_id']
+            self._prune()
+        self._runner.submit(self._run, job['job_id'], user_id, rows)
+        return job, True
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job['state'] in ('succeeded', 'failed')]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self.jobs[job_id].update(fields)
+
+    def _run(self, job_id, user_id, rows):
+        self._update(job_id, state='running', started_at=datetime.now().isoformat())
+        trained = {}
+        try:
+            for index, stage in enumerate(TRAINING_STAGES):
+                self._update(job_id, stage=stage)
+                trained[stage] = self._pool.submit(train_stage, stage, rows, self.rounds, index).result()
+                self._update(job_id, progress=round((index + 1) / len(TRAINING_STAGES), 2))
+        except Exception as e:
+            with self._lock:
+                self.jobs[job_id].update(state='failed', stage=None, error=str(e),
+                                         finished_at=datetime.now().isoformat())
+                del self.active[user_id]
+                self.failed += 1
+            return
+        finished_at = datetime.now().isoformat()
+        with self._lock:
+            self.models[user_id] = {'version': job_id, 'trained_at': finished_at,
+                                    'training_samples': len(rows), 'models': trained}
+            self.jobs[job_id].update(state='succeeded', stage=None, finished_at=finished_at)
+            del self.active[user_id]
+            self.completed += 1
+
+    def job(self, job_id, user_id):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job['user_id'] != user_id:
+                return None
+            return {key: value for key, value in job.items() if key != 'user_id'}
+
+    def user_models(self, user_id):
+        with self._lock:
+            return self.models.get(user_id)
+
+    def stats(self):
+        with self._lock:
+            states = [job['state'] for job in self.jobs.values()]
+            return {
+                'workers': self.workers,
+                'rounds': self.rounds,
+                'queued': states.count('queued'),
+                'running': states.count('running'),
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+    def shutdown(self):
+        self._runner.shutdown(wait=False, cancel_futures=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+class StubStore:
+    """In-memory users, preview sessions and mood entries"""
+
+    def __init__(self, hasher=None):
+        self.lock = threading.Lock()
+        self.hasher = hasher or PasswordHasher()
+        self.users = {}
+        self.users_by_email = {}
+        self.user_index = UserIndex()
+        self.counters = AdminCounters()
+        self.sessions = {}
+        # user id -> {entry id: entry}, in insertion order, so deletes are O(1)
+        self.entries = {}
+        self.aggregates = {}
+        self.entry_indexes = {}
+        self.next_user_id = 1
+        self.next_entry_id = 1
+        self.add_user(ADMIN_EMAIL, ADMIN_PASSWORD, 'Makopolo', is_admin=True)
+        self.demo_user_id = self.add_user('demo@moodscape.dev', 'demo', 'Demo User')['id']
+
+    def add_user(self, email, password, name, is_admin=False):
+        salt, digest = self.hasher.hash(password)
+        with self.lock:
+            if email in self.users_by_email:
+                raise StubError(400, "Email already registered")
+            user = {
+                'id': self.next_user_id,
+                'email': email,
+                'name': name,
+                'is_admin': is_admin,
+                'created_at': datetime.now().isoformat(),
+                'salt': salt,
+                'iterations': self.hasher.iterations,
+                'password_hash': digest
+            }
+            self.next_user_id += 1
+            self.users[user['id']] = user
+            self.users_by_email[email] = user
+            self.user_index.add(user)
+            self.counters.add_user(user)
+            self.entries[user['id']] = {}
+            self.aggregates[user['id']] = MoodAggregates()
+            self.entry_indexes[user['id']] = EntryIndex()
+        return user
+
+    def add_entry(self, owner, data, *indexes):
+        """Store a validated entry in owner (entry id -> entry) and add(entry) it to every index, under the lock"""
+        entry = validate_entry(data)
+        with self.lock:
+            entry['id'] = self.next_entry_id
+            self.next_entry_id += 1
+            entry['created_at'] = entry['created_at'] or datetime.now().isoformat()
+            owner[entry['id']] = entry
+            for index in indexes:
+                index.add(entry)
+        return entry
+
+    def user_indexes(self, user_id):
+        """Everything derived from a user's entries: aggregates, keyset index, admin counters"""
+        return self.aggregates[user_id], self.entry_indexes[user_id], self.counters
+
+    def add_user_entry(self, user_id, data):
+        return self.add_entry(self.entries[user_id], data, *self.user_indexes(user_id))
+
+    def user_entry(self, user_id, entry_id):
+        """A copy of one of the user's entries, looked up under the lock"""
+        with self.lock:
+            return dict(self.locked_entry(user_id, entry_id))
+
+    def locked_entry(self, user_id, entry_id):
+        """The live entry; callers hold the lock so a concurrent DELETE cannot slip in between"""
+        entry = self.entries[user_id].get(entry_id)
+        if entry is None:
+            raise StubError(404, "Mood entry not found")
+        return entry
+
+    def update_user_entry(self, user_id, entry_id, data):
+        changes = _object_body(data)
+        with self.lock:
+            entry = self.locked_entry(user_id, entry_id)
+            updated = validate_entry(dict(entry, **changes))
+            updated['created_at'] = updated['created_at'] or entry['created_at']
+            for index in self.user_indexes(user_id):
+                index.remove(entry)
+            entry.update(updated)
+            for index in self.user_indexes(user_id):
+                index.add(entry)
+            return dict(entry)
+
+    def delete_user_entry(self, user_id, entry_id):
+        with self.lock:
+            entry = self.locked_entry(user_id, entry_id)
+            del self.entries[user_id][entry_id]
+            for index in self.user_indexes(user_id):
+                index.remove(entry)
+
+    def entry_page(self, user_id, after=None, limit=100, descending=True):
+        with self.lock:
+            return self.entry_indexes[user_id].page(after, limit, descending)
+
+    def iter_entry_batches(self, user_id, after=None, descending=False, batch_size=STREAM_BATCH_SIZE):
+        """Keyset cursor over a user's entries, yielding batches of copies; the lock is held per batch"""
+        while True:
+            entries = self.entry_page(user_id, after, batch_size, descending)
+            if entries:
+                yield entries
+            if len(entries) < batch_size:
+                return
+            after = EntryIndex.key(entries[-1])
+
+    def rebuild_aggregates(self, user_ids=None):
+        """Recompute the aggregates of user_ids (default: everyone, and the admin counters) from their entries"""
+        rebuilt = 0
+        for user_id in list(user_ids or self.users):
+            with self.lock:
+                self.aggregates[user_id] = MoodAggregates(self.entries[user_id].values())
+                rebuilt += len(self.entries[user_id])
+        if user_ids is None:
+            with self.lock:
+                self.counters = AdminCounters(self.users.values(),
+                                              (entry for entries in self.entries.values() for entry in entries.values()))
+        return rebuilt
+
+def validate_entry(data):
+    """Validated mood entry fields from a JSON or form body"""
+    data = _object_body(data)
+    return {
+        'mood': _int_field(data, 'mood', 1, 10, required=True),
+        'energy': _int_field(data, 'energy', 1, 10),
+        'stress': _int_field(data, 'stress', 1, 10),
+        'sleep_hours': _float_field(data, 'sleep_hours', 0, 24),
+        'notes': data.get('notes') or '',
+        'activities': _list_field(data, 'activities'),
+        'weather': data.get('weather'),
+        'location': data.get('location'),
+        'created_at': _timestamp_field(data, 'created_at'),
+    }
+
+def validate_context(data):
+    """Validated current_context of a smart recommendations body; bad values answer 400"""
+    context = _object_body(data, 400).get('current_context') or {}
+    if not isinstance(context, dict):
+        raise StubError(400, "Field current_context must be an object")
+    return {
+        'mood': _int_field(context, 'mood', 1, 10, status=400) or 5,
+        'energy': _int_field(context, 'energy', 1, 10, status=400) or 5,
+        'weather': context.get('weather'),
+    }
+
+def public_user(user):
+    return {key: user[key] for key in ('id', 'email', 'name', 'is_admin', 'created_at')}
+
+def _object_body(data, status=422):
+    if not isinstance(data, dict):
+        raise StubError(status, "Request body must be a JSON object")
+    return data
+
+def _int_field(data, name, low, high, required=False, status=422):
+    value = data.get(name)
+    if value is None or value == '':
+        if required:
+            raise StubError(status, f"Field required: {name}")
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise StubError(status, f"Field {name} must be an integer")
+    if not low <= value <= high:
+        raise StubError(status, f"Field {name} must be between {low} and {high}")
+    return value
+
+def _float_field(data, name, low, high):
+    value = data.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise StubError(422, f"Field {name} must be a number")
+    if not low <= value <= high:
+        raise StubError(422, f"Field {name} must be between {low} and {high}")
+    return value
+
+def _timestamp_field(data, name):
+    """Optional ISO timestamp, accepted so seeded histories can be backdated
+
+    Stored naive in server local time, like every timestamp the stub creates
+    itself: values with an offset are converted to local time first, so every
+    stored timestamp sorts chronologically as a string and falls on the same
+    "today" as server-dated entries (keyset cursors, daily rollups, streaks
+    and the columnar export cast all rely on that).
+    """
+    value = data.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        # fromisoformat only accepts a trailing Z from Python 3.11
+        parsed = datetime.fromisoformat(re.sub(r'[Zz]$', '+00:00', str(value)))
+    except ValueError:
+        raise StubError(422, f"Field {name} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.isoformat()
+
+def _list_field(data, name):
+    value = data.get(name)
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        # Form posts send activities as a JSON-encoded string
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            value = [item.strip() for item in value.split(',') if item.strip()]
+    if not isinstance(value, list):
+        raise StubError(422, f"Field {name} must be a list")
+    return [str(item) for item in value]
+
+class StreamingBody:
+    """A handler result sent with chunked transfer encoding instead of as one JSON body"""
+
+    def __init__(self, chunks, content_type, filename=None):
+        self.chunks = chunks
+        self.content_type = content_type
+        self.filename = filename
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the handle_* methods listed in ROUTES"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # body waits on a delayed ACK and adds ~40ms to every response
+    disable_nagle_algorithm = True
+    server_version = 'MoodscapeStub/' + VERSION
+
+    ROUTES = [
+        ('GET', r'/health', 'handle_health'),
+        ('POST', r'/api/preview/session', 'handle_preview_session'),
+        ('POST', r'/api/preview/mood-entries', 'handle_preview_mood_entry'),
+        ('POST', r'/api/preview/analyze-mood', 'handle_preview_analyze'),
+        ('GET', r'/api/preview/insights', 'handle_preview_insights'),
+        ('POST', r'/api/auth/register', 'handle_register'),
+        ('POST', r'/api/auth/login', 'handle_login'),
+        ('POST', r'/api/auth/refresh', 'handle_refresh'),
+        ('GET', r'/api/admin/stats', 'handle_admin_stats'),
+        ('GET', r'/api/admin/users', 'handle_admin_users'),
+        ('POST', r'/api/admin/rebuild-aggregates', 'handle_rebuild_aggregates'),
+        ('GET', r'/api/insights', 'handle_insights'),
+        ('GET', r'/api/stats', 'handle_stats'),
+        ('GET', r'/api/trends', 'handle_trends'),
+        ('POST', r'/api/mood-entries', 'handle_create_entry'),
+        ('GET', r'/api/mood-entries', 'handle_list_entries'),
+        ('GET', r'/api/mood-entries/(\d+)', 'handle_get_entry'),
+        ('PUT', r'/api/mood-entries/(\d+)', 'handle_update_entry'),
+        ('DELETE', r'/api/mood-entries/(\d+)', 'handle_delete_entry'),
+        ('GET', r'/api/export', 'handle_export'),
+        ('POST', r'/api/ai/predict-mood', 'handle_predict_mood'),
+        ('POST', r'/api/ai/predict-mood/batch', 'handle_predict_mood_batch'),
+        ('POST', r'/api/ai/sentiment-analysis', 'handle_sentiment'),
+        ('POST', r'/api/ai/sentiment-analysis/batch', 'handle_sentiment_batch'),
+        ('POST', r'/api/ai/smart-recommendations', 'handle_recommendations'),
+        ('GET', r'/api/ai/pattern-analysis', 'handle_pattern_analysis'),
+        ('POST', r'/api/ai/train-models', 'handle_train_models'),
+        ('GET', r'/api/ai/train-models/([0-9a-f-]+)', 'handle_training_status'),
+        ('GET', r'/api/ai/models', 'handle_trained_models'),
+        ('POST', r'/api/therapy/analyze-emotion', 'handle_analyze_emotion'),
+    ]
+    COMPILED_ROUTES = [(method, re.compile(pattern + '$'), name) for method, pattern, name in ROUTES]
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            sys.stderr.write("%s - - [%s] %s\n" % (self.address_string(), self.log_date_time_string(), format % args))
+
+    def log_request(self, code='-', size='-'):
+        # Access lines are written by dispatch once the response is sent, with its duration
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PUT(self):
+        self.dispatch('PUT')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def dispatch(self, method):
+        start = time.perf_counter()
+        self.status = '-'
+        try:
+            self.route(method)
+        finally:
+            self.log_message('"%s" %s %.3fms', self.requestline, self.status,
+                             (time.perf_counter() - start) * 1000)
+
+    def route(self, method):
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.use_etag = False
+        try:
+            self.body = self.read_body()
+            delay = self.server.profile.delay_for(url.path)
+            if delay:
+                time.sleep(delay)
+            injected = self.server.profile.error_for(url.path)
+            if injected:
+                raise StubError(injected, "Injected failure")
+
+            path_matched = False
+            for route_method, pattern, name in self.COMPILED_ROUTES:
+                match = pattern.match(url.path)
+                if match:
+                    path_matched = True
+                    if route_method == method:
+                        status, payload = getattr(self, name)(*match.groups())
+                        if isinstance(payload, StreamingBody):
+                            self.send_stream(status, payload)
+                        else:
+                            self.send_json(status, payload)
+                        return
+            if path_matched:
+                raise StubError(405, "Method Not Allowed")
+            raise StubError(404, "Not Found")
+        except StubError as e:
+            self.send_json(e.status, {'detail': e.detail})
+        except Exception as e:
+            self.send_json(500, {'detail': f"Internal server error: {e}"})
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if not raw:
+            return {}
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('application/json'):
+            try:
+                return json.loads(raw)
+            except json.JSONDecodeError:
+                raise StubError(422, "Invalid JSON body")
+        return {key: values[-1] for key, values in parse_qs(raw.decode()).items()}
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        etag = None
+        if self.use_etag and status == 200:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+                status, body = 304, b''
+        self.status = status
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'private, no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_stream(self, status, stream):
+        """Write stream's chunks with chunked transfer encoding as they are produced"""
+        self.status = status
+        self.send_response(status)
+        self.send_header('Content-Type', stream.content_type)
+        if stream.filename:
+            self.send_header('Content-Disposition', f'attachment; filename="{stream.filename}"')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            for chunk in stream.chunks:
+                if chunk:
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+        except Exception:
+            # The status line is already out: drop the connection without the
+            # terminating chunk so the client sees a truncated body, not a short one
+            self.close_connection = True
+            return
+        self.wfile.write(b'0\r\n\r\n')
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def current_user(self):
+        auth = self.headers.get('Authorization', '')
+        if not auth.startswith('Bearer '):
+            raise StubError(401, "Not authenticated")
+        token = auth[len('Bearer '):]
+        if token == DEMO_TOKEN:
+            return self.store.users[self.store.demo_user_id]
+        token_cache = self.server.token_cache
+        claims = token_cache.verify(token) if token_cache else verify_token(token)
+        if claims is None or claims['sub'] not in self.store.users:
+            raise StubError(401, "Invalid or expired token")
+        return self.store.users[claims['sub']]
+
+    def current_admin(self):
+        user = self.current_user()
+        if not user['is_admin']:
+            raise StubError(403, "Admin access required")
+        return user
+
+    def require(self, name):
+        value = self.body.get(name) if isinstance(self.body, dict) else None
+        if value is None or value == '':
+            raise StubError(422, f"Field required: {name}")
+        return value
+
+    def handle_health(self):
+        return 200, {
+            'status': 'healthy',
+            'version': VERSION,
+            'backend': 'stub',
+            'models_ready': self.server.models.ready(),
+            'models': self.server.models.status(),
+            'analysis_cache': self.server.analysis_cache.stats() if self.server.analysis_cache else None,
+            'token_cache': self.server.token_cache.stats() if self.server.token_cache else None,
+            'password_hasher': self.store.hasher.stats(),
+            'training': self.server.training.stats(),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def preview_session(self, session_id):
+        session = self.store.sessions.get(session_id)
+        if session is None:
+            raise StubError(404, "Preview session not found")
+        return session
+
+    def handle_preview_session(self):
+        session_id = str(uuid.uuid4())
+        with self.store.lock:
+            self.store.sessions[session_id] = {'created_at': datetime.now().isoformat(), 'entries': {}}
+        return 200, {'session_id': session_id, 'expires_in': 86400}
+
+    def handle_preview_mood_entry(self):
+        session = self.preview_session(self.require('session_id'))
+        entry = self.store.add_entry(session['entries'], self.body)
+        return 200, {'success': True, 'entry': entry}
+
+    def handle_preview_analyze(self):
+        self.preview_session(self.require('session_id'))
+        return 200, {'success': True, 'analysis': self.analyze(str(self.require('text')))}
+
+    def handle_preview_insights(self):
+        session_id = self.query.get('session_id')
+        if not session_id:
+            raise StubError(422, "Field required: session_id")
+        session = self.preview_session(session_id)
+        with self.store.lock:
+            entries = list(session['entries'].values())
+        return 200, {'success': True, 'insights': summarize_entries(entries)}
+
+    def handle_register(self):
+        user = self.store.add_user(
+            str(self.require('email')), str(self.require('password')), str(self.require('name'))
+        )
+        return 200, {'success': True, 'user': public_user(user)}
+
+    def handle_login(self):
+        email = str(self.require('email'))
+        password = str(self.require('password'))
+        user = self.store.users_by_email.get(email)
+        if user is None or not self.store.hasher.verify(password, user):
+            raise StubError(401, "Invalid email or password")
+        return 200, {
+            'success': True,
+            'access_token': create_token(user['id']),
+            'token_type': 'bearer',
+            'user': public_user(user)
+        }
+
+    def handle_refresh(self):
+        user = self.current_user()
+        return 200, {'success': True, 'access_token': create_token(user['id']), 'token_type': 'bearer'}
+
+    def handle_admin_stats(self):
+        """Store-wide totals from the admin counters, O(1) however many users and entries there are"""
+        self.current_admin()
+        today = datetime.now().date().isoformat()
+        with self.store.lock:
+            counters = self.store.counters
+            stats = {
+                'total_users': len(self.store.users),
+                'admin_users': counters.admin_users,
+                'total_mood_entries': counters.entries,
+                'entries_today': counters.entries_by_day.get(today, 0),
+                'preview_sessions': len(self.store.sessions)
+            }
+        return 200, {'success': True, 'stats': stats}
+
+    def handle_rebuild_aggregates(self):
+        """Recompute /api/stats aggregates from the stored entries (one user_id, or everyone)"""
+        self.current_admin()
+        user_id = _int_field(_object_body(self.body, 400), 'user_id', 1, sys.maxsize, status=400)
+        if user_id is not None and user_id not in self.store.users:
+            raise StubError(404, "User not found")
+        start = time.perf_counter()
+        entries = self.store.rebuild_aggregates([user_id] if user_id else None)
+        return 200, {'success': True, 'entries': entries,
+                     'seconds': round(time.perf_counter() - start, 3)}
+
+    def handle_admin_users(self):
+        """One keyset page of users, sorted and optionally filtered
+
+        sort is one of USER_SORT_FIELDS (default id, i.e. signup order) and
+        order asc or desc; q matches email or name case-insensitively, and
+        is_admin, created_after and created_before narrow the list further.
+        total counts every user, not just those matching the filters.
+        """
+        self.current_admin()
+        sort = self.query.get('sort', 'id')
+        if sort not in USER_SORT_FIELDS:
+            raise StubError(422, "Field sort must be one of " + ", ".join(USER_SORT_FIELDS))
+        order = self.query.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise StubError(422, "Field order must be asc or desc")
+        cursor = self.query.get('cursor')
+        after = decode_cursor(cursor, USER_SORT_FIELDS[sort]) if cursor else None
+        page_size = _int_field(self.query, 'page_size', 1, MAX_PAGE_SIZE) or 50
+
+        filters = []
+        text = (self.query.get('q') or '').lower()
+        if text:
+            filters.append(lambda user: text in user['email'].lower() or text in user['name'].lower())
+        if self.query.get('is_admin') in ('true', 'false'):
+            is_admin = self.query['is_admin'] == 'true'
+            filters.append(lambda user: user['is_admin'] == is_admin)
+        created_after = _timestamp_field(self.query, 'created_after')
+        if created_after:
+            filters.append(lambda user: user['created_at'] >= created_after)
+        created_before = _timestamp_field(self.query, 'created_before')
+        if created_before:
+            filters.append(lambda user: user['created_at'] < created_before)
+        match = (lambda user: all(check(user) for check in filters)) if filters else None
+
+        with self.store.lock:
+            page = self.store.user_index.page(self.store.users, sort, after, page_size, order == 'desc', match)
+            users = [dict(public_user(user), total_entries=len(self.store.entries[user['id']])) for user in page]
+            total = len(self.store.users)
+        next_cursor = encode_cursor((page[-1][sort], page[-1]['id'])) if len(page) == page_size else None
+        return 200, {'success': True, 'users': users, 'total': total, 'next_cursor': next_cursor}
+
+    def user_entries(self, user):
+        with self.store.lock:
+            return list(self.store.entries[user['id']].values())
+
+    def handle_insights(self):
+        summary, insights = generate_insights(self.user_entries(self.current_user()))
+        return 200, {'success': True, 'summary': summary, 'insights': insights}
+
+    def handle_stats(self):
+        user = self.current_user()
+        with self.store.lock:
+            stats = self.store.aggregates[user['id']].stats()
+        return 200, {'success': True, 'stats': stats}
+
+    def handle_trends(self):
+        user = self.current_user()
+        days = _int_field(self.query, 'days', 1, 365) or 30
+        with self.store.lock:
+            trends = self.store.aggregates[user['id']].trends(days)
+        # Unchanged windows revalidate to 304 (see send_json)
+        self.use_etag = True
+        return 200, {'success': True, 'days': days, 'trends': trends}
+
+    def handle_create_entry(self):
+        user = self.current_user()
+        entry = self.store.add_user_entry(user['id'], self.body)
+        return 200, dict(entry, user_id=user['id'])
+
+    def handle_list_entries(self):
+        """A user's entries as one array (legacy), a keyset page, or an NDJSON stream
+
+        page_size and/or cursor return {'entries', 'next_cursor'} pages ordered
+        by (created_at, id), newest first unless order=asc. format=ndjson or
+        Accept: application/x-ndjson streams every entry after the cursor, one
+        JSON object per line, read from the store STREAM_BATCH_SIZE at a time.
+        """
+        user = self.current_user()
+        cursor = self.query.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+        order = self.query.get('order', 'desc')
+        if order not in ('asc', 'desc'):
+            raise StubError(422, "Field order must be asc or desc")
+        descending = order == 'desc'
+
+        if (self.query.get('format') == 'ndjson' or
+                'application/x-ndjson' in self.headers.get('Accept', '')):
+            return 200, StreamingBody(self.stream_entries(user['id'], after, descending), 'application/x-ndjson')
+
+        page_size = _int_field(self.query, 'page_size', 1, MAX_PAGE_SIZE)
+        if page_size is None and after is None:
+            entries = self.user_entries(user)
+            limit = _int_field(self.query, 'limit', 0, sys.maxsize)
+            if limit:
+                entries = entries[-limit:]
+            return 200, entries
+
+        page_size = page_size or 100
+        entries = self.store.entry_page(user['id'], after, page_size, descending)
+        next_cursor = encode_cursor(EntryIndex.key(entries[-1])) if len(entries) == page_size else None
+        return 200, {'entries': entries, 'next_cursor': next_cursor}
+
+    def stream_entries(self, user_id, after, descending):
+        """NDJSON chunks of one user's entries, one per batch read from the store"""
+        for entries in self.store.iter_entry_batches(user_id, after, descending):
+            yield ''.join(json.dumps(entry) + '\n' for entry in entries).encode()
+
+    def handle_export(self):
+        """Stream one dataset (entries, activities or insights) as CSV, Parquet or Arrow"""
+        user = self.current_user()
+        dataset = self.query.get('dataset', 'entries')
+        if dataset not in EXPORT_COLUMNS:
+            raise StubError(422, "Field dataset must be one of " + ", ".join(EXPORT_COLUMNS))
+        fmt = self.query.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            raise StubError(422, "Field format must be one of " + ", ".join(EXPORT_FORMATS))
+        batches = export_batches(self.store, user['id'], dataset,
+                                 STREAM_BATCH_SIZE if fmt == 'csv' else EXPORT_ROW_GROUP_SIZE)
+        if fmt == 'csv':
+            chunks = csv_chunks(dataset, batches)
+        elif load_pyarrow() is None:
+            raise StubError(501, f"{fmt} export needs pyarrow, which is not installed on this server")
+        else:
+            chunks = columnar_chunks(dataset, batches, fmt)
+        content_type, extension = EXPORT_FORMATS[fmt]
+        return 200, StreamingBody(chunks, content_type, filename=f"moodscape-{dataset}.{extension}")
+
+    def handle_get_entry(self, entry_id):
+        return 200, self.store.user_entry(self.current_user()['id'], int(entry_id))
+
+    def handle_update_entry(self, entry_id):
+        user = self.current_user()
+        return 200, self.store.update_user_entry(user['id'], int(entry_id), self.body)
+
+    def handle_delete_entry(self, entry_id):
+        user = self.current_user()
+        self.store.delete_user_entry(user['id'], int(entry_id))
+        return 200, {'success': True}
+
+    def analyze(self, text):
+        self.server.models.require('sentiment')
+        return analyze_text(text, self.server.analysis_cache)
+
+    def analyze_batch(self, texts):
+        self.server.models.require('sentiment')
+        return analyze_texts(texts, self.server.analysis_cache)
+
+    def require_texts(self):
+        texts = self.require('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise StubError(422, "Field texts must be a list of strings")
+        if len(texts) > MAX_BATCH_SIZE:
+            raise StubError(422, f"At most {MAX_BATCH_SIZE} texts per batch")
+        return texts
+
+    def handle_predict_mood(self):
+        self.current_user()
+        self.server.models.require('mood_predictor')
+        return 200, predict_mood(self.analyze(str(self.require('text'))))
+
+    def handle_predict_mood_batch(self):
+        self.current_user()
+        self.server.models.require('mood_predictor')
+        return 200, {'results': [predict_mood(analysis) for analysis in self.analyze_batch(self.require_texts())]}
+
+    def handle_sentiment(self):
+        self.current_user()
+        return 200, self.analyze(str(self.require('text')))
+
+    def handle_sentiment_batch(self):
+        self.current_user()
+        return 200, {'results': self.analyze_batch(self.require_texts())}
+
+    def handle_recommendations(self):
+        self.current_user()
+        context = validate_context(self.body)
+        recommendations = []
+        if context['mood'] < 5:
+            recommendations.append({'activity': 'call a friend', 'reason': 'Social contact lifts low moods'})
+        if context['energy'] < 5:
+            recommendations.append({'activity': 'short walk', 'reason': 'Light exercise restores energy'})
+        if context.get('weather') == 'sunny':
+            recommendations.append({'activity': 'time outdoors', 'reason': 'Sunlight improves mood'})
+        recommendations.append({'activity': 'journaling', 'reason': 'Reflection helps track patterns'})
+        return 200, {'recommendations': recommendations}
+
+    def handle_pattern_analysis(self):
+        entries = self.user_entries(self.current_user())
+        self.server.models.require('pattern_clusterer')
+        return 200, {'success': True, 'patterns': dict(summarize_entries(entries), **mood_patterns(entries))}
+
+    def handle_train_models(self):
+        """Queue a training job and answer 202 with its id; poll the status route for progress"""
+        user = self.current_user()
+        self.server.models.require('mood_predictor', 'pattern_clusterer')
+        rows = training_rows(self.user_entries(user))
+        if len(rows) < 2:
+            raise StubError(400, "At least 2 mood entries with energy, stress and sleep are required to train models")
+        job, created = self.server.training.submit(user['id'], rows)
+        return 202, {
+            'success': True,
+            'job_id': job['job_id'],
+            'status': job['state'],
+            'created': created,
+            'models': list(TRAINING_STAGES),
+            'training_samples': job['training_samples'],
+            'status_url': f"/api/ai/train-models/{job['job_id']}"
+        }
+
+    def handle_training_status(self, job_id):
+        job = self.server.training.job(job_id, self.current_user()['id'])
+        if job is None:
+            raise StubError(404, "Training job not found")
+        return 200, dict(job, success=True)
+
+    def handle_trained_models(self):
+        """The models currently served to this user: the output of their last successful job"""
+        return 200, {'success': True, 'models': self.server.training.user_models(self.current_user()['id'])}
+
+    def handle_analyze_emotion(self):
+        self.current_user()
+        self.server.models.require('emotion')
+        analysis = self.analyze(str(self.require('text')))
+        emotions = analysis['emotions']
+        primary = max(emotions, key=emotions.get) if any(emotions.values()) else 'neutral'
+        return 200, {
+            'primary_emotion': primary,
+            'emotions': emotions,
+            'sentiment': analysis['sentiment'],
+            'suggestions': ['Take a few slow, deep breaths', 'Write down what you are feeling']
+        }
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Load tests open many connections at once; the default backlog of 5 drops them
+    request_queue_size = 128
+
+    def __init__(self, address, profile=None, quiet=True, analysis_cache=None, models=None,
+                 hasher=None, token_cache=None, training=None):
+        super().__init__(address, StubRequestHandler)
+        self.profile = profile or FaultProfile()
+        self.store = StubStore(hasher)
+        self.token_cache = token_cache
+        self.quiet = quiet
+        self.analysis_cache = analysis_cache
+        self.models = models or ModelRegistry()
+        self.training = training or TrainingQueue()
+
+    def server_close(self):
+        super().server_close()
+        self.training.shutdown()
+
+def serve_in_background(host='127.0.0.1', port=8000, profile=None, quiet=True, analysis_cache=None):
+    """Start a stub server on a daemon thread and return it; call shutdown() to stop"""
+    server = StubServer((host, port), profile, quiet, analysis_cache)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def start_stub_process(port=8000, extra_args=(), timeout=30):
+    """Launch this script as a child process and wait until its /health answers"""
+    from harness import wait_for_healthy
+
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), '--port', str(port), *extra_args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    if wait_for_healthy(f"http://127.0.0.1:{port}", timeout, process) is None:
+        process.terminate()
+        process.wait()
+        raise RuntimeError(f"Stub backend did not become healthy on port {port}")
+    return process
+
+def self_check(requests_per_run=200, clients=8):
+    """Verify harness latency math against known injected delays
+
+    A run with no injected delay measures the harness and server overhead;
+    every delayed run must then report latencies of at least the injected
+    delay, and a median no further above it than that overhead.
+    """
+    from harness import HarnessClient, summarize_latencies
+
+    ok = True
+    overhead_ms = None
+    for delay_ms in (0, 25, 100, 250):
+        profile = FaultProfile(latency={'/health': (delay_ms, 0)})
+        server = serve_in_background(port=0, profile=profile)
+        client = HarnessClient(f"http://127.0.0.1:{server.server_address[1]}", pool_size=clients,
+                               record_timings=False)
+        try:
+            with ThreadPoolExecutor(max_workers=clients) as pool:
+                latencies = list(pool.map(lambda _: client.get('/health').duration_ms, range(requests_per_run)))
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+        stats = summarize_latencies(latencies)
+        if overhead_ms is None:
+            overhead_ms = stats['p50_ms']
+            print(f"BASE harness overhead: p50 {stats['p50_ms']:.1f}ms p99 {stats['p99_ms']:.1f}ms")
+            continue
+        excess_ms = stats['p50_ms'] - delay_ms - overhead_ms
+        passed = min(latencies) >= delay_ms and excess_ms <= max(5, delay_ms * 0.1)
+        ok = ok and passed
+        print(f"{'PASS' if passed else 'FAIL'} injected {delay_ms}ms: "
+              f"min {min(latencies):.1f}ms p50 {stats['p50_ms']:.1f}ms "
+              f"(excess {excess_ms:+.1f}ms) p99 {stats['p99_ms']:.1f}ms max {stats['max_ms']:.1f}ms")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in Moodscape backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", action="append", default=[], metavar="PREFIX=MS[:JITTER]",
+                        help="inject latency on routes starting with PREFIX (repeatable)")
+    parser.add_argument("--errors", action="append", default=[], metavar="PREFIX=RATE[:STATUS]",
+                        help="fail RATE (0-1) of requests on routes starting with PREFIX (repeatable)")
+    parser.add_argument("--seed", type=int, help="random seed for latency jitter and error injection")
+    parser.add_argument("--access-log", action="store_true", help="log every request to stderr")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="analyses kept in the text analysis cache (0 disables it)")
+    parser.add_argument("--cache-ttl", type=float, default=3600, help="seconds a cached analysis stays valid")
+    parser.add_argument("--warm-up", action="store_true", default=os.environ.get('MOODSCAPE_WARM_UP') == '1',
+                        help="load every AI model in the background at startup (default from MOODSCAPE_WARM_UP=1)")
+    parser.add_argument("--model-load-ms", type=float, default=0,
+                        help="simulated load time of each AI model, paid on first use or at warm-up")
+    parser.add_argument("--password-iterations", type=int, default=PASSWORD_ITERATIONS,
+                        help="PBKDF2 iterations per password hash; lower it to seed many users quickly")
+    parser.add_argument("--hash-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="threads that hash passwords; logins and signups beyond them wait their turn")
+    parser.add_argument("--token-cache-size", type=int, default=10000,
+                        help="verified tokens kept in the token cache (0 disables it)")
+    parser.add_argument("--training-workers", type=int, default=1,
+                        help="worker processes for /api/ai/train-models jobs; more jobs wait in the queue")
+    parser.add_argument("--training-rounds", type=int, default=50,
+                        help="boosting/forest rounds and k-means iterations per training job")
+    parser.add_argument("--self-check", action="store_true",
+                        help="check harness latency math against injected delays and exit")
+    args = parser.parse_args()
+
+    if args.self_check:
+        sys.exit(0 if self_check() else 1)
+
+    profile = FaultProfile(
+        latency=dict(parse_latency(spec) for spec in args.latency),
+        errors=dict(parse_error(spec) for spec in args.errors),
+        seed=args.seed
+    )
+    cache = AnalysisCache(args.cache_size, args.cache_ttl) if args.cache_size > 0 else None
+    models = ModelRegistry(args.model_load_ms / 1000)
+    hasher = PasswordHasher(args.hash_workers, args.password_iterations)
+    token_cache = TokenCache(args.token_cache_size) if args.token_cache_size > 0 else None
+    training = TrainingQueue(args.training_workers, args.training_rounds)
+    server = StubServer((args.host, args.port), profile, quiet=not args.access_log,
+                        analysis_cache=cache, models=models, hasher=hasher, token_cache=token_cache,
+                        training=training)
+    if args.warm_up:
+        # Health checks and CRUD routes are served while the models load
+        models.warm_up_in_background()
+    print(f"Moodscape stub backend listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
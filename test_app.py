@@ -2,16 +2,69 @@
 """
 Test script for Moodscape application
 This script tests the basic functionality of the backend API
+
+Run with --load to replay the same requests from many concurrent clients
+and report throughput and latency percentiles per endpoint. Add --batch to
+also compare the /batch text endpoints (stub backend only) against one
+request per text.
 """
 
 import requests
 import json
 import time
+import argparse
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from harness import HarnessClient, LatencyHistogram
+
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+AUTH_HEADERS = {"Authorization": "Bearer demo_token"}
+
+MOOD_ENTRY_DATA = {
+    "mood": 8,
+    "energy": 7,
+    "stress": 3,
+    "sleep_hours": 8.5,
+    "notes": "Feeling great today!",
+    "activities": ["exercise", "socializing"],
+    "weather": "sunny",
+    "location": "home"
+}
+
+PREDICTION_TEXT = "I'm feeling really happy and energetic today!"
+SENTIMENT_TEXT = "I'm feeling a bit stressed and overwhelmed with work."
+
+# A week of short notes is re-analysed per item and as one batch
+BATCH_TEXTS = [
+    PREDICTION_TEXT,
+    SENTIMENT_TEXT,
+    "Calm evening, a little tired after the gym.",
+    "Worried about the exam but hopeful it will go well.",
+    "Lonely weekend, nobody answered my messages.",
+]
+
+RECOMMENDATION_CONTEXT = {
+    "mood": 6,
+    "energy": 5,
+    "weather": "sunny",
+    "time_of_day": "afternoon"
+}
+
+# Request shapes replayed by the load mode: (endpoint name, method, path, request kwargs)
+LOAD_REQUESTS = [
+    ("health", "GET", "/health", {}),
+    ("mood-entries", "POST", "/api/mood-entries", {"json": MOOD_ENTRY_DATA}),
+    ("predict-mood", "POST", "/api/ai/predict-mood", {"json": {"text": PREDICTION_TEXT}}),
+    ("sentiment-analysis", "POST", "/api/ai/sentiment-analysis", {"json": {"text": SENTIMENT_TEXT}}),
+    ("smart-recommendations", "POST", "/api/ai/smart-recommendations",
+     {"json": {"current_context": RECOMMENDATION_CONTEXT}}),
+]
+
 def test_health_check():
     """Test the health check endpoint"""
     print("Testing health check...")
@@ -31,21 +84,10 @@ def test_mood_entry_creation():
     """Test creating a mood entry"""
     print("Testing mood entry creation...")
     try:
-        mood_data = {
-            "mood": 8,
-            "energy": 7,
-            "stress": 3,
-            "sleep_hours": 8.5,
-            "notes": "Feeling great today!",
-            "activities": ["exercise", "socializing"],
-            "weather": "sunny",
-            "location": "home"
-        }
-        
         response = requests.post(
             f"{BASE_URL}/api/mood-entries",
-            json=mood_data,
-            headers={"Authorization": "Bearer demo_token"}
+            json=MOOD_ENTRY_DATA,
+            headers=AUTH_HEADERS
         )
         
         if response.status_code == 200:
@@ -63,12 +105,10 @@ def test_ai_prediction():
     """Test AI mood prediction"""
     print("Testing AI mood prediction...")
     try:
-        text = "I'm feeling really happy and energetic today!"
-        
         response = requests.post(
             f"{BASE_URL}/api/ai/predict-mood",
-            json={"text": text},
-            headers={"Authorization": "Bearer demo_token"}
+            json={"text": PREDICTION_TEXT},
+            headers=AUTH_HEADERS
         )
         
         if response.status_code == 200:
@@ -87,12 +127,10 @@ def test_sentiment_analysis():
     """Test sentiment analysis"""
     print("Testing sentiment analysis...")
     try:
-        text = "I'm feeling a bit stressed and overwhelmed with work."
-        
         response = requests.post(
             f"{BASE_URL}/api/ai/sentiment-analysis",
-            json={"text": text},
-            headers={"Authorization": "Bearer demo_token"}
+            json={"text": SENTIMENT_TEXT},
+            headers=AUTH_HEADERS
         )
         
         if response.status_code == 200:
@@ -111,17 +149,10 @@ def test_smart_recommendations():
     """Test smart recommendations"""
     print("Testing smart recommendations...")
     try:
-        context = {
-            "mood": 6,
-            "energy": 5,
-            "weather": "sunny",
-            "time_of_day": "afternoon"
-        }
-        
         response = requests.post(
             f"{BASE_URL}/api/ai/smart-recommendations",
-            json={"current_context": context},
-            headers={"Authorization": "Bearer demo_token"}
+            json={"current_context": RECOMMENDATION_CONTEXT},
+            headers=AUTH_HEADERS
         )
         
         if response.status_code == 200:
@@ -136,8 +167,141 @@ def test_smart_recommendations():
         print(f"❌ Smart recommendations error: {e}")
         return False
 
-def main():
-    """Run all tests"""
+def test_batch_throughput():
+    """Compare batch text endpoints against one request per text"""
+    print("Testing batch vs per-item text analysis...")
+    texts = [f"{text} (day {day})" for day in range(1, 8) for text in BATCH_TEXTS]
+    client = HarnessClient(BASE_URL)
+    try:
+        passed = True
+        for path in ("/api/ai/predict-mood", "/api/ai/sentiment-analysis"):
+            start = time.perf_counter()
+            single = [client.post(path, json={"text": text}, headers=AUTH_HEADERS) for text in texts]
+            single_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = client.post(f"{path}/batch", json={"texts": texts}, headers=AUTH_HEADERS)
+            batch_elapsed = time.perf_counter() - start
+
+            if batch.status_code != 200 or any(response.status_code != 200 for response in single):
+                print(f"❌ {path}: batch status {batch.status_code}, "
+                      f"{sum(response.status_code != 200 for response in single)} per-item failures")
+                passed = False
+                continue
+            if batch.json()["results"] != [response.json() for response in single]:
+                print(f"❌ {path}: batch results do not match per-item results in order")
+                passed = False
+                continue
+            print(f"✅ {path}: {len(texts)} texts, per-item {len(texts) / single_elapsed:.0f} texts/s, "
+                  f"batch {len(texts) / batch_elapsed:.0f} texts/s (x{single_elapsed / batch_elapsed:.1f})")
+        return passed
+    except Exception as e:
+        print(f"❌ Batch throughput error: {e}")
+        return False
+    finally:
+        client.close()
+
+# Upper bounds (ms) of the latency histogram buckets printed by the load mode
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+class EndpointStats:
+    """Constant-memory load results for one endpoint: latency histogram, errors, bucket counts"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, latency_ms, ok):
+        self.latency.add(latency_ms)
+        self.errors += not ok
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+def load_client(client, client_id, deadline, budget, budget_lock, by_endpoint, stats_lock):
+    """Replay LOAD_REQUESTS round-robin until the deadline or request budget runs out"""
+    i = client_id
+    while True:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if budget is not None:
+            with budget_lock:
+                if budget[0] <= 0:
+                    break
+                budget[0] -= 1
+        name, method, path, kwargs = LOAD_REQUESTS[i % len(LOAD_REQUESTS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = client.request(method, path, headers=AUTH_HEADERS, **kwargs)
+            ok = response.status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        latency_ms = (time.perf_counter() - start) * 1000
+        with stats_lock:
+            by_endpoint.setdefault(name, EndpointStats()).add(latency_ms, ok)
+
+def run_load_test(clients=10, duration=None, total_requests=None):
+    """Run LOAD_REQUESTS from concurrent clients and report per-endpoint latency"""
+    if duration is None and total_requests is None:
+        duration = 30
+    limit = f"{duration}s" if duration is not None else f"{total_requests} requests"
+    print(f"🚀 Load testing {BASE_URL} with {clients} clients for {limit}")
+    print("=" * 50)
+
+    budget = [total_requests] if total_requests is not None else None
+    budget_lock = threading.Lock()
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+
+    by_endpoint = {}
+    stats_lock = threading.Lock()
+    client = HarnessClient(BASE_URL, pool_size=clients, record_timings=False)
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            futures = [
+                pool.submit(load_client, client, client_id, deadline, budget, budget_lock, by_endpoint, stats_lock)
+                for client_id in range(clients)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        client.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{'endpoint':<24}{'reqs':>7}{'err':>6}{'req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, _, _, _ in LOAD_REQUESTS:
+        if name not in by_endpoint:
+            continue
+        stats = by_endpoint[name]
+        summary = stats.latency.summary()
+        print(
+            f"{name:<24}{summary['count']:>7}{stats.errors:>6}{summary['count'] / elapsed:>9.1f}"
+            f"{summary['p50_ms']:>9.1f}{summary['p95_ms']:>9.1f}"
+            f"{summary['p99_ms']:>9.1f}{summary['max_ms']:>9.1f}"
+        )
+
+    print()
+    print("Latency histograms (ms):")
+    labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+    for name, _, _, _ in LOAD_REQUESTS:
+        if name not in by_endpoint:
+            continue
+        stats = by_endpoint[name]
+        print(f"  {name}")
+        for label, count in zip(labels, stats.buckets):
+            if count:
+                bar = "#" * max(1, int(40 * count / stats.latency.count))
+                print(f"    {label:>7} {count:>7} {bar}")
+
+    errors = sum(stats.errors for stats in by_endpoint.values())
+    requests_sent = sum(stats.latency.count for stats in by_endpoint.values())
+    print("=" * 50)
+    print(f"📊 {requests_sent} requests in {elapsed:.1f}s "
+          f"({requests_sent / elapsed:.1f} req/s), {errors} errors")
+    return errors == 0
+
+def main(batch=False):
+    """Run all tests; batch adds the batch endpoint comparison"""
     print("🚀 Starting Moodscape API Tests")
     print("=" * 50)
     
@@ -148,6 +312,8 @@ def main():
         test_sentiment_analysis,
         test_smart_recommendations
     ]
+    if batch:
+        tests.append(test_batch_throughput)
     
     passed = 0
     total = len(tests)
@@ -168,5 +334,18 @@ def main():
     return passed == total
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description="Moodscape API tests")
+    parser.add_argument("--load", action="store_true",
+                        help="run the requests from concurrent clients instead of once each")
+    parser.add_argument("--clients", type=int, default=10, help="concurrent clients in load mode")
+    parser.add_argument("--duration", type=float, help="load mode duration in seconds (default 30)")
+    parser.add_argument("--requests", type=int, help="total requests to send in load mode")
+    parser.add_argument("--batch", action="store_true",
+                        help="also compare the /batch text endpoints against per-item requests")
+    args = parser.parse_args()
+
+    if args.load:
+        success = run_load_test(args.clients, args.duration, args.requests)
+    else:
+        success = main(args.batch)
     exit(0 if success else 1)
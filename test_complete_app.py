@@ -13,59 +13,42 @@ import os
 from datetime import datetime
 import threading
 import signal
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+
+from harness import (BackendLogReader, BaseTester, Colors, ProcessSampler, correlate_timings,
+                     import_profile, summarize_latencies, wait_for_healthy)
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 MOBILE_APP_DIR = "MoodscapeApp"
 BACKEND_DIR = "backend"
+BACKEND_STARTUP_TIMEOUT = 120
+# Models load in the background after /health starts answering
+MODEL_WARM_UP_TIMEOUT = 120
+# Budget for the first AI request after a warmed-up start, which must not pay a model load
+FIRST_REQUEST_LIMIT_MS = 1000
+FIRST_AI_REQUESTS = [
+    ("predict-mood", "/api/ai/predict-mood"),
+    ("sentiment-analysis", "/api/ai/sentiment-analysis"),
+    ("analyze-emotion", "/api/therapy/analyze-emotion"),
+]
 
-class Colors:
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    PURPLE = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
+class TestRunner(BaseTester):
+    report_title = "TEST REPORT"
+    report_prefix = "test_report"
 
-class TestRunner:
-    def __init__(self):
+    def __init__(self, results_file=None, keep_results=True, warm_up=True,
+                 first_request_limit_ms=FIRST_REQUEST_LIMIT_MS):
+        super().__init__(API_BASE_URL, results_file=results_file, keep_results=keep_results)
+        self.warm_up = warm_up
+        self.first_request_limit_ms = first_request_limit_ms
         self.backend_process = None
         self.mobile_process = None
-        self.test_results = []
         self.api_available = False
-        
-    def print_header(self, text):
-        print(f"\n{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}")
-        print(f"{Colors.BLUE}{Colors.BOLD}{text.center(60)}{Colors.END}")
-        print(f"{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}\n")
-    
-    def print_success(self, text):
-        print(f"{Colors.GREEN}✅ {text}{Colors.END}")
-    
-    def print_error(self, text):
-        print(f"{Colors.RED}❌ {text}{Colors.END}")
-    
-    def print_warning(self, text):
-        print(f"{Colors.YELLOW}⚠️  {text}{Colors.END}")
-    
-    def print_info(self, text):
-        print(f"{Colors.CYAN}ℹ️  {text}{Colors.END}")
-    
-    def log_result(self, test_name, success, message):
-        self.test_results.append({
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        if success:
-            self.print_success(f"{test_name}: {message}")
-        else:
-            self.print_error(f"{test_name}: {message}")
+        self.backend_logs = None
+        # Absolute so it stays in the project root while start_backend is in BACKEND_DIR
+        self.backend_log_path = os.path.abspath(f"backend_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
     
     def check_dependencies(self):
         """Check if required dependencies are installed"""
@@ -168,6 +151,32 @@ class TestRunner:
             os.chdir('..')
             return False
     
+    def backend_python(self):
+        """Path of the backend virtualenv interpreter, relative to BACKEND_DIR"""
+        if os.name == 'nt':  # Windows
+            return os.path.join('venv', 'Scripts', 'python')
+        else:  # Unix/Linux/macOS
+            return os.path.join('venv', 'bin', 'python')
+    
+    def launch_backend(self, python_flags=()):
+        """Start app/main.py from the current directory and return the process
+        
+        Its stdout/stderr are drained into backend_log_path by a
+        BackendLogReader so the server never blocks on a full pipe.
+        MOODSCAPE_WARM_UP asks it to load every AI model in the background
+        at startup; python_flags go to the interpreter (e.g. -X importtime).
+        """
+        process = subprocess.Popen(
+            [self.backend_python(), *python_flags, 'app/main.py'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=dict(os.environ, MOODSCAPE_WARM_UP='1' if self.warm_up else '0')
+        )
+        self.backend_logs = BackendLogReader(process, self.backend_log_path)
+        return process
+    
     def start_backend(self):
         """Start the backend server"""
         self.print_header("STARTING BACKEND SERVER")
@@ -175,27 +184,16 @@ class TestRunner:
         try:
             os.chdir(BACKEND_DIR)
             
-            # Activate virtual environment and start server
-            if os.name == 'nt':  # Windows
-                python_path = os.path.join('venv', 'Scripts', 'python')
-            else:  # Unix/Linux/macOS
-                python_path = os.path.join('venv', 'bin', 'python')
-            
             self.print_info("Starting FastAPI server...")
-            self.backend_process = subprocess.Popen(
-                [python_path, 'app/main.py'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            self.backend_process = self.launch_backend()
             
-            # Wait for server to start
+            # Poll /health until the server answers instead of sleeping a fixed time
             self.print_info("Waiting for server to start...")
-            time.sleep(5)
+            startup_time = wait_for_healthy(API_BASE_URL, BACKEND_STARTUP_TIMEOUT, self.backend_process)
             
             # Check if server is running
-            if self.check_api_health():
-                self.log_result("Backend Server", True, "Server started successfully")
+            if startup_time is not None and self.check_api_health():
+                self.log_result("Backend Server", True, f"Server started successfully in {startup_time:.2f}s")
                 os.chdir('..')
                 return True
             else:
@@ -209,10 +207,102 @@ class TestRunner:
             os.chdir('..')
             return False
     
+    def benchmark_cold_start(self, runs=5, profile_imports=False, baseline=None):
+        """Launch the backend repeatedly and report the time-to-healthy distribution
+        
+        profile_imports adds one launch under python -X importtime and
+        attributes import time to top-level packages; baseline is an
+        earlier cold-start report to compare time-to-healthy against.
+        """
+        self.print_header("BACKEND COLD-START BENCHMARK")
+        
+        if self.check_api_health():
+            self.log_result("Cold Start Benchmark", False, f"Another server is already answering on {API_BASE_URL}")
+            return False
+        
+        startup_times = []
+        try:
+            os.chdir(BACKEND_DIR)
+            
+            for run in range(1, runs + 1):
+                start = time.perf_counter()
+                self.backend_process = self.launch_backend()
+                # Cap the backoff so polling granularity stays small next to startup time
+                waited = wait_for_healthy(API_BASE_URL, BACKEND_STARTUP_TIMEOUT, self.backend_process,
+                                          max_delay=0.05)
+                if waited is None:
+                    self.log_result(f"Cold Start: run {run}", False, "Server did not become healthy")
+                else:
+                    startup_times.append(time.perf_counter() - start)
+                    self.print_info(f"Run {run}/{runs}: healthy after {startup_times[-1]:.2f}s")
+                self.stop_backend()
+            
+            if profile_imports:
+                self.profile_backend_imports()
+            
+            os.chdir('..')
+        except Exception as e:
+            self.log_result("Cold Start Benchmark", False, f"Error: {e}")
+            self.stop_backend()
+            os.chdir('..')
+            return False
+        
+        if not startup_times:
+            self.log_result("Cold Start Benchmark", False, "Server never became healthy")
+            return False
+        
+        stats = summarize_latencies([seconds * 1000 for seconds in startup_times])
+        self.log_result(
+            "Cold Start Benchmark", True,
+            f"{stats['count']}/{runs} runs, time-to-healthy mean {stats['mean_ms'] / 1000:.2f}s, "
+            f"p50 {stats['p50_ms'] / 1000:.2f}s, p95 {stats['p95_ms'] / 1000:.2f}s, "
+            f"max {stats['max_ms'] / 1000:.2f}s"
+        )
+        self.report_extras['cold_start'] = stats
+        if baseline:
+            self.compare_cold_start(stats, baseline)
+        return len(startup_times) == runs
+    
+    def profile_backend_imports(self):
+        """Launch the backend once under -X importtime and report the slowest imports"""
+        self.backend_process = self.launch_backend(python_flags=('-X', 'importtime'))
+        waited = wait_for_healthy(API_BASE_URL, BACKEND_STARTUP_TIMEOUT, self.backend_process, max_delay=0.05)
+        self.stop_backend()
+        profile = import_profile(self.backend_logs.imports)
+        if waited is None or not profile['packages']:
+            self.log_result("Import Profile", False, "No -X importtime output from the backend")
+            return
+        self.report_extras['import_profile'] = profile
+        slowest = ", ".join(f"{package} {ms:.0f}ms" for package, ms in list(profile['packages'].items())[:5])
+        self.log_result("Import Profile", True,
+                        f"{profile['total_ms'] / 1000:.2f}s of imports before healthy after {waited:.2f}s; "
+                        f"slowest: {slowest}")
+    
+    def compare_cold_start(self, stats, baseline_path):
+        """Compare time-to-healthy against the cold_start section of an earlier report"""
+        try:
+            with open(baseline_path) as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log_result("Cold Start vs Baseline", False, f"Cannot read baseline {baseline_path}: {e}")
+            return
+        baseline = report.get('cold_start') if isinstance(report, dict) else None
+        p50 = baseline.get('p50_ms') if isinstance(baseline, dict) else None
+        if not isinstance(p50, (int, float)) or p50 <= 0:
+            self.log_result("Cold Start vs Baseline", False,
+                            f"Baseline unusable: {baseline_path} has no cold_start block with a positive p50_ms")
+            return
+        change = stats['p50_ms'] / baseline['p50_ms'] - 1
+        self.log_result(
+            "Cold Start vs Baseline", change <= 0.1,
+            f"p50 {stats['p50_ms'] / 1000:.2f}s vs {baseline['p50_ms'] / 1000:.2f}s in {baseline_path} "
+            f"({change * 100:+.0f}%)"
+        )
+    
     def check_api_health(self):
         """Check if API is responding"""
         try:
-            response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+            response = self.client.get("/health", timeout=5)
             if response.status_code == 200:
                 self.api_available = True
                 return True
@@ -225,8 +315,14 @@ class TestRunner:
         """Stop the backend server"""
         if self.backend_process:
             self.backend_process.terminate()
-            self.backend_process.wait()
+            try:
+                self.backend_process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.backend_process.kill()
+                self.backend_process.wait()
             self.backend_process = None
+        if self.backend_logs:
+            self.backend_logs.join()
     
     def test_api_endpoints(self):
         """Test all API endpoints"""
@@ -238,14 +334,17 @@ class TestRunner:
         
         # Test health endpoint
         try:
-            response = requests.get(f"{API_BASE_URL}/health")
+            response = self.client.get("/health")
             if response.status_code == 200:
-                self.log_result("Health Endpoint", True, "API is healthy")
+                self.log_result("Health Endpoint", True, "API is healthy", response=response)
             else:
-                self.log_result("Health Endpoint", False, f"Status code: {response.status_code}")
+                self.log_result("Health Endpoint", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("Health Endpoint", False, f"Error: {e}")
         
+        # Must run before anything else touches the AI routes
+        self.check_first_ai_requests()
+        
         # Test authentication endpoints
         self.test_auth_endpoints()
         
@@ -257,40 +356,83 @@ class TestRunner:
         
         return True
     
+    def check_first_ai_requests(self):
+        """Check model warm-up and time the first request to each AI route
+        
+        With warm-up on, /health must report every model warm and the first
+        requests must finish within first_request_limit_ms; without it the
+        first-request latencies are only reported, as they include the loads.
+        """
+        try:
+            start = time.perf_counter()
+            while True:
+                response = self.client.get("/health")
+                models = response.json().get('models') if response.status_code == 200 else None
+                if not models:
+                    self.print_warning("Backend reports no model status, skipping first-request checks")
+                    return
+                cold = [name for name, model in models.items() if model['state'] != 'warm']
+                # Warm-up runs in the background; wait for it instead of racing it
+                if not (self.warm_up and cold) or time.perf_counter() - start > MODEL_WARM_UP_TIMEOUT:
+                    break
+                time.sleep(0.2)
+            self.report_extras['models'] = models
+            load_seconds = sum(model['load_seconds'] or 0 for model in models.values())
+            if self.warm_up:
+                self.log_result("Model Warm-up", not cold,
+                                f"Cold models: {', '.join(cold)}" if cold else
+                                f"{len(models)} models warm after {time.perf_counter() - start:.2f}s, "
+                                f"{load_seconds:.2f}s total load time",
+                                response=response)
+            
+            headers = {'Authorization': 'Bearer demo_token'}
+            for name, path in FIRST_AI_REQUESTS:
+                response = self.client.post(path, json={'text': 'First request after startup'}, headers=headers)
+                message = f"{response.duration_ms:.0f}ms (limit {self.first_request_limit_ms:.0f}ms)"
+                if self.warm_up:
+                    self.log_result(f"First Request: {name}",
+                                    response.status_code == 200 and
+                                    response.duration_ms <= self.first_request_limit_ms,
+                                    message, response=response)
+                else:
+                    self.print_info(f"First {name} request without warm-up: {response.duration_ms:.0f}ms")
+        except Exception as e:
+            self.log_result("Model Warm-up", False, f"Error: {e}")
+    
     def test_auth_endpoints(self):
         """Test authentication endpoints"""
         self.print_info("Testing authentication endpoints...")
         
         # Test registration
         try:
-            response = requests.post(f"{API_BASE_URL}/api/auth/register", data={
+            response = self.client.post("/api/auth/register", data={
                 'email': 'test@example.com',
                 'password': 'TestPassword123',
                 'name': 'Test User'
             })
             if response.status_code in [200, 201]:
-                self.log_result("User Registration", True, "Registration endpoint working")
+                self.log_result("User Registration", True, "Registration endpoint working", response=response)
             else:
-                self.log_result("User Registration", False, f"Status code: {response.status_code}")
+                self.log_result("User Registration", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("User Registration", False, f"Error: {e}")
         
         # Test login
         try:
-            response = requests.post(f"{API_BASE_URL}/api/auth/login", data={
+            response = self.client.post("/api/auth/login", data={
                 'email': 'test@example.com',
                 'password': 'TestPassword123'
             })
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success') and data.get('access_token'):
-                    self.log_result("User Login", True, "Login endpoint working")
+                    self.log_result("User Login", True, "Login endpoint working", response=response)
                     # Store token for other tests
                     self.access_token = data['access_token']
                 else:
-                    self.log_result("User Login", False, "Invalid response format")
+                    self.log_result("User Login", False, "Invalid response format", response=response)
             else:
-                self.log_result("User Login", False, f"Status code: {response.status_code}")
+                self.log_result("User Login", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("User Login", False, f"Error: {e}")
     
@@ -314,27 +456,66 @@ class TestRunner:
                 'notes': 'Feeling great today!',
                 'activities': ['exercise', 'socializing']
             }
-            response = requests.post(
-                f"{API_BASE_URL}/api/mood-entries",
+            response = self.client.post(
+                "/api/mood-entries",
                 json=mood_data,
                 headers=headers
             )
             if response.status_code in [200, 201]:
-                self.log_result("Create Mood Entry", True, "Mood entry created successfully")
+                self.log_result("Create Mood Entry", True, "Mood entry created successfully", response=response)
             else:
-                self.log_result("Create Mood Entry", False, f"Status code: {response.status_code}")
+                self.log_result("Create Mood Entry", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("Create Mood Entry", False, f"Error: {e}")
         
-        # Test get mood entries
+        # Test get mood entries: one array from backends without pagination,
+        # otherwise page by page with keyset cursors
+        listed = None
         try:
-            response = requests.get(f"{API_BASE_URL}/api/mood-entries", headers=headers)
-            if response.status_code == 200:
-                self.log_result("Get Mood Entries", True, "Mood entries retrieved successfully")
-            else:
-                self.log_result("Get Mood Entries", False, f"Status code: {response.status_code}")
+            count, cursor = 0, None
+            while True:
+                params = {'page_size': 100}
+                if cursor:
+                    params['cursor'] = cursor
+                response = self.client.get("/api/mood-entries", params=params, headers=headers)
+                if response.status_code != 200:
+                    self.log_result("Get Mood Entries", False, f"Status code: {response.status_code}", response=response)
+                    break
+                page = response.json()
+                if isinstance(page, list) and cursor is None:
+                    listed = len(page)
+                    self.log_result("Get Mood Entries", True, f"{listed} mood entries retrieved", response=response)
+                    break
+                if not isinstance(page, dict) or not isinstance(page.get('entries'), list):
+                    self.log_result("Get Mood Entries", False, "Response is neither an array nor a page of entries",
+                                    response=response)
+                    break
+                count += len(page['entries'])
+                cursor = page.get('next_cursor')
+                if not cursor:
+                    listed = count
+                    self.log_result("Get Mood Entries", True, f"{listed} mood entries retrieved in pages", response=response)
+                    break
         except Exception as e:
             self.log_result("Get Mood Entries", False, f"Error: {e}")
+
+        # Test streaming mood entries as NDJSON, counted against the listing above
+        if listed is None:
+            self.print_warning("Mood entries could not be listed, skipping the stream check")
+            return
+        try:
+            response = self.client.get("/api/mood-entries", params={'format': 'ndjson'}, headers=headers, stream=True)
+            if response.status_code != 200:
+                self.log_result("Stream Mood Entries", False, f"Status code: {response.status_code}", response=response)
+            elif 'application/x-ndjson' not in response.headers.get('Content-Type', ''):
+                self.print_warning("Backend does not stream NDJSON, skipping the stream check")
+            else:
+                streamed = sum(1 for line in response.iter_lines() if line)
+                self.log_result("Stream Mood Entries", streamed == listed,
+                                f"{streamed} mood entries streamed, {listed} listed", response=response)
+            response.close()
+        except Exception as e:
+            self.log_result("Stream Mood Entries", False, f"Error: {e}")
     
     def test_ai_endpoints(self):
         """Test AI endpoints"""
@@ -348,45 +529,200 @@ class TestRunner:
         
         # Test mood prediction
         try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/ai/predict-mood",
+            response = self.client.post(
+                "/api/ai/predict-mood",
                 json={'text': 'I am feeling very happy today!'},
                 headers=headers
             )
             if response.status_code == 200:
-                self.log_result("Mood Prediction", True, "AI mood prediction working")
+                self.log_result("Mood Prediction", True, "AI mood prediction working", response=response)
             else:
-                self.log_result("Mood Prediction", False, f"Status code: {response.status_code}")
+                self.log_result("Mood Prediction", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("Mood Prediction", False, f"Error: {e}")
         
         # Test sentiment analysis
         try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/ai/sentiment-analysis",
+            response = self.client.post(
+                "/api/ai/sentiment-analysis",
                 json={'text': 'I am feeling stressed and overwhelmed'},
                 headers=headers
             )
             if response.status_code == 200:
-                self.log_result("Sentiment Analysis", True, "Sentiment analysis working")
+                self.log_result("Sentiment Analysis", True, "Sentiment analysis working", response=response)
             else:
-                self.log_result("Sentiment Analysis", False, f"Status code: {response.status_code}")
+                self.log_result("Sentiment Analysis", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("Sentiment Analysis", False, f"Error: {e}")
         
         # Test therapeutic AI
         try:
-            response = requests.post(
-                f"{API_BASE_URL}/api/therapy/analyze-emotion",
+            response = self.client.post(
+                "/api/therapy/analyze-emotion",
                 json={'text': 'I am feeling sad and lonely'},
                 headers=headers
             )
             if response.status_code == 200:
-                self.log_result("Therapeutic AI", True, "Therapeutic AI analysis working")
+                self.log_result("Therapeutic AI", True, "Therapeutic AI analysis working", response=response)
             else:
-                self.log_result("Therapeutic AI", False, f"Status code: {response.status_code}")
+                self.log_result("Therapeutic AI", False, f"Status code: {response.status_code}", response=response)
         except Exception as e:
             self.log_result("Therapeutic AI", False, f"Error: {e}")
+
+        # Test model training. Backends with a training queue report it on /health;
+        # there, queue a job, poll it to the end and check the swapped-in models
+        try:
+            health = self.client.get("/health")
+            queued = health.status_code == 200 and 'training' in health.json()
+            # Training needs at least two entries; test_mood_endpoints created one
+            self.client.post("/api/mood-entries", json={'mood': 5, 'energy': 4, 'stress': 6, 'sleep_hours': 6.5},
+                             headers=headers)
+            response = self.client.post("/api/ai/train-models", headers=headers)
+            if not queued:
+                self.log_result("Model Training", response.status_code == 200,
+                                "Models trained synchronously" if response.status_code == 200
+                                else f"Status code: {response.status_code}", response=response)
+                return
+            if response.status_code != 202:
+                self.log_result("Model Training", False, f"Status code: {response.status_code}", response=response)
+                return
+            job_id = response.json()['job_id']
+            deadline = time.time() + 60
+            job = {'state': 'queued'}
+            while job['state'] in ('queued', 'running') and time.time() < deadline:
+                time.sleep(0.5)
+                job = self.client.get(f"/api/ai/train-models/{job_id}", headers=headers).json()
+            models = self.client.get("/api/ai/models", headers=headers).json().get('models') or {}
+            self.log_result("Model Training",
+                            job['state'] == 'succeeded' and models.get('version') == job_id,
+                            f"Training job {job['state']} at progress {job.get('progress')}, "
+                            f"models version {models.get('version')}", response=response)
+        except Exception as e:
+            self.log_result("Model Training", False, f"Error: {e}")
+
+    def preview_journey(self):
+        """One anonymous preview-mode journey: session, mood entry, analysis, insights"""
+        try:
+            response = self.client.post("/api/preview/session")
+            if response.status_code != 200:
+                self.log_result("Soak: Preview Session", False, f"Status code: {response.status_code}", response=response)
+                return False
+            self.log_result("Soak: Preview Session", True, "Session created", response=response)
+            session_id = response.json()['session_id']
+            
+            response = self.client.post("/api/preview/mood-entries", data={
+                'session_id': session_id,
+                'mood': 8,
+                'energy': 7,
+                'stress': 3,
+                'sleep_hours': 8.5,
+                'notes': 'Soak test entry',
+                'activities': '["exercise", "socializing"]'
+            })
+            self.log_result("Soak: Preview Mood Entry", response.status_code == 200,
+                            f"Status code: {response.status_code}", response=response)
+            
+            response = self.client.post("/api/preview/analyze-mood",
+                                        json={'session_id': session_id, 'text': 'I am feeling happy today!'})
+            self.log_result("Soak: Preview AI Analysis", response.status_code == 200,
+                            f"Status code: {response.status_code}", response=response)
+            
+            response = self.client.get(f"/api/preview/insights?session_id={session_id}")
+            self.log_result("Soak: Preview Insights", response.status_code == 200,
+                            f"Status code: {response.status_code}", response=response)
+            return True
+        except Exception as e:
+            self.log_result("Soak: Preview Journey", False, f"Error: {e}")
+            return False
+    
+    def run_soak_test(self, duration=3600, rate=2.0, sample_interval=5.0, pid=None, workers=8,
+                      rss_limit=10.0, fd_limit=5.0, thread_limit=5.0, min_judged_duration=600):
+        """Replay preview journeys at a steady rate while sampling the backend process
+        
+        Journeys start every 1/rate seconds on a worker pool; the backend's RSS,
+        CPU time, threads and open fds are sampled from /proc and their growth
+        per hour is checked against the given limits. Runs shorter than
+        min_judged_duration report the slopes without failing on them, since
+        a few seconds of allocator warm-up extrapolate to huge hourly rates.
+        """
+        self.print_header("PREVIEW-MODE SOAK TEST")
+        
+        if pid is None and self.backend_process:
+            pid = self.backend_process.pid
+        sampler = None
+        if pid is not None:
+            sampler = ProcessSampler(pid, sample_interval)
+            if not sampler.available():
+                self.print_warning(f"Cannot read /proc/{pid}; backend resources will not be sampled")
+                sampler = None
+        else:
+            self.print_warning("No backend process to sample; only request results will be recorded")
+        
+        self.print_info(f"Running {rate} journeys/s for {duration}s")
+        self.quiet = True
+        started = 0
+        late = 0
+        in_flight = threading.BoundedSemaphore(workers)
+        
+        def journey():
+            try:
+                self.preview_journey()
+            finally:
+                in_flight.release()
+        
+        def progress(sample):
+            self.print_info(
+                f"{sample['elapsed_s']:.0f}s: {started} journeys, {self.aggregator.total - self.aggregator.passed} "
+                f"failures, RSS {sample['rss_mb']:.1f}MB, {sample['threads']} threads, {sample['open_fds']} fds"
+            )
+        
+        if sampler:
+            sampler.on_sample = progress
+            sampler.start()
+        start = time.monotonic()
+        next_start = start
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                while next_start < start + duration:
+                    delay = next_start - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    elif delay < -1.0 / rate:
+                        late += 1
+                    # Blocks when every worker is busy, so a slow backend shows up as late starts
+                    in_flight.acquire()
+                    pool.submit(journey)
+                    started += 1
+                    next_start += 1.0 / rate
+        finally:
+            self.quiet = False
+            if sampler:
+                sampler.stop()
+        
+        elapsed = time.monotonic() - start
+        self.log_result("Soak: Journeys", late == 0,
+                        f"{started} journeys in {elapsed:.0f}s ({started / elapsed:.2f}/s), {late} started late")
+        
+        soak = {'duration_s': round(elapsed, 1), 'journeys': started, 'late_starts': late}
+        if sampler and len(sampler.samples) >= 2:
+            slopes = sampler.leak_slopes()
+            first, last = sampler.samples[0], sampler.samples[-1]
+            judged = elapsed >= min_judged_duration
+            note = "" if judged else " (run too short to judge)"
+            self.log_result("Soak: RSS Growth", not judged or slopes['rss_mb_per_hour'] <= rss_limit,
+                            f"{slopes['rss_mb_per_hour']:+.2f} MB/h "
+                            f"({first['rss_mb']:.1f} -> {last['rss_mb']:.1f} MB){note}")
+            self.log_result("Soak: Open FD Growth", not judged or slopes['open_fds_per_hour'] <= fd_limit,
+                            f"{slopes['open_fds_per_hour']:+.2f} fds/h "
+                            f"({first['open_fds']} -> {last['open_fds']}){note}")
+            self.log_result("Soak: Thread Growth", not judged or slopes['threads_per_hour'] <= thread_limit,
+                            f"{slopes['threads_per_hour']:+.2f} threads/h "
+                            f"({first['threads']} -> {last['threads']}){note}")
+            self.log_result("Soak: CPU Usage", True, f"{slopes['cpu_percent']:.1f}% average")
+            soak['leak_slopes'] = slopes
+            soak['samples'] = sampler.samples
+        self.report_extras['soak'] = soak
+        return late == 0
     
     def test_mobile_app(self):
         """Test mobile app compilation"""
@@ -436,38 +772,30 @@ class TestRunner:
             return False
     
     def generate_report(self):
-        """Generate test report"""
-        self.print_header("TEST REPORT")
-        
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
-        failed_tests = total_tests - passed_tests
-        
-        print(f"\n{Colors.BOLD}SUMMARY:{Colors.END}")
-        print(f"Total Tests: {total_tests}")
-        print(f"{Colors.GREEN}Passed: {passed_tests}{Colors.END}")
-        print(f"{Colors.RED}Failed: {failed_tests}{Colors.END}")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        if failed_tests > 0:
-            print(f"\n{Colors.RED}{Colors.BOLD}FAILED TESTS:{Colors.END}")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  • {result['test']}: {result['message']}")
-        
-        # Save detailed report
-        report_file = f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(self.test_results, f, indent=2)
-        
-        print(f"\n{Colors.CYAN}Detailed report saved to: {report_file}{Colors.END}")
-        
-        return failed_tests == 0
+        """Add server-side timings from the backend access log to the report"""
+        if self.backend_logs:
+            server_timings = self.backend_logs.timing_summary()
+            correlated = correlate_timings(self.client.timing_summary(), server_timings)
+            self.report_extras['backend_log'] = self.backend_logs.log_path
+            self.report_extras['server_timings'] = server_timings
+            self.report_extras['timing_correlation'] = correlated
+            if correlated:
+                self.print_header("SERVER VS CLIENT TIMINGS")
+                for route, timing in correlated.items():
+                    self.print_info(f"{route}: client p50 {timing['client_p50_ms']:.1f}ms, "
+                                    f"server p50 {timing['server_p50_ms']:.1f}ms, "
+                                    f"overhead {timing['overhead_p50_ms']:.1f}ms")
+            elif server_timings:
+                self.print_warning("No server timings found in the backend log: its access lines carry no "
+                                   "duration (uvicorn needs a timing middleware), so only request counts were recorded")
+        return super().generate_report()
     
     def cleanup(self):
         """Cleanup resources"""
         self.print_info("Cleaning up...")
         self.stop_backend()
+        self.client.close()
+        self.close_results()
     
     def run_all_tests(self):
         """Run all tests"""
@@ -521,12 +849,35 @@ class TestRunner:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Moodscape application tester")
+    parser.add_argument("--cold-start", type=int, metavar="RUNS",
+                        help="launch the backend RUNS times and report time-to-healthy instead of the full suite")
+    parser.add_argument("--import-profile", action="store_true",
+                        help="with --cold-start, also attribute startup import time using python -X importtime")
+    parser.add_argument("--cold-start-baseline", metavar="REPORT",
+                        help="with --cold-start, compare time-to-healthy against an earlier report")
+    parser.add_argument("--results-file", metavar="PATH",
+                        help="also stream every result to this JSONL file so an interrupted run keeps its results")
+    parser.add_argument("--soak", type=float, metavar="SECONDS",
+                        help="replay preview-mode journeys for SECONDS while sampling backend resources")
+    parser.add_argument("--soak-rate", type=float, default=2.0, help="preview journeys started per second")
+    parser.add_argument("--sample-interval", type=float, default=5.0, help="seconds between backend samples")
+    parser.add_argument("--backend-pid", type=int,
+                        help="sample an already running backend instead of starting one")
+    parser.add_argument("--no-warm-up", action="store_true",
+                        help="start the backend with lazily loaded AI models")
+    parser.add_argument("--first-request-limit", type=float, default=FIRST_REQUEST_LIMIT_MS, metavar="MS",
+                        help="maximum latency of the first AI requests after a warmed-up start")
+    args = parser.parse_args()
+    
     print(f"{Colors.PURPLE}{Colors.BOLD}")
     print("🌙 MOODSCAPE APPLICATION TESTER 🌙")
     print("Comprehensive testing for mood tracking app")
     print(f"{Colors.END}")
     
-    runner = TestRunner()
+    # Soak runs can log millions of results; keep them on disk only
+    runner = TestRunner(results_file=args.results_file, keep_results=not (args.soak and args.results_file),
+                        warm_up=not args.no_warm_up, first_request_limit_ms=args.first_request_limit)
     
     # Handle Ctrl+C gracefully
     def signal_handler(sig, frame):
@@ -536,7 +887,23 @@ def main():
     
     signal.signal(signal.SIGINT, signal_handler)
     
-    success = runner.run_all_tests()
+    if args.soak:
+        try:
+            if args.backend_pid is None and not runner.start_backend():
+                success = False
+            else:
+                runner.run_soak_test(args.soak, args.soak_rate, args.sample_interval, args.backend_pid)
+                success = runner.generate_report()
+        finally:
+            runner.cleanup()
+    elif args.cold_start:
+        try:
+            runner.benchmark_cold_start(args.cold_start, args.import_profile, args.cold_start_baseline)
+            success = runner.generate_report()
+        finally:
+            runner.cleanup()
+    else:
+        success = runner.run_all_tests()
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
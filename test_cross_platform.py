@@ -10,57 +10,23 @@ import platform
 import subprocess
 import requests
 import time
-import json
-from datetime import datetime
 
-class Colors:
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    PURPLE = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
+from harness import BaseTester, Colors
+
+class CrossPlatformTester(BaseTester):
+    report_title = "CROSS-PLATFORM TEST REPORT"
 
-class CrossPlatformTester:
     def __init__(self):
+        super().__init__("http://localhost:8000")
         self.os_name = platform.system().lower()
         self.arch = platform.machine().lower()
-        self.test_results = []
-        
-    def print_header(self, text):
-        print(f"\n{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}")
-        print(f"{Colors.BLUE}{Colors.BOLD}{text.center(60)}{Colors.END}")
-        print(f"{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}\n")
-    
-    def print_success(self, text):
-        print(f"{Colors.GREEN}✅ {text}{Colors.END}")
-    
-    def print_error(self, text):
-        print(f"{Colors.RED}❌ {text}{Colors.END}")
+        self.report_prefix = f"test_report_{self.os_name}"
     
-    def print_warning(self, text):
-        print(f"{Colors.YELLOW}⚠️  {text}{Colors.END}")
+    def result_context(self):
+        return {'os': self.os_name, 'arch': self.arch}
     
-    def print_info(self, text):
-        print(f"{Colors.CYAN}ℹ️  {text}{Colors.END}")
-    
-    def log_result(self, test_name, success, message):
-        self.test_results.append({
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'os': self.os_name,
-            'arch': self.arch,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        if success:
-            self.print_success(f"{test_name}: {message}")
-        else:
-            self.print_error(f"{test_name}: {message}")
+    def summary_label(self):
+        return f"SUMMARY FOR {self.os_name.upper()}"
     
     def detect_os(self):
         """Detect the current operating system"""
@@ -229,11 +195,11 @@ class CrossPlatformTester:
         
         try:
             # Test preview session creation
-            response = requests.post('http://localhost:8000/api/preview/session', timeout=5)
+            response = self.client.post('/api/preview/session', timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if 'session_id' in data:
-                    self.log_result("Preview Session Creation", True, "Session created successfully")
+                    self.log_result("Preview Session Creation", True, "Session created successfully", response=response)
                     session_id = data['session_id']
                     
                     # Test mood entry creation
@@ -247,31 +213,31 @@ class CrossPlatformTester:
                         'activities': '["exercise", "socializing"]'
                     }
                     
-                    response = requests.post('http://localhost:8000/api/preview/mood-entries', data=mood_data, timeout=5)
+                    response = self.client.post('/api/preview/mood-entries', data=mood_data, timeout=5)
                     if response.status_code == 200:
-                        self.log_result("Preview Mood Entry", True, "Mood entry created successfully")
+                        self.log_result("Preview Mood Entry", True, "Mood entry created successfully", response=response)
                     else:
-                        self.log_result("Preview Mood Entry", False, f"Status code: {response.status_code}")
+                        self.log_result("Preview Mood Entry", False, f"Status code: {response.status_code}", response=response)
                     
                     # Test AI analysis
                     ai_data = {'session_id': session_id, 'text': 'I am feeling happy today!'}
-                    response = requests.post('http://localhost:8000/api/preview/analyze-mood', json=ai_data, timeout=5)
+                    response = self.client.post('/api/preview/analyze-mood', json=ai_data, timeout=5)
                     if response.status_code == 200:
-                        self.log_result("Preview AI Analysis", True, "AI analysis working")
+                        self.log_result("Preview AI Analysis", True, "AI analysis working", response=response)
                     else:
-                        self.log_result("Preview AI Analysis", False, f"Status code: {response.status_code}")
+                        self.log_result("Preview AI Analysis", False, f"Status code: {response.status_code}", response=response)
                     
                     # Test insights
-                    response = requests.get(f'http://localhost:8000/api/preview/insights?session_id={session_id}', timeout=5)
+                    response = self.client.get(f'/api/preview/insights?session_id={session_id}', timeout=5)
                     if response.status_code == 200:
-                        self.log_result("Preview Insights", True, "Insights generated successfully")
+                        self.log_result("Preview Insights", True, "Insights generated successfully", response=response)
                     else:
-                        self.log_result("Preview Insights", False, f"Status code: {response.status_code}")
+                        self.log_result("Preview Insights", False, f"Status code: {response.status_code}", response=response)
                     
                 else:
-                    self.log_result("Preview Session Creation", False, "Invalid response format")
+                    self.log_result("Preview Session Creation", False, "Invalid response format", response=response)
             else:
-                self.log_result("Preview Session Creation", False, f"Status code: {response.status_code}")
+                self.log_result("Preview Session Creation", False, f"Status code: {response.status_code}", response=response)
             
             return True
             
@@ -324,35 +290,6 @@ class CrossPlatformTester:
         
         return True
     
-    def generate_report(self):
-        """Generate cross-platform test report"""
-        self.print_header("CROSS-PLATFORM TEST REPORT")
-        
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
-        failed_tests = total_tests - passed_tests
-        
-        print(f"\n{Colors.BOLD}SUMMARY FOR {self.os_name.upper()}:{Colors.END}")
-        print(f"Total Tests: {total_tests}")
-        print(f"{Colors.GREEN}Passed: {passed_tests}{Colors.END}")
-        print(f"{Colors.RED}Failed: {failed_tests}{Colors.END}")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        if failed_tests > 0:
-            print(f"\n{Colors.RED}{Colors.BOLD}FAILED TESTS:{Colors.END}")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  • {result['test']}: {result['message']}")
-        
-        # Save detailed report
-        report_file = f"test_report_{self.os_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump(self.test_results, f, indent=2)
-        
-        print(f"\n{Colors.CYAN}Detailed report saved to: {report_file}{Colors.END}")
-        
-        return failed_tests == 0
-    
     def run_all_tests(self):
         """Run all cross-platform tests"""
         try:
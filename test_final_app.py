@@ -5,74 +5,132 @@ Tests all features including preview mode, admin functionality, and cross-platfo
 """
 
 import requests
-import json
 import time
 import subprocess
 import sys
 import os
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import platform
+import argparse
+import math
+import random
+import uuid
 
-class Colors:
-    GREEN = '\033[92m'
-    RED = '\033[91m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    PURPLE = '\033[95m'
-    CYAN = '\033[96m'
-    WHITE = '\033[97m'
-    BOLD = '\033[1m'
-    END = '\033[0m'
+from compare_reports import detect_regressions, print_regressions, report_history
+from harness import BaseTester, Colors
 
-class FinalTester:
-    def __init__(self):
-        self.api_base_url = "http://localhost:8000"
-        self.test_results = []
+# Entries written by the analytics consistency test; some are then updated or deleted
+CONSISTENCY_ENTRIES = 40
+STAT_FIELDS = ('mood', 'energy', 'stress', 'sleep_hours')
+
+def recompute_stats(entries, today=None):
+    """Recompute the /api/stats fields from a full list of entries"""
+    today = today or datetime.now().date()
+    fields = {}
+    for field in STAT_FIELDS:
+        values = [entry[field] for entry in entries if entry.get(field) is not None]
+        mean = sum(values) / len(values) if values else None
+        fields[field] = {
+            'count': len(values),
+            'mean': round(mean, 2) if values else None,
+            'std': round(math.sqrt(sum((value - mean) ** 2 for value in values) / len(values)), 2) if values else None,
+            'min': min(values, default=None),
+            'max': max(values, default=None)
+        }
+    activities = {}
+    for entry in entries:
+        for activity in entry.get('activities') or []:
+            activities[activity] = activities.get(activity, 0) + 1
+    days = {entry['created_at'][:10] for entry in entries}
+    streak = 0
+    while (today - timedelta(days=streak)).isoformat() in days:
+        streak += 1
+    return {
+        'total_entries': len(entries),
+        'average_mood': fields['mood']['mean'],
+        'average_energy': fields['energy']['mean'],
+        'average_stress': fields['stress']['mean'],
+        'average_sleep': fields['sleep_hours']['mean'],
+        'top_activities': sorted(activities, key=lambda activity: (-activities[activity], activity))[:5],
+        'fields': fields,
+        'activity_counts': dict(sorted(activities.items())),
+        'mood_distribution': {str(mood): sum(1 for entry in entries if entry['mood'] == mood) for mood in range(1, 11)},
+        'days_logged': len(days),
+        'current_streak': streak
+    }
+
+def recompute_trends(entries, days, today=None):
+    """Recompute the /api/trends points for the last days days from a full list of entries"""
+    today = today or datetime.now().date()
+    cutoff = (today - timedelta(days=days - 1)).isoformat()
+    buckets = {}
+    for entry in entries:
+        day = entry['created_at'][:10]
+        if cutoff <= day <= today.isoformat():
+            buckets.setdefault(day, []).append(entry)
+    trends = []
+    for day, bucket in sorted(buckets.items()):
+        point = {'date': day, 'entries': len(bucket)}
+        for field in ('mood', 'energy', 'stress'):
+            values = [entry[field] for entry in bucket if entry.get(field) is not None]
+            point[f"average_{field}"] = round(sum(values) / len(values), 2) if values else None
+        trends.append(point)
+    return trends
+
+def stat_mismatches(actual, expected, path=''):
+    """Paths where two stats documents differ; numbers may differ by rounding"""
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            return [path or 'stats']
+        return [mismatch for key in expected
+                for mismatch in stat_mismatches(actual.get(key), expected[key], f"{path}.{key}".lstrip('.'))]
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(actual) != len(expected):
+            return [f"{path}: {len(actual) if isinstance(actual, list) else actual} items != {len(expected)}"]
+        return [mismatch for index, (got, want) in enumerate(zip(actual, expected))
+                for mismatch in stat_mismatches(got, want, f"{path}[{index}]")]
+    if isinstance(expected, (int, float)) and isinstance(actual, (int, float)):
+        return [] if abs(actual - expected) <= 0.011 else [f"{path}: {actual} != {expected}"]
+    return [] if actual == expected else [f"{path}: {actual} != {expected}"]
+
+# Read-only routes requested latency_samples times after the test groups, so
+# every report holds p50/p95 over enough requests for compare_reports.py
+SAMPLED_ROUTES = [
+    ("/health", {}),
+    ("/api/stats", {}),
+    ("/api/trends", {'days': 30}),
+    ("/api/admin/stats", {}),
+    ("/api/admin/users", {'page_size': 20}),
+]
+
+class FinalTester(BaseTester):
+    report_title = "COMPREHENSIVE TEST REPORT"
+    report_prefix = "final_test_report"
+
+    def __init__(self, max_workers=4, results_file=None, latency_samples=25):
+        super().__init__("http://localhost:8000", results_file=results_file)
+        self.max_workers = max_workers
+        self.latency_samples = latency_samples
         self.session_id = None
         self.admin_token = None
-        
-    def print_header(self, text):
-        print(f"\n{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}")
-        print(f"{Colors.BLUE}{Colors.BOLD}{text.center(60)}{Colors.END}")
-        print(f"{Colors.BLUE}{Colors.BOLD}{'='*60}{Colors.END}\n")
-    
-    def print_success(self, text):
-        print(f"{Colors.GREEN} {text}{Colors.END}")
-    
-    def print_error(self, text):
-        print(f"{Colors.RED} {text}{Colors.END}")
-    
-    def print_warning(self, text):
-        print(f"{Colors.YELLOW}  {text}{Colors.END}")
-    
-    def print_info(self, text):
-        print(f"{Colors.CYAN}ℹ  {text}{Colors.END}")
-    
-    def log_result(self, test_name, success, message):
-        self.test_results.append({
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        if success:
-            self.print_success(f"{test_name}: {message}")
-        else:
-            self.print_error(f"{test_name}: {message}")
     
     def test_backend_health(self):
         """Test backend health endpoint"""
         self.print_header("TESTING BACKEND HEALTH")
         
         try:
-            response = requests.get(f"{self.api_base_url}/health", timeout=5)
+            response = self.client.get("/health", timeout=5)
             if response.status_code == 200:
                 data = response.json()
-                self.log_result("Backend Health", True, f"Backend is running - Version {data.get('version', 'unknown')}")
+                models = data.get('models') or {}
+                warm = sum(1 for model in models.values() if model.get('state') == 'warm')
+                model_info = f", {warm}/{len(models)} AI models warm" if models else ""
+                self.log_result("Backend Health", True, f"Backend is running - Version {data.get('version', 'unknown')}{model_info}", response=response)
+                if models:
+                    self.report_extras['models'] = models
                 return True
             else:
-                self.log_result("Backend Health", False, f"Status code: {response.status_code}")
+                self.log_result("Backend Health", False, f"Status code: {response.status_code}", response=response)
                 return False
         except requests.exceptions.ConnectionError:
             self.log_result("Backend Health", False, "Backend server not running")
@@ -87,11 +145,11 @@ class FinalTester:
         
         try:
             # Test preview session creation
-            response = requests.post(f"{self.api_base_url}/api/preview/session")
+            response = self.client.post("/api/preview/session")
             if response.status_code == 200:
                 data = response.json()
                 self.session_id = data['session_id']
-                self.log_result("Preview Session Creation", True, f"Session created: {self.session_id[:8]}...")
+                self.log_result("Preview Session Creation", True, f"Session created: {self.session_id[:8]}...", response=response)
                 
                 # Test mood entry creation
                 mood_data = {
@@ -104,30 +162,30 @@ class FinalTester:
                     'activities': '["exercise", "socializing"]'
                 }
                 
-                response = requests.post(f"{self.api_base_url}/api/preview/mood-entries", data=mood_data)
+                response = self.client.post("/api/preview/mood-entries", data=mood_data)
                 if response.status_code == 200:
-                    self.log_result("Preview Mood Entry", True, "Mood entry created successfully")
+                    self.log_result("Preview Mood Entry", True, "Mood entry created successfully", response=response)
                 else:
-                    self.log_result("Preview Mood Entry", False, f"Status code: {response.status_code}")
+                    self.log_result("Preview Mood Entry", False, f"Status code: {response.status_code}", response=response)
                 
                 # Test AI analysis
                 ai_data = {'session_id': self.session_id, 'text': 'I am feeling happy today!'}
-                response = requests.post(f"{self.api_base_url}/api/preview/analyze-mood", json=ai_data)
+                response = self.client.post("/api/preview/analyze-mood", json=ai_data)
                 if response.status_code == 200:
-                    self.log_result("Preview AI Analysis", True, "AI analysis working")
+                    self.log_result("Preview AI Analysis", True, "AI analysis working", response=response)
                 else:
-                    self.log_result("Preview AI Analysis", False, f"Status code: {response.status_code}")
+                    self.log_result("Preview AI Analysis", False, f"Status code: {response.status_code}", response=response)
                 
                 # Test insights
-                response = requests.get(f"{self.api_base_url}/api/preview/insights?session_id={self.session_id}")
+                response = self.client.get(f"/api/preview/insights?session_id={self.session_id}")
                 if response.status_code == 200:
-                    self.log_result("Preview Insights", True, "Insights generated successfully")
+                    self.log_result("Preview Insights", True, "Insights generated successfully", response=response)
                 else:
-                    self.log_result("Preview Insights", False, f"Status code: {response.status_code}")
+                    self.log_result("Preview Insights", False, f"Status code: {response.status_code}", response=response)
                 
                 return True
             else:
-                self.log_result("Preview Session Creation", False, f"Status code: {response.status_code}")
+                self.log_result("Preview Session Creation", False, f"Status code: {response.status_code}", response=response)
                 return False
                 
         except Exception as e:
@@ -146,12 +204,12 @@ class FinalTester:
                 'name': 'Test User'
             }
             
-            response = requests.post(f"{self.api_base_url}/api/auth/register", data=user_data)
+            response = self.client.post("/api/auth/register", data=user_data)
             if response.status_code == 200:
-                self.log_result("User Registration", True, "User registered successfully")
+                self.log_result("User Registration", True, "User registered successfully", response=response)
                 return True
             else:
-                self.log_result("User Registration", False, f"Status code: {response.status_code}")
+                self.log_result("User Registration", False, f"Status code: {response.status_code}", response=response)
                 return False
                 
         except Exception as e:
@@ -169,18 +227,18 @@ class FinalTester:
                 'password': '123456'
             }
             
-            response = requests.post(f"{self.api_base_url}/api/auth/login", data=admin_data)
+            response = self.client.post("/api/auth/login", data=admin_data)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success') and data.get('user', {}).get('is_admin'):
                     self.admin_token = data['access_token']
-                    self.log_result("Admin Login", True, "Makopolo admin login successful")
+                    self.log_result("Admin Login", True, "Makopolo admin login successful", response=response)
                     return True
                 else:
-                    self.log_result("Admin Login", False, "Login successful but not admin")
+                    self.log_result("Admin Login", False, "Login successful but not admin", response=response)
                     return False
             else:
-                self.log_result("Admin Login", False, f"Status code: {response.status_code}")
+                self.log_result("Admin Login", False, f"Status code: {response.status_code}", response=response)
                 return False
                 
         except Exception as e:
@@ -199,18 +257,31 @@ class FinalTester:
             headers = {'Authorization': f'Bearer {self.admin_token}'}
             
             # Test admin stats
-            response = requests.get(f"{self.api_base_url}/api/admin/stats", headers=headers)
+            response = self.client.get("/api/admin/stats", headers=headers)
             if response.status_code == 200:
-                self.log_result("Admin Stats", True, "Admin statistics retrieved")
+                self.log_result("Admin Stats", True, "Admin statistics retrieved", response=response)
             else:
-                self.log_result("Admin Stats", False, f"Status code: {response.status_code}")
+                self.log_result("Admin Stats", False, f"Status code: {response.status_code}", response=response)
             
-            # Test admin users list
-            response = requests.get(f"{self.api_base_url}/api/admin/users", headers=headers)
+            # Test admin users list (one keyset page)
+            response = self.client.get("/api/admin/users", params={'page_size': 20}, headers=headers)
+            if response.status_code == 200:
+                data = response.json()
+                self.log_result("Admin Users List", 'next_cursor' in data,
+                                f"Page of {len(data.get('users', []))} of {data.get('total')} users retrieved",
+                                response=response)
+            else:
+                self.log_result("Admin Users List", False, f"Status code: {response.status_code}", response=response)
+
+            # Test filtering and sorting the users list
+            response = self.client.get("/api/admin/users", params={'q': 'makopolo', 'sort': 'email', 'order': 'desc'},
+                                       headers=headers)
             if response.status_code == 200:
-                self.log_result("Admin Users List", True, "Users list retrieved")
+                emails = [user['email'] for user in response.json().get('users', [])]
+                self.log_result("Admin Users Filter", 'makopolo@moodscape.dev' in emails,
+                                f"{len(emails)} users match 'makopolo'", response=response)
             else:
-                self.log_result("Admin Users List", False, f"Status code: {response.status_code}")
+                self.log_result("Admin Users Filter", False, f"Status code: {response.status_code}", response=response)
             
             return True
             
@@ -230,26 +301,26 @@ class FinalTester:
             headers = {'Authorization': f'Bearer {self.admin_token}'}
             
             # Test mood prediction
-            response = requests.post(
-                f"{self.api_base_url}/api/ai/predict-mood",
+            response = self.client.post(
+                "/api/ai/predict-mood",
                 json={'text': 'I am feeling very happy today!'},
                 headers=headers
             )
             if response.status_code == 200:
-                self.log_result("Mood Prediction", True, "AI mood prediction working")
+                self.log_result("Mood Prediction", True, "AI mood prediction working", response=response)
             else:
-                self.log_result("Mood Prediction", False, f"Status code: {response.status_code}")
+                self.log_result("Mood Prediction", False, f"Status code: {response.status_code}", response=response)
             
             # Test therapeutic AI
-            response = requests.post(
-                f"{self.api_base_url}/api/therapy/analyze-emotion",
+            response = self.client.post(
+                "/api/therapy/analyze-emotion",
                 json={'text': 'I am feeling sad and lonely'},
                 headers=headers
             )
             if response.status_code == 200:
-                self.log_result("Therapeutic AI", True, "Therapeutic AI analysis working")
+                self.log_result("Therapeutic AI", True, "Therapeutic AI analysis working", response=response)
             else:
-                self.log_result("Therapeutic AI", False, f"Status code: {response.status_code}")
+                self.log_result("Therapeutic AI", False, f"Status code: {response.status_code}", response=response)
             
             return True
             
@@ -257,6 +328,167 @@ class FinalTester:
             self.log_result("AI Features", False, f"Error: {e}")
             return False
     
+    def register_test_user(self, prefix):
+        """Register and log in a throwaway user; returns auth headers or None"""
+        user_data = {
+            'email': f"{prefix}_{uuid.uuid4().hex[:12]}@example.com",
+            'password': 'TestPassword123',
+            'name': 'Consistency Test User'
+        }
+        response = self.client.post("/api/auth/register", data=user_data)
+        if response.status_code != 200:
+            self.log_result("Analytics: Register User", False, f"Status code: {response.status_code}", response=response)
+            return None
+        response = self.client.post("/api/auth/login", data={'email': user_data['email'], 'password': user_data['password']})
+        if response.status_code != 200:
+            self.log_result("Analytics: Login", False, f"Status code: {response.status_code}", response=response)
+            return None
+        return {'Authorization': f"Bearer {response.json()['access_token']}"}
+    
+    def test_analytics_consistency(self):
+        """Check incrementally maintained analytics against a recompute from the entries"""
+        self.print_header("TESTING ANALYTICS CONSISTENCY")
+        
+        try:
+            headers = self.register_test_user('analytics')
+            if headers is None:
+                return False
+            
+            # Entries over the last 10 days, then updates and deletes so every
+            # aggregate path (add, remove, re-add) is exercised
+            rng = random.Random(7)
+            now = datetime.now()
+            created = []
+            for index in range(CONSISTENCY_ENTRIES):
+                entry = {
+                    'mood': rng.randint(1, 10),
+                    'energy': rng.randint(1, 10),
+                    'stress': rng.randint(1, 10),
+                    'sleep_hours': round(rng.uniform(4, 10), 1),
+                    'activities': rng.sample(['exercise', 'work', 'reading', 'socializing', 'meditation'], rng.randint(0, 3)),
+                    'notes': f"Consistency entry {index}",
+                    'created_at': (now - timedelta(days=index % 10, minutes=index)).isoformat()
+                }
+                response = self.client.post("/api/mood-entries", json=entry, headers=headers)
+                if response.status_code != 200:
+                    self.log_result("Analytics: Create Entries", False, f"Status code: {response.status_code}", response=response)
+                    return False
+                created.append(response.json()['id'])
+            for entry_id in created[:10]:
+                response = self.client.put(f"/api/mood-entries/{entry_id}",
+                                           json={'mood': rng.randint(1, 10), 'activities': ['exercise']}, headers=headers)
+                if response.status_code != 200:
+                    self.log_result("Analytics: Update Entries", False, f"Status code: {response.status_code}", response=response)
+                    return False
+            for entry_id in created[10:15]:
+                response = self.client.delete(f"/api/mood-entries/{entry_id}", headers=headers)
+                if response.status_code != 200:
+                    self.log_result("Analytics: Delete Entries", False, f"Status code: {response.status_code}", response=response)
+                    return False
+            
+            entries = self.client.get("/api/mood-entries", headers=headers).json()
+            response = self.client.get("/api/stats", headers=headers)
+            if response.status_code != 200:
+                self.log_result("Analytics: Stats Consistency", False, f"Status code: {response.status_code}", response=response)
+                return False
+            mismatches = stat_mismatches(response.json().get('stats'), recompute_stats(entries))
+            self.log_result(
+                "Analytics: Stats Consistency", not mismatches,
+                f"Incremental stats match a recompute over {len(entries)} entries" if not mismatches
+                else f"{len(mismatches)} mismatches: {'; '.join(mismatches[:5])}",
+                response=response
+            )
+            trends_ok = self.check_trends(entries, headers)
+            return not mismatches and trends_ok
+            
+        except Exception as e:
+            self.log_result("Analytics: Stats Consistency", False, f"Error: {e}")
+            return False
+    
+    def check_trends(self, entries, headers):
+        """Check the 7/30/90-day trend windows against a recompute, then their ETag revalidation"""
+        passed = True
+        etags = {}
+        for days in (7, 30, 90):
+            response = self.client.get("/api/trends", params={'days': days}, headers=headers)
+            if response.status_code != 200:
+                self.log_result(f"Analytics: Trends {days}d", False, f"Status code: {response.status_code}", response=response)
+                passed = False
+                continue
+            mismatches = stat_mismatches(response.json().get('trends'), recompute_trends(entries, days))
+            self.log_result(f"Analytics: Trends {days}d", not mismatches,
+                            "Rollups match a recompute" if not mismatches
+                            else f"{len(mismatches)} mismatches: {'; '.join(mismatches[:5])}",
+                            response=response)
+            passed = passed and not mismatches
+            etags[days] = response.headers.get('ETag')
+        
+        if not etags.get(7):
+            self.log_result("Analytics: Trends ETag", False, "No ETag on /api/trends responses")
+            return False
+        response = self.client.get("/api/trends", params={'days': 7}, headers=dict(headers, **{'If-None-Match': etags[7]}))
+        self.log_result("Analytics: Trends 304", response.status_code == 304,
+                        f"Unchanged window revalidated with status {response.status_code}", response=response)
+        passed = passed and response.status_code == 304
+        
+        # A new entry today changes the window, so the old ETag must no longer match
+        self.client.post("/api/mood-entries", json={'mood': 5, 'notes': 'Trend change'}, headers=headers)
+        response = self.client.get("/api/trends", params={'days': 7}, headers=dict(headers, **{'If-None-Match': etags[7]}))
+        changed = response.status_code == 200 and response.headers.get('ETag') != etags[7]
+        self.log_result("Analytics: Trends ETag Change", changed,
+                        f"Changed window returned status {response.status_code}", response=response)
+        return passed and changed
+    
+    def test_timestamp_convention(self):
+        """Check a Z-suffixed entry and a server-dated one land on one local timeline"""
+        self.print_header("TESTING TIMESTAMP CONVENTION")
+        
+        try:
+            headers = self.register_test_user('timestamps')
+            if headers is None:
+                return False
+            
+            # A minute ago in UTC, then an entry the server dates itself
+            sent = datetime.now(timezone.utc) - timedelta(minutes=1)
+            response = self.client.post("/api/mood-entries", headers=headers,
+                                        json={'mood': 3, 'created_at': sent.isoformat().replace('+00:00', 'Z')})
+            if response.status_code != 200:
+                self.log_result("Timestamps: Create UTC Entry", False, f"Status code: {response.status_code}", response=response)
+                return False
+            utc_entry = response.json()
+            response = self.client.post("/api/mood-entries", json={'mood': 7}, headers=headers)
+            if response.status_code != 200:
+                self.log_result("Timestamps: Create Server Entry", False, f"Status code: {response.status_code}", response=response)
+                return False
+            server_entry = response.json()
+            
+            # Assumes the harness and the backend share a timezone, as they do on localhost
+            expected = sent.astimezone().replace(tzinfo=None)
+            stored = datetime.fromisoformat(utc_entry['created_at'])
+            ordered = stored.tzinfo is None and abs((stored - expected).total_seconds()) < 1 \
+                and utc_entry['created_at'] < server_entry['created_at']
+            self.log_result("Timestamps: Local Conversion", ordered,
+                            f"Sent {sent.isoformat()}, stored {utc_entry['created_at']}, "
+                            f"server-dated {server_entry['created_at']}")
+            
+            entries = self.client.get("/api/mood-entries", headers=headers).json()
+            response = self.client.get("/api/stats", headers=headers)
+            if response.status_code != 200:
+                self.log_result("Timestamps: Same Day", False, f"Status code: {response.status_code}", response=response)
+                return False
+            stats = response.json().get('stats') or {}
+            mismatches = stat_mismatches(stats, recompute_stats(entries))
+            same_day = stats.get('days_logged') == 1 and stats.get('current_streak') == 1 and not mismatches
+            self.log_result("Timestamps: Same Day", same_day,
+                            f"{stats.get('days_logged')} days logged, streak {stats.get('current_streak')}"
+                            + (f", {'; '.join(mismatches[:5])}" if mismatches else ""),
+                            response=response)
+            return ordered and same_day
+            
+        except Exception as e:
+            self.log_result("Timestamps: Local Conversion", False, f"Error: {e}")
+            return False
+    
     def test_cross_platform_compatibility(self):
         """Test cross-platform compatibility"""
         self.print_header("TESTING CROSS-PLATFORM COMPATIBILITY")
@@ -292,7 +524,12 @@ class FinalTester:
         self.print_header("TESTING MOBILE APP STRUCTURE")
         
         try:
-            os.chdir('MoodscapeApp')
+            # Paths are joined rather than chdir'ed into so the check is safe
+            # to run alongside other test groups
+            app_dir = 'MoodscapeApp'
+            if not os.path.isdir(app_dir):
+                self.log_result("Mobile App Structure", False, f"Directory not found: {app_dir}")
+                return False
             
             # Check for required files
             required_files = [
@@ -307,7 +544,7 @@ class FinalTester:
             
             all_files_exist = True
             for file in required_files:
-                if os.path.exists(file):
+                if os.path.exists(os.path.join(app_dir, file)):
                     self.log_result(f"File Check: {file}", True, "File exists")
                 else:
                     self.log_result(f"File Check: {file}", False, "File missing")
@@ -318,71 +555,31 @@ class FinalTester:
             else:
                 self.log_result("Mobile App Structure", False, "Some files missing")
             
-            os.chdir('..')
             return all_files_exist
             
         except Exception as e:
             self.log_result("Mobile App Structure", False, f"Error: {e}")
-            os.chdir('..')
             return False
     
-    def generate_report(self):
-        """Generate comprehensive test report"""
-        self.print_header("COMPREHENSIVE TEST REPORT")
-        
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['success'])
-        failed_tests = total_tests - passed_tests
-        
-        print(f"\n{Colors.BOLD}SUMMARY:{Colors.END}")
-        print(f"Total Tests: {total_tests}")
-        print(f"{Colors.GREEN}Passed: {passed_tests}{Colors.END}")
-        print(f"{Colors.RED}Failed: {failed_tests}{Colors.END}")
-        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        # Group results by category
-        categories = {}
-        for result in self.test_results:
-            category = result['test'].split(':')[0] if ':' in result['test'] else 'General'
-            if category not in categories:
-                categories[category] = {'passed': 0, 'failed': 0, 'total': 0}
-            categories[category]['total'] += 1
-            if result['success']:
-                categories[category]['passed'] += 1
-            else:
-                categories[category]['failed'] += 1
-        
-        print(f"\n{Colors.BOLD}RESULTS BY CATEGORY:{Colors.END}")
-        for category, stats in categories.items():
-            success_rate = (stats['passed'] / stats['total']) * 100
-            color = Colors.GREEN if success_rate >= 80 else Colors.YELLOW if success_rate >= 60 else Colors.RED
-            print(f"{color}{category}: {stats['passed']}/{stats['total']} ({success_rate:.1f}%){Colors.END}")
-        
-        if failed_tests > 0:
-            print(f"\n{Colors.RED}{Colors.BOLD}FAILED TESTS:{Colors.END}")
-            for result in self.test_results:
-                if not result['success']:
-                    print(f"  • {result['test']}: {result['message']}")
-        
-        # Save detailed report
-        report_file = f"final_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w') as f:
-            json.dump({
-                'summary': {
-                    'total_tests': total_tests,
-                    'passed_tests': passed_tests,
-                    'failed_tests': failed_tests,
-                    'success_rate': (passed_tests/total_tests)*100
-                },
-                'categories': categories,
-                'results': self.test_results,
-                'timestamp': datetime.now().isoformat()
-            }, f, indent=2)
-        
-        print(f"\n{Colors.CYAN}Detailed report saved to: {report_file}{Colors.END}")
-        
-        return failed_tests == 0
-    
+    def test_latency_sample(self):
+        """Request each of SAMPLED_ROUTES latency_samples times, on its own after the test groups"""
+        if not self.latency_samples:
+            return True
+        self.print_header("SAMPLING ROUTE LATENCY")
+        if not self.admin_token:
+            self.log_result("Latency Sample", False, "No admin token available")
+            return False
+        headers = {'Authorization': f'Bearer {self.admin_token}'}
+        for path, params in SAMPLED_ROUTES:
+            try:
+                failures = sum(1 for _ in range(self.latency_samples)
+                               if self.client.get(path, params=params, headers=headers).status_code != 200)
+                self.log_result(f"Latency Sample: {path}", failures == 0,
+                                f"{self.latency_samples} requests, {failures} failed")
+            except Exception as e:
+                self.log_result(f"Latency Sample: {path}", False, f"Error: {e}")
+        return True
+
     def run_all_tests(self):
         """Run all comprehensive tests"""
         try:
@@ -394,26 +591,21 @@ class FinalTester:
                 self.print_error("Backend is not running. Please start the backend server first.")
                 return False
             
-            # Test preview mode
-            self.test_preview_mode()
-            
-            # Test user registration
-            self.test_user_registration()
-            
-            # Test admin login
-            self.test_admin_login()
-            
-            # Test admin functionality
-            self.test_admin_functionality()
-            
-            # Test AI features
-            self.test_ai_features()
-            
-            # Test cross-platform compatibility
-            self.test_cross_platform_compatibility()
-            
-            # Test mobile app structure
-            self.test_mobile_app_structure()
+            # Run the remaining groups concurrently; only the admin groups
+            # need state (admin_token) produced by an earlier group
+            self.run_scheduled([
+                ('preview_mode', self.test_preview_mode, []),
+                ('user_registration', self.test_user_registration, []),
+                ('admin_login', self.test_admin_login, []),
+                ('admin_functionality', self.test_admin_functionality, ['admin_login']),
+                ('ai_features', self.test_ai_features, ['admin_login']),
+                ('analytics_consistency', self.test_analytics_consistency, []),
+                ('timestamp_convention', self.test_timestamp_convention, []),
+                ('cross_platform', self.test_cross_platform_compatibility, []),
+                ('mobile_app_structure', self.test_mobile_app_structure, []),
+            ], max_workers=self.max_workers)
+            # Sampled alone so the other groups' requests do not skew the route aggregates
+            self.test_latency_sample()
             
             # Generate report
             success = self.generate_report()
@@ -440,16 +632,40 @@ class FinalTester:
         except Exception as e:
             self.print_error(f"Unexpected error: {e}")
             return False
+        finally:
+            self.close_results()
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Moodscape final comprehensive tester")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="test groups run concurrently (1 runs them sequentially)")
+    parser.add_argument("--results-file", metavar="PATH",
+                        help="also stream every result to this JSONL file as it is logged")
+    parser.add_argument("--check-regressions", action="store_true",
+                        help="compare this run against earlier reports and fail on a regression")
+    parser.add_argument("--latency-samples", type=int, default=25,
+                        help="requests per sampled read-only route, for per-route p50/p95 (0 skips)")
+    args = parser.parse_args()
+    
     print(f"{Colors.PURPLE}{Colors.BOLD}")
     print("MOODSCAPE FINAL TESTER")
     print("Comprehensive testing for mood tracking app with all features")
     print(f"{Colors.END}")
     
-    tester = FinalTester()
+    tester = FinalTester(max_workers=args.workers, results_file=args.results_file,
+                         latency_samples=args.latency_samples)
     success = tester.run_all_tests()
+    
+    if args.check_regressions and tester.report_path:
+        current, baseline = report_history(current=tester.report_path)
+        if baseline:
+            regressions = detect_regressions(current, baseline)
+            print_regressions(current, baseline, regressions)
+            success = success and not regressions
+        else:
+            tester.print_warning("No earlier reports to compare against")
+    
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":